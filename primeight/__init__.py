@@ -3,3 +3,4 @@ from .manager import CassandraManager
 from .keyspace import CassandraKeyspace
 from .table import CassandraTable, CassandraMaterializedView
 from .column import CassandraColumn
+from .schema import CassandraSchema, TableConfig
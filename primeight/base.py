@@ -1,8 +1,11 @@
-from typing import List
+from typing import Callable, Iterator, List, Optional
 
 from cassandra.cluster import ExecutionProfile
+from cassandra.query import Statement
 
 from primeight import CassandraManager
+from primeight.concurrency import Deadline, ExecutionResult
+from primeight.metrics import MetricLabels, MetricsRegistry
 
 
 class CassandraBase:
@@ -30,40 +33,126 @@ class CassandraBase:
 
         self._current_statements = None
 
+    def iter_statements(self) -> Iterator[str]:
+        """Yields current statements one at a time."""
+        return iter(self.statements)
+
+    def iter_routed_statements(self) -> Iterator[str or Statement]:
+        """Yields current statements one at a time, as executed.
+        Subclasses may return driver statements carrying a routing key."""
+        return self.iter_statements()
+
+    def metric_labels(self, statement: str or Statement) -> MetricLabels:
+        """Returns the labels of the metrics of a statement
+        (see :attr:`~manager.CassandraManager.metrics`)."""
+        return MetricsRegistry.statement_labels(statement)
+
+    def _execution_profile(
+        self, execution_profile: str or ExecutionProfile = None
+    ) -> str or ExecutionProfile:
+        """Returns the execution profile of the current statements.
+        Subclasses may derive it from their configuration."""
+        return execution_profile
+
     def execute(
-            self, execution_profile: str or ExecutionProfile = None
+            self,
+            execution_profile: str or ExecutionProfile = None,
+            row_factory: Callable = None,
+            deadline: Deadline or float = None
     ) -> List[tuple] or List[dict]:
         """Execute list of query statements sequentially.
 
         :param execution_profile: execution profile (default: None)
             This parameter can be both the name of a configured profile,
             or the execution profile itself.
+        :param row_factory: row factory replacing the one of the
+            execution profile (default: None)
+        :param deadline: overall deadline of the statements, or its
+            number of seconds (see :class:`~concurrency.Deadline`)
+            (default: None)
         :return: list of rows as formatted by the rows_factory
             in the execution profile
         """
-        result = self.cassandra_manager.execute(self.statements, execution_profile)
+        result = self.cassandra_manager.execute(
+            self.iter_routed_statements(), self._execution_profile(execution_profile),
+            row_factory, self.metric_labels, deadline
+        )
 
         return result
 
     def execute_concurrent(
         self,
-        raise_on_first_error: bool = False
-    ) -> List[tuple] or List[dict]:
+        raise_on_first_error: bool = False,
+        adaptive: bool = False,
+        execution_profile: str or ExecutionProfile = None,
+        max_retries: int = 0,
+        retry_budget: Optional[int] = None,
+        deadline: Deadline or float = None
+    ) -> ExecutionResult:
         """Execute list of query statements concurrently.
 
-        This method does not allow to specify the execution profile to use,
-        it is thus encouraged to set the desired execution profile as default
-        when creating the CassandraManager object. You can do this with the
-        :func:`~manager.CassandraManager.create_default_execution_profile`
-        method.
+        The result holds the rows of the successful statements, and the
+        outcome of every statement (see
+        :class:`~concurrency.ExecutionResult`).
 
         :param raise_on_first_error: raise exception on first error
             or continue and log possible errors (default: True)
+        :param adaptive: if True, the number of in-flight requests adapts
+            to the cluster load (see
+            :attr:`~manager.CassandraManager.concurrency_limiter`)
+            (default: False)
+        :param execution_profile: execution profile to use (default: None)
+            If not defined, the default execution profile is used.
+        :param max_retries: maximum number of retries of each statement
+            failing with a transient error (default: 0)
+        :param retry_budget: maximum number of retries of the execution
+            (default: None)
+        :param deadline: overall deadline of the execution, or its
+            number of seconds (see :class:`~concurrency.Deadline`)
+            (default: None)
         :return: list of rows as formatted by the rows_factory
             in the execution profile
         """
         result = self.cassandra_manager.execute_concurrent(
-            self.statements, raise_on_first_error
+            self.iter_routed_statements(), raise_on_first_error, adaptive,
+            self._execution_profile(execution_profile), max_retries, retry_budget,
+            self.metric_labels, deadline
         )
 
         return result
+
+    async def execute_concurrent_async(
+        self,
+        deadline: Deadline or float = None,
+        raise_on_first_error: bool = False,
+        adaptive: bool = False,
+        execution_profile: str or ExecutionProfile = None,
+        max_retries: int = 0,
+        retry_budget: Optional[int] = None
+    ) -> ExecutionResult:
+        """Execute list of query statements concurrently, from a
+        coroutine. Cancelling the awaiting task cancels the execution
+        (see :func:`~manager.CassandraManager.execute_concurrent_async`).
+
+        :param deadline: overall deadline of the execution, or its
+            number of seconds (default: None)
+        :param raise_on_first_error: raise exception on first error
+            or continue and log possible errors (default: False)
+        :param adaptive: if True, the number of in-flight requests adapts
+            to the cluster load (default: False)
+        :param execution_profile: execution profile to use (default: None)
+        :param max_retries: maximum number of retries of each statement
+            failing with a transient error (default: 0)
+        :param retry_budget: maximum number of retries of the execution
+            (default: None)
+        :return: execution result
+        """
+        return await self.cassandra_manager.execute_concurrent_async(
+            self.iter_routed_statements(), deadline,
+            raise_on_first_error=raise_on_first_error,
+            adaptive=adaptive,
+            execution_profile=self._execution_profile(execution_profile),
+            max_retries=max_retries,
+            retry_budget=retry_budget,
+            labeler=self.metric_labels
+        )
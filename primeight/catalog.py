@@ -0,0 +1,115 @@
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+
+
+class TableCatalog:
+    """Cached set of the existing tables and materialized views of each
+    keyspace.
+
+    Used to drop the statements of split tables that were never created
+    before they are executed. Entries expire after `ttl` seconds, and are
+    invalidated by the :class:`~manager.CassandraManager` when it executes
+    a schema change.
+
+    """
+
+    TABLE_RE = re.compile(r'\bFROM\s+(\w+)\.(\w+)', re.IGNORECASE)
+
+    @property
+    def ttl(self) -> Optional[float]:
+        """Returns the number of seconds an entry is kept."""
+        return self._ttl
+
+    def __init__(
+        self,
+        loader: Callable[[str], Iterable[str]],
+        ttl: Optional[float] = 300.0
+    ):
+        """Table catalog constructor.
+
+        :param loader: function returning the table and view names
+            of a keyspace
+        :param ttl: number of seconds an entry is kept. If None, entries
+            are kept until invalidated (default: 300.0)
+        """
+        self._loader = loader
+        self._ttl = ttl
+        self._entries: Dict[str, Tuple[float, FrozenSet[str]]] = {}
+        self._lock = threading.Lock()
+
+    def tables(self, keyspace: str) -> FrozenSet[str]:
+        """Returns the table and view names of a keyspace."""
+        entry = self._entries.get(keyspace)
+        now = time.monotonic()
+        if entry is None or (self._ttl is not None and now - entry[0] > self._ttl):
+            tables = frozenset(self._loader(keyspace))
+            with self._lock:
+                self._entries[keyspace] = (now, tables)
+
+            return tables
+
+        return entry[1]
+
+    def exists(self, keyspace: str, table: str) -> bool:
+        """Returns True if the table or view exists in the keyspace."""
+        return table in self.tables(keyspace)
+
+    def statement_exists(self, statement: str) -> bool:
+        """Returns True if the table queried by a statement exists.
+        Statements without a `FROM <keyspace>.<table>` clause are
+        assumed to exist."""
+        match = self.TABLE_RE.search(statement)
+        if match is None:
+            return True
+
+        return self.exists(match.group(1), match.group(2))
+
+    def invalidate(self, keyspace: str = None) -> None:
+        """Invalidate the entry of a keyspace, or every entry.
+
+        :param keyspace: keyspace name (default: None)
+        """
+        with self._lock:
+            if keyspace is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(keyspace, None)
+
+
+class MetadataCatalog(TableCatalog):
+    """Catalog of the existing tables and materialized views read from
+    the driver schema metadata.
+
+    The driver refreshes its metadata on schema change events, including
+    the tables created by other clients, so nothing is cached and new
+    split tables are seen as soon as the driver knows them.
+
+    """
+
+    def __init__(self, keyspace_metadata: Callable[[str], Optional[Any]]):
+        """Metadata catalog constructor.
+
+        :param keyspace_metadata: function returning the driver metadata
+            of a keyspace, or None if the keyspace does not exist
+        """
+        super().__init__(self._load, ttl=0)
+        self._keyspace_metadata = keyspace_metadata
+
+    def _load(self, keyspace: str) -> FrozenSet[str]:
+        metadata = self._keyspace_metadata(keyspace)
+        if metadata is None:
+            return frozenset()
+
+        return frozenset(metadata.tables) | frozenset(metadata.views)
+
+    def tables(self, keyspace: str) -> FrozenSet[str]:
+        """Returns the table and view names of a keyspace."""
+        return self._load(keyspace)
+
+    def exists(self, keyspace: str, table: str) -> bool:
+        """Returns True if the table or view exists in the keyspace."""
+        metadata = self._keyspace_metadata(keyspace)
+
+        return metadata is not None and (table in metadata.tables or table in metadata.views)
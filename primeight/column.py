@@ -8,6 +8,11 @@ logger = logging.getLogger(__name__)
 
 class CassandraColumn:
 
+    __slots__ = (
+        '_name', '_type_handle', '_min', '_max', '_alias', '_description',
+        '_intern'
+    )
+
     NATIVE_TYPES = [
         'ascii', 'bigint', 'blob', 'boolean', 'counter', 'decimal', 'double',
         'float', 'inet', 'int', 'smallint', 'tinyint', 'text', 'date', 'time',
@@ -76,16 +81,10 @@ class CassandraColumn:
 
     @property
     def min_value(self):
-        if self._min is None:
-            logger.debug("Column %s has no min value defined.", self.name)
-
         return self._min
 
     @property
     def max_value(self):
-        if self._max is None:
-            logger.debug("Column %s has no max value defined.", self.name)
-
         return self._max
 
     @property
@@ -102,6 +101,11 @@ class CassandraColumn:
 
         return self._description
 
+    @property
+    def intern(self) -> bool:
+        """Returns True if the column values are interned in query results."""
+        return self._intern
+
     def __init__(
         self,
         name: str,
@@ -109,7 +113,8 @@ class CassandraColumn:
         alias: str = None,
         description: str = None,
         min_value: int or float = None,
-        max_value: int or float = None
+        max_value: int or float = None,
+        intern: bool = False
     ):
         """Cassandra column constructor.
 
@@ -121,6 +126,8 @@ class CassandraColumn:
             This is used to check for invalid data (default: None)
         :param max_value: column maximum value.
             This is used to check for invalid data (default: None)
+        :param intern: if True, repeated values of the column share
+            a single object in query results (default: False)
         """
         self._name = name.lower()
         self._type_handle = type_handle.lower()
@@ -129,6 +136,7 @@ class CassandraColumn:
         self._max = max_value
         self._alias = alias
         self._description = description
+        self._intern = intern
 
     def pydantic_type(self, handle=None):
         if handle is None:
@@ -233,14 +241,18 @@ class CassandraColumn:
             return self.HANDLE_TO_CASSANDRA_TYPE[type_handle]
 
     def is_valid(self, value):
-        """Returns True if value is valid, and False otherwise."""
+        """Returns True if value is valid, and False otherwise.
+
+        To validate batches of values use
+        :class:`~validation.BatchValidator` instead.
+        """
 
-        if self.max_value is not None and value > self.max_value:
-            logger.debug("value '%s' is above '%s'", value, self.max_value)
+        if self._max is not None and value > self._max:
+            logger.debug("value '%s' is above '%s'", value, self._max)
             return False
 
-        if self.min_value is not None and value < self.min_value:
-            logger.debug("value '%s' is below '%s'", value, self.min_value)
+        if self._min is not None and value < self._min:
+            logger.debug("value '%s' is below '%s'", value, self._min)
             return False
 
         return True
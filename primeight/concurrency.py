@@ -0,0 +1,671 @@
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from cassandra import \
+    OperationTimedOut, ReadTimeout, WriteTimeout, Unavailable, CoordinationFailure
+from cassandra.cluster import \
+    Session, ExecutionProfile, NoHostAvailable, ResponseFuture, EXEC_PROFILE_DEFAULT
+from cassandra.protocol import OverloadedErrorMessage, IsBootstrappingErrorMessage
+from cassandra.query import Statement
+
+from primeight.exceptions import DeadlineExceeded, QueryCancelled
+from primeight.prepared import query_string_of
+
+
+class Deadline:
+    """Overall time budget of a logical query, shared by every statement
+    it fans out to, e.g. one per split table and time bucket.
+
+    Each request gets the remaining budget as its timeout, capped by the
+    request timeout of its execution profile, so no request outlives the
+    deadline. No statement is sent once the deadline has passed or the
+    deadline is cancelled, and executions stop waiting for the requests
+    in flight.
+
+    The driver can not cancel a request once sent: abandoned requests
+    complete in the background, within their timeout, and their
+    following result pages are never fetched.
+
+    """
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """Returns the time budget, in seconds, or None if unlimited."""
+        return self._timeout
+
+    @property
+    def cancelled(self) -> bool:
+        """Returns True if the deadline was cancelled."""
+        return self._cancelled
+
+    @property
+    def expired(self) -> bool:
+        """Returns True if the deadline has passed."""
+        return self._expires is not None and time.monotonic() >= self._expires
+
+    @classmethod
+    def of(cls, deadline: 'Deadline' or float = None) -> Optional['Deadline']:
+        """Returns a deadline, creating it from a number of seconds."""
+        if deadline is None or isinstance(deadline, Deadline):
+            return deadline
+
+        return cls(deadline)
+
+    def __init__(self, timeout: Optional[float] = None):
+        """Deadline constructor.
+
+        :param timeout: time budget, in seconds, from now.
+            If None, the query can only be cancelled (default: None)
+        """
+        if timeout is not None and timeout < 0:
+            raise ValueError("Timeout can not be negative.")
+
+        self._timeout = timeout
+        self._expires = time.monotonic() + timeout if timeout is not None else None
+        self._cancelled = False
+        self._callbacks: List[Callable[[BaseException], None]] = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> Optional[float]:
+        """Returns the remaining seconds, or None if unlimited."""
+        if self._expires is None:
+            return None
+
+        return max(0.0, self._expires - time.monotonic())
+
+    def error(self) -> Optional[BaseException]:
+        """Returns the error of a cancelled or expired deadline, or None."""
+        if self._cancelled:
+            return QueryCancelled()
+        elif self.expired:
+            return DeadlineExceeded(self._timeout)
+
+        return None
+
+    def check(self) -> None:
+        """Raises the error of a cancelled or expired deadline, if any."""
+        error = self.error()
+        if error is not None:
+            raise error
+
+    def request_timeout(
+        self, session: Session, execution_profile: str or ExecutionProfile = None
+    ) -> Optional[float]:
+        """Returns the timeout of the next request: the remaining budget,
+        capped by the request timeout of its execution profile.
+
+        :param session: Cassandra session
+        :param execution_profile: execution profile name, or the execution
+            profile itself (default: None)
+        :return: seconds, or None to use the profile timeout
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return None
+
+        if not isinstance(execution_profile, ExecutionProfile):
+            execution_profile = session.get_execution_profile(
+                EXEC_PROFILE_DEFAULT if execution_profile is None else execution_profile
+            )
+        if execution_profile.request_timeout is None:
+            return remaining
+
+        return min(remaining, execution_profile.request_timeout)
+
+    def add_callback(self, callback: Callable[[BaseException], None]) -> None:
+        """Registers a function called with the error on cancellation."""
+        with self._lock:
+            cancelled = self._cancelled
+            if not cancelled:
+                self._callbacks.append(callback)
+
+        if cancelled:
+            callback(QueryCancelled())
+
+    def remove_callback(self, callback: Callable[[BaseException], None]) -> None:
+        """Unregisters a cancellation callback, if registered."""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def cancel(self) -> None:
+        """Cancels the query: no other statement is sent, and executions
+        stop waiting for the requests in flight."""
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            callback(QueryCancelled())
+
+    def wait(self, future: ResponseFuture) -> Any:
+        """Returns the result of a response future, waiting at most until
+        the deadline, or raises the error of the deadline.
+
+        :param future: driver response future
+        :return: result set
+        """
+        done = threading.Event()
+        future.add_callbacks(lambda _: done.set(), lambda _: done.set())
+
+        def _on_cancel(_error):
+            done.set()
+
+        self.add_callback(_on_cancel)
+        try:
+            done.wait(self.remaining())
+        finally:
+            self.remove_callback(_on_cancel)
+
+        if self._cancelled:
+            raise QueryCancelled()
+        elif not done.is_set():
+            raise DeadlineExceeded(self._timeout)
+
+        return future.result()
+
+    def __repr__(self):
+        return f"Deadline(timeout={self._timeout}, remaining={self.remaining()})"
+
+
+class AIMDLimiter:
+    """Adaptive limit of in-flight requests.
+
+    The limit follows an additive increase, multiplicative decrease (AIMD)
+    algorithm: it grows by `increase` every `limit` successful responses,
+    and is multiplied by `decrease` on congestion, i.e. on timeouts,
+    overload errors, or responses slower than `latency_tolerance` times
+    the lowest latency observed. The limit is decreased at most once per
+    round trip, so a burst of timeouts does not collapse it.
+
+    Limiters are thread-safe and keep the learned limit between executions.
+
+    """
+
+    OVERLOAD_ERRORS = (
+        OperationTimedOut, ReadTimeout, WriteTimeout, Unavailable,
+        CoordinationFailure, NoHostAvailable,
+        OverloadedErrorMessage, IsBootstrappingErrorMessage
+    )
+
+    @property
+    def limit(self) -> int:
+        """Returns the current maximum number of in-flight requests."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Returns the number of in-flight requests."""
+        return self._in_flight
+
+    @property
+    def min_latency(self) -> Optional[float]:
+        """Returns the lowest latency observed, in seconds."""
+        return self._min_latency
+
+    def __init__(
+        self,
+        initial_limit: int = 32,
+        min_limit: int = 1,
+        max_limit: int = 512,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_tolerance: Optional[float] = 3.0
+    ):
+        """AIMD limiter constructor.
+
+        :param initial_limit: initial limit (default: 32)
+        :param min_limit: minimum limit (default: 1)
+        :param max_limit: maximum limit (default: 512)
+        :param increase: limit increase per window of successful
+            responses (default: 1.0)
+        :param decrease: limit factor on congestion (default: 0.5)
+        :param latency_tolerance: responses slower than this factor times
+            the lowest latency observed are a congestion signal.
+            If None, only errors decrease the limit (default: 3.0)
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must verify 1 <= min <= initial <= max.")
+        if not 0 < decrease < 1:
+            raise ValueError("Decrease factor must be between 0 and 1.")
+
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._increase = increase
+        self._decrease = decrease
+        self._latency_tolerance = latency_tolerance
+
+        self._in_flight = 0
+        self._min_latency = None
+        self._smoothed_latency = 0.0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Blocks until a request can be sent, and counts it as in flight."""
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def is_congestion(self, latency: float, error: BaseException = None) -> bool:
+        """Returns True if a response is a congestion signal."""
+        if error is not None:
+            return isinstance(error, self.OVERLOAD_ERRORS)
+
+        return (
+            self._latency_tolerance is not None
+            and self._min_latency is not None
+            and latency > self._latency_tolerance * self._min_latency
+        )
+
+    def release(self, latency: float, error: BaseException = None) -> None:
+        """Counts a request as completed, and adapts the limit.
+
+        :param latency: request latency, in seconds
+        :param error: request error, or None if it succeeded (default: None)
+        """
+        with self._condition:
+            self._in_flight -= 1
+
+            now = time.monotonic()
+            self._smoothed_latency = 0.9 * self._smoothed_latency + 0.1 * latency
+            if self.is_congestion(latency, error):
+                if now - self._last_decrease >= self._smoothed_latency:
+                    self._limit = max(self._min_limit, self._limit * self._decrease)
+                    self._last_decrease = now
+            elif error is None:
+                self._limit = min(
+                    self._max_limit, self._limit + self._increase / self._limit
+                )
+
+            if error is None and (self._min_latency is None or latency < self._min_latency):
+                self._min_latency = latency
+
+            self._condition.notify_all()
+
+    def __repr__(self):
+        return f"AIMDLimiter(limit={self.limit}, in_flight={self._in_flight})"
+
+
+class StatementResult:
+    """Outcome of a statement executed by a :class:`ConcurrentExecutor`."""
+
+    __slots__ = (
+        'statement', 'execution_profile', 'success', 'rows', 'error',
+        'latency', 'retries'
+    )
+
+    @property
+    def query_string(self) -> str:
+        """Returns the statement query string."""
+        return query_string_of(self.statement)
+
+    def __init__(
+        self,
+        statement: str or Statement,
+        execution_profile: str or ExecutionProfile = None
+    ):
+        """Statement result constructor.
+
+        :param statement: statement
+        :param execution_profile: execution profile of the statement
+            (default: None)
+        """
+        self.statement = statement
+        self.execution_profile = execution_profile
+        self.success = False
+        self.rows: List[Any] = []
+        self.error: Optional[BaseException] = None
+        self.latency: Optional[float] = None
+        self.retries = 0
+
+    def __repr__(self):
+        status = 'success' if self.success else f'error={self.error!r}'
+        return (
+            f"StatementResult({self.query_string!r}, {status}, "
+            f"rows={len(self.rows)}, retries={self.retries})"
+        )
+
+
+class ExecutionResult(list):
+    """Rows of a concurrent execution, in statement order,
+    with the :class:`StatementResult` of every statement.
+
+    Failed statements contribute no rows, so check
+    :attr:`~concurrency.ExecutionResult.complete` before trusting
+    aggregates computed from a result.
+
+    """
+
+    @property
+    def results(self) -> List[StatementResult]:
+        """Returns the result of every statement, in order."""
+        return self._results
+
+    @property
+    def failed(self) -> List[StatementResult]:
+        """Returns the results of the failed statements."""
+        return [result for result in self._results if not result.success]
+
+    @property
+    def complete(self) -> bool:
+        """Returns True if every statement succeeded."""
+        return all(result.success for result in self._results)
+
+    @property
+    def retries(self) -> int:
+        """Returns the total number of retries."""
+        return sum(result.retries for result in self._results)
+
+    def __init__(self, results: Iterable[StatementResult] = ()):
+        """Execution result constructor.
+
+        :param results: statement results, in order (default: ())
+        """
+        self._results = list(results)
+        super().__init__(
+            row for result in self._results if result.success for row in result.rows
+        )
+
+
+class ConcurrentExecutor:
+    """Executes statements concurrently, keeping at most
+    :attr:`~concurrency.AIMDLimiter.limit` requests in flight.
+
+    Statements are consumed one at a time as requests complete,
+    and every result page is fetched before a request is released.
+
+    Statements failing with a transient error (timeouts, unavailable
+    replicas or overloaded nodes) are re-run with exponential backoff,
+    up to `max_retries` times each and `retry_budget` times in total.
+    Only statements that can safely run twice are retried: driver
+    statements marked idempotent, and `SELECT` query strings.
+
+    With a :class:`Deadline`, requests get the remaining budget as their
+    timeout, and once it passes, or is cancelled, no statement is sent
+    and the requests in flight fail with its error.
+
+    """
+
+    RETRYABLE_ERRORS = AIMDLimiter.OVERLOAD_ERRORS
+
+    SELECT_RE = re.compile(r'^\s*SELECT\b', re.IGNORECASE)
+
+    @property
+    def limiter(self) -> AIMDLimiter:
+        """Returns the in-flight request limiter."""
+        return self._limiter
+
+    def __init__(
+        self,
+        session: Session,
+        limiter: AIMDLimiter = None,
+        max_retries: int = 0,
+        backoff: float = 0.1,
+        max_backoff: float = 10.0,
+        retry_budget: Optional[int] = None
+    ):
+        """Concurrent executor constructor.
+
+        :param session: Cassandra session
+        :param limiter: in-flight request limiter (default: None)
+            If not defined, a new limiter is created.
+        :param max_retries: maximum number of retries of each failed
+            statement (default: 0)
+        :param backoff: seconds before the first retry, doubled on every
+            following retry, with jitter (default: 0.1)
+        :param max_backoff: maximum seconds before a retry (default: 10.0)
+        :param retry_budget: maximum number of retries of an execution.
+            If None, only `max_retries` applies (default: None)
+        """
+        if max_retries < 0:
+            raise ValueError("Maximum retries can not be negative.")
+
+        self._session = session
+        self._limiter = limiter if limiter is not None else AIMDLimiter()
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._retry_budget = retry_budget
+
+    def is_retryable(self, result: StatementResult) -> bool:
+        """Returns True if a failed statement can be retried."""
+        if not isinstance(result.error, self.RETRYABLE_ERRORS):
+            return False
+
+        if isinstance(result.statement, Statement):
+            return bool(result.statement.is_idempotent)
+
+        return self.SELECT_RE.match(result.statement) is not None
+
+    def backoff(self, retry: int) -> float:
+        """Returns the seconds to wait before a retry, with full jitter.
+
+        :param retry: retry number, from 0
+        :return: seconds
+        """
+        return random.uniform(0, min(self._max_backoff, self._backoff * 2 ** retry))
+
+    def _options(self, result: StatementResult, state: '_ExecutionState') -> dict:
+        """Returns the driver options of a request."""
+        options = {}
+        if result.execution_profile is not None:
+            options['execution_profile'] = result.execution_profile
+        if state.deadline is not None:
+            timeout = state.deadline.request_timeout(self._session, result.execution_profile)
+            if timeout is not None:
+                options['timeout'] = timeout
+
+        return options
+
+    def _send(self, result: StatementResult, state: '_ExecutionState') -> None:
+        rows = []
+        # Latency is measured per page, so large results are not
+        # mistaken for congestion.
+        start = [time.monotonic()]
+        sent = start[0]
+
+        def _on_error(error):
+            now = time.monotonic()
+            self._limiter.release(now - start[0], error)
+            if state.is_finished(result):
+                return
+            result.latency = now - sent
+            result.error = error
+
+            if (not state.failed.is_set() or not state.raise_on_first_error) \
+                    and result.retries < self._max_retries \
+                    and self.is_retryable(result) and state.take_retry():
+                timer = threading.Timer(
+                    self.backoff(result.retries), self._retry, (result, state)
+                )
+                timer.daemon = True
+                timer.start()
+                return
+
+            if state.claim(result):
+                state.failed.set()
+                state.done.release()
+
+        try:
+            future = self._session.execute_async(result.statement, **self._options(result, state))
+        except Exception as error:
+            _on_error(error)
+            return
+
+        def _on_success(page):
+            rows.extend(page)
+            if future.has_more_pages and not state.is_finished(result):
+                if state.deadline is not None:
+                    # Each page gets the remaining budget, not the timeout
+                    # of the first request.
+                    error = state.deadline.error()
+                    if error is not None:
+                        _on_error(error)
+                        return
+                    timeout = state.deadline.request_timeout(self._session, result.execution_profile)
+                    if timeout is not None:
+                        future.timeout = timeout
+                start[0] = time.monotonic()
+                future.start_fetching_next_page()
+                return
+
+            now = time.monotonic()
+            self._limiter.release(now - start[0])
+            if state.claim(result):
+                result.latency = now - sent
+                result.rows = rows
+                result.error = None
+                result.success = True
+                state.done.release()
+
+        future.add_callbacks(_on_success, _on_error)
+
+    def _retry(self, result: StatementResult, state: '_ExecutionState') -> None:
+        if state.is_finished(result):
+            return
+        result.retries += 1
+        self._limiter.acquire()
+        self._send(result, state)
+
+    def execute(
+        self,
+        statements: Iterable[str or Statement or Tuple[str or Statement, Any]],
+        execution_profile: str or ExecutionProfile = None,
+        raise_on_first_error: bool = False,
+        deadline: Deadline = None
+    ) -> List[StatementResult]:
+        """Execute statements concurrently.
+
+        :param statements: statements, or (statement, execution profile)
+            tuples, consumed one at a time
+        :param execution_profile: execution profile of the statements
+            without their own (default: None)
+        :param raise_on_first_error: if True, stop sending statements on
+            the first error that is not retried, and raise it once the
+            in-flight requests complete (default: False)
+        :param deadline: overall deadline of the execution. The first
+            statement not sent because of it fails with its error
+            (default: None)
+        :return: result of each statement sent, in order
+        """
+        state = _ExecutionState(self._retry_budget, raise_on_first_error, deadline)
+
+        timer = None
+        if deadline is not None:
+            deadline.add_callback(state.abandon)
+            if deadline.remaining() is not None:
+                timer = threading.Timer(
+                    deadline.remaining(),
+                    lambda: state.abandon(DeadlineExceeded(deadline.timeout))
+                )
+                timer.daemon = True
+                timer.start()
+
+        try:
+            results = []
+            for statement in statements:
+                if raise_on_first_error and state.failed.is_set():
+                    break
+
+                profile = execution_profile
+                if isinstance(statement, tuple):
+                    statement, profile = statement
+
+                result = StatementResult(statement, profile)
+                results.append(result)
+                state.add(result)
+
+                error = deadline.error() if deadline is not None else None
+                if error is not None:
+                    if state.claim(result):
+                        result.error = error
+                        state.failed.set()
+                        state.done.release()
+                    break
+
+                self._limiter.acquire()
+                self._send(result, state)
+
+            for _ in range(len(results)):
+                state.done.acquire()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if deadline is not None:
+                deadline.remove_callback(state.abandon)
+
+        if raise_on_first_error:
+            for result in results:
+                if not result.success:
+                    raise result.error
+
+        return results
+
+
+class _ExecutionState:
+    """Shared state of the statements of one execution."""
+
+    __slots__ = (
+        'done', 'failed', 'raise_on_first_error', 'deadline', '_retry_budget',
+        '_pending', '_lock'
+    )
+
+    def __init__(
+        self,
+        retry_budget: Optional[int],
+        raise_on_first_error: bool,
+        deadline: Optional[Deadline] = None
+    ):
+        self.done = threading.Semaphore(0)
+        self.failed = threading.Event()
+        self.raise_on_first_error = raise_on_first_error
+        self.deadline = deadline
+        self._retry_budget = retry_budget
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def add(self, result: StatementResult) -> None:
+        """Counts a statement as pending."""
+        with self._lock:
+            self._pending[id(result)] = result
+
+    def is_finished(self, result: StatementResult) -> bool:
+        """Returns True if a statement completed, or was abandoned."""
+        return id(result) not in self._pending
+
+    def claim(self, result: StatementResult) -> bool:
+        """Returns True, and removes the statement from the pending ones,
+        if it is still pending. Only the claimer may complete it."""
+        with self._lock:
+            return self._pending.pop(id(result), None) is not None
+
+    def abandon(self, error: BaseException) -> None:
+        """Fails every pending statement with an error, without waiting
+        for their requests."""
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+
+        for result in pending:
+            result.error = error
+            self.failed.set()
+            self.done.release()
+
+    def take_retry(self) -> bool:
+        """Returns True, and consumes one retry, if the budget allows it."""
+        if self._retry_budget is None:
+            return True
+
+        with self._lock:
+            if self._retry_budget <= 0:
+                return False
+            self._retry_budget -= 1
+
+        return True
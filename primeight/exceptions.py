@@ -34,3 +34,26 @@ class NotARequiredColumnError(Exception):
     def __init__(self, name, query):
         super(NotARequiredColumnError, self) \
             .__init__(f"'{name}' is not a required column in query '{query}'.")
+
+
+class SpaceQueryNotFound(Exception):
+    """Exception thrown when no query can read a spatial area."""
+
+    def __init__(self, table):
+        super(SpaceQueryNotFound, self) \
+            .__init__(f"Table '{table}' has no query by H3 space column.")
+
+
+class DeadlineExceeded(Exception):
+    """Exception thrown when a query runs past its deadline."""
+
+    def __init__(self, timeout):
+        super(DeadlineExceeded, self) \
+            .__init__(f"Query deadline of {timeout}s exceeded.")
+
+
+class QueryCancelled(Exception):
+    """Exception thrown when a query is cancelled by the caller."""
+
+    def __init__(self):
+        super(QueryCancelled, self).__init__("Query cancelled.")
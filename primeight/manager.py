@@ -1,14 +1,45 @@
+import asyncio
+import importlib
 import logging
-from typing import List, Dict, Callable
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import \
+    Any, List, Dict, Callable, FrozenSet, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
 
-from cassandra import concurrent, ConsistencyLevel
+import yaml
+
+from cassandra import ConsistencyLevel, DriverException, InvalidRequest
 from cassandra.cluster import \
-    Cluster, Session, ExecutionProfile, EXEC_PROFILE_DEFAULT
-from cassandra.query import dict_factory
+    Cluster, Session, ExecutionProfile, EXEC_PROFILE_DEFAULT, DefaultConnection, ResultSet
+from cassandra.query import BoundStatement, Statement, dict_factory, tuple_factory
 from cassandra.auth import AuthProvider
 from cassandra.policies import \
-    LoadBalancingPolicy, RetryPolicy, RoundRobinPolicy, \
-    AddressTranslator
+    LoadBalancingPolicy, RetryPolicy, TokenAwarePolicy, \
+    DCAwareRoundRobinPolicy, AddressTranslator, HostDistance, \
+    SpeculativeExecutionPolicy, ConstantSpeculativeExecutionPolicy
+
+from primeight.catalog import MetadataCatalog, TableCatalog
+from primeight.concurrency import \
+    AIMDLimiter, ConcurrentExecutor, Deadline, ExecutionResult, StatementResult
+from primeight.column import CassandraColumn
+from primeight.metrics import MetricLabels, MetricsRegistry
+from primeight.prepared import PreparedStatementCache, is_unprepared
+from primeight.slowlog import SlowQueryLog
+from primeight.results import ColumnarResult, ColumnarResultBuilder
+
+
+class WarmUpReport(NamedTuple):
+    """Outcome of :func:`~manager.CassandraManager.warm_up`."""
+
+    hosts: int
+    statements: int
+    prepared: int
+    failed: List[str]
+    elapsed: float
 
 
 class CassandraManager:
@@ -17,6 +48,31 @@ class CassandraManager:
 
     """
 
+    SCHEMA_CHANGE_RE = re.compile(r'^\s*(CREATE|DROP|ALTER)\b', re.IGNORECASE)
+
+    CONNECTION_CLASSES = {
+        'libev': ('cassandra.io.libevreactor', 'LibevConnection'),
+        'asyncio': ('cassandra.io.asyncioreactor', 'AsyncioConnection'),
+        'asyncore': ('cassandra.io.asyncorereactor', 'AsyncoreConnection'),
+        'gevent': ('cassandra.io.geventreactor', 'GeventConnection'),
+        'eventlet': ('cassandra.io.eventletreactor', 'EventletConnection'),
+        'twisted': ('cassandra.io.twistedreactor', 'TwistedConnection')
+    }
+
+    COMPRESSIONS = [True, False, 'lz4', 'snappy']
+
+    # Fixed number of in-flight requests of non-adaptive executions,
+    # as in :func:`cassandra.concurrent.execute_concurrent`.
+    CONCURRENCY = 100
+
+    CONFIG_OPTIONS = [
+        'contact_points', 'connect_timeout', 'control_connection_timeout',
+        'catalog_ttl', 'light_metadata', 'keyspaces', 'protocol_version', 'compression',
+        'connections_per_host', 'max_requests_per_connection',
+        'executor_threads', 'connection_class', 'local_dc',
+        'slow_query_threshold', 'auto_prepare', 'prepared_cache_size'
+    ]
+
     @property
     def contact_points(self) -> List[str]:
         return self._contact_points
@@ -37,13 +93,98 @@ class CassandraManager:
     def address_translator(self) -> AddressTranslator:
         return self._address_translator
 
+    @property
+    def light_metadata(self) -> bool:
+        """Returns True if schema metadata is limited to the keyspaces
+        in use."""
+        return self._light_metadata
+
+    @property
+    def concurrency_limiter(self) -> AIMDLimiter:
+        """Returns the in-flight request limiter of adaptive
+        concurrent executions. The limiter is created on first access."""
+        if self._concurrency_limiter is None:
+            self._concurrency_limiter = AIMDLimiter()
+
+        return self._concurrency_limiter
+
+    @property
+    def metrics(self) -> MetricsRegistry:
+        """Returns the registry of the statement metrics."""
+        return self._metrics
+
+    @property
+    def slow_query_log(self) -> Optional[SlowQueryLog]:
+        """Returns the log of the slow statements, or None if disabled."""
+        return self._slow_query_log
+
+    @property
+    def auto_prepare(self) -> bool:
+        """Returns True if executed statements are automatically prepared."""
+        return self._auto_prepare
+
+    @property
+    def prepared_statements(self) -> PreparedStatementCache:
+        """Returns the registry of the automatically prepared statements,
+        bounded to `prepared_cache_size` statements with LRU eviction.
+        The registry is created on first access, and requires a connection."""
+        if self._prepared_statements is None:
+            self._prepared_statements = \
+                PreparedStatementCache(self.session, self._prepared_cache_size)
+
+        return self._prepared_statements
+
+    @property
+    def warm_up_report(self) -> Optional[WarmUpReport]:
+        """Returns the report of the last warm-up, or None if the manager
+        was not warmed up, e.g. for a readiness probe."""
+        return self._warm_up_report
+
+    @property
+    def catalog(self) -> TableCatalog:
+        """Returns the catalog of existing tables."""
+        return self._catalog
+
+    @staticmethod
+    def resolve_connection_class(
+        connection_class: Union[str, type, None],
+        max_requests_per_connection: int = None
+    ) -> Optional[type]:
+        """Returns the driver connection class of an event loop reactor.
+
+        :param connection_class: reactor name (libev, asyncio, asyncore,
+            gevent, eventlet or twisted), or connection class.
+            If None, the driver default is used
+        :param max_requests_per_connection: if defined, a subclass with this
+            maximum number of in-flight requests is returned (default: None)
+        :return: connection class, or None for the driver default
+        """
+        if isinstance(connection_class, str):
+            if connection_class not in CassandraManager.CONNECTION_CLASSES:
+                raise ValueError(f"Unrecognized connection class '{connection_class}'")
+
+            module_name, class_name = CassandraManager.CONNECTION_CLASSES[connection_class]
+            connection_class = getattr(importlib.import_module(module_name), class_name)
+
+        if max_requests_per_connection is None:
+            return connection_class
+
+        if connection_class is None:
+            connection_class = DefaultConnection
+
+        return type(
+            connection_class.__name__, (connection_class,),
+            {'max_in_flight': max_requests_per_connection}
+        )
+
     @staticmethod
     def create_execution_profile(
         load_balancing_policy: LoadBalancingPolicy,
         retry_policy: RetryPolicy,
         consistency_level: int = ConsistencyLevel.LOCAL_ONE,
         row_factory: Callable = dict_factory,
-        request_timeout: float = 10.0
+        request_timeout: float = 10.0,
+        speculative_execution_policy: SpeculativeExecutionPolicy = None
     ) -> ExecutionProfile:
         """Creates a Cassandra ExecutionProfile.
 
@@ -52,6 +193,9 @@ class CassandraManager:
         :param consistency_level: consistency level used when not set on execute
         :param row_factory: row factory (default: dict_factory)
         :param request_timeout: request timeout (default: 10.0)
+        :param speculative_execution_policy: speculative execution policy
+            of idempotent statements. If None, statements are not
+            speculatively executed (default: None)
         :return: Cassandra execution profile
         """
 
@@ -60,7 +204,39 @@ class CassandraManager:
             retry_policy=retry_policy,
             consistency_level=consistency_level,
             row_factory=row_factory,
-            request_timeout=request_timeout
+            request_timeout=request_timeout,
+            speculative_execution_policy=speculative_execution_policy
+        )
+
+    @staticmethod
+    def create_speculative_execution_profile(
+        load_balancing_policy: LoadBalancingPolicy,
+        retry_policy: RetryPolicy,
+        delay: float = 0.05,
+        max_attempts: int = 2,
+        **kwargs
+    ) -> ExecutionProfile:
+        """Creates a Cassandra ExecutionProfile that speculatively executes
+        idempotent statements (e.g. the queries built by
+        :func:`~table.CassandraTable.query`) on another replica, when the
+        first one has not answered after `delay` seconds.
+
+        :param load_balancing_policy: load balancing policy
+        :param retry_policy: retry policy used when not set on execute
+        :param delay: seconds before each speculative execution (default: 0.05)
+        :param max_attempts: maximum number of speculative executions,
+            on top of the first one (default: 2)
+        :param kwargs: other :func:`~manager.CassandraManager.create_execution_profile`
+            parameters
+        :return: Cassandra execution profile
+        """
+        return CassandraManager.create_execution_profile(
+            load_balancing_policy=load_balancing_policy,
+            retry_policy=retry_policy,
+            speculative_execution_policy=ConstantSpeculativeExecutionPolicy(
+                delay, max_attempts
+            ),
+            **kwargs
         )
 
     def __init__(
@@ -70,12 +246,28 @@ class CassandraManager:
         control_connection_timeout: float = 2.0,
         profiles: Dict[str, ExecutionProfile] = None,
         address_translator: AddressTranslator = None,
-        auth_provider: AuthProvider = None
+        auth_provider: AuthProvider = None,
+        catalog_ttl: Optional[float] = 300.0,
+        light_metadata: bool = False,
+        keyspaces: List[str] = None,
+        protocol_version: int = None,
+        compression: Union[bool, str] = True,
+        connections_per_host: Union[int, Tuple[int, int]] = None,
+        max_requests_per_connection: int = None,
+        executor_threads: int = 2,
+        connection_class: Union[str, type] = None,
+        local_dc: str = None,
+        concurrency_limiter: AIMDLimiter = None,
+        metrics: MetricsRegistry = None,
+        slow_query_threshold: Optional[float] = None,
+        auto_prepare: bool = False,
+        prepared_cache_size: int = 1024
     ):
         """Cassandra Manager constructor.
 
         If profiles is not defined defaults to ExecutionProfile with:
-          - cassandra.policies.RoundRobinPolicy load balancing policy
+          - cassandra.policies.TokenAwarePolicy load balancing policy,
+            wrapping a cassandra.policies.DCAwareRoundRobinPolicy
           - cassandra.policies.RetryPolicy retry policy
           - LOCAL_ONE consistency level
           - dict_factory row factory
@@ -89,31 +281,176 @@ class CassandraManager:
         :param address_translator: translator to be used in translating
             server node addresses to driver connection addresses (default: None)
         :param auth_provider: authentication provider (default: None)
+        :param catalog_ttl: number of seconds the list of existing tables
+            of a keyspace is cached in light metadata mode. If None, it is
+            only refreshed after a schema change executed by this manager.
+            Otherwise, existing tables are read from the driver schema
+            metadata, which is kept up to date by the driver (default: 300.0)
+        :param light_metadata: if True, the driver does not fetch nor
+            refresh the schema metadata of the whole cluster, which is slow
+            on clusters with thousands of split tables. Only the keyspace
+            metadata (i.e. replication) of the keyspaces in use is fetched,
+            when connecting for `keyspaces` and on first use for the
+            others, so that token aware load balancing policies keep
+            routing to replicas. Existing tables are looked up on demand,
+            from the system tables (default: False)
+        :param keyspaces: keyspaces in use, whose keyspace metadata is
+            fetched when connecting in light metadata mode (default: None)
+        :param protocol_version: native protocol version. If None, the
+            highest version supported by the cluster is negotiated
+            (default: None)
+        :param compression: True to use lz4 or snappy, whichever is
+            installed, lz4 or snappy to require one, or False (default: True)
+        :param connections_per_host: number of connections, or (core, max)
+            connections, to each local host. Only supported by protocol
+            versions 1 and 2, later versions use a single connection per
+            host (default: None)
+        :param max_requests_per_connection: maximum number of in-flight
+            requests per connection (default: None)
+        :param executor_threads: number of driver threads handling
+            responses and events (default: 2)
+        :param connection_class: event loop reactor (libev, asyncio,
+            asyncore, gevent, eventlet or twisted), or connection class.
+            If None, the driver default is used (default: None)
+        :param local_dc: local datacenter of the default load balancing
+            policy. If None, the datacenter of the first contact point
+            is used (default: None)
+        :param concurrency_limiter: in-flight request limiter of adaptive
+            concurrent executions. If None, an
+            :class:`~concurrency.AIMDLimiter` with default settings is
+            used (default: None)
+        :param metrics: registry of the statement metrics. If None, a new
+            :class:`~metrics.MetricsRegistry` is used (default: None)
+        :param slow_query_threshold: latency, in seconds, from which
+            statements are recorded in the
+            :attr:`~manager.CassandraManager.slow_query_log`.
+            If None, slow statements are not recorded (default: None)
+        :param auto_prepare: if True, the literal values of the executed
+            queries and inserts are extracted into bind values, and the
+            normalized statements are prepared once and cached
+            (see :attr:`~manager.CassandraManager.prepared_statements`)
+            (default: False)
+        :param prepared_cache_size: maximum number of prepared statements
+            kept by auto-preparation (default: 1024)
         :type profiles: dict
         """
+        if compression not in self.COMPRESSIONS:
+            raise ValueError(f"Unrecognized compression '{compression}'")
+
         self._contact_points = contact_points
         self._address_translator = address_translator
         self._session = None
+        self._row_factory_profiles = {}
+        self._speculative_profiles = {}
+        self._timeout_profiles = {}
+        self._concurrency_limiter = concurrency_limiter
+        self._metrics = metrics if metrics is not None else MetricsRegistry()
+        self._slow_query_log = SlowQueryLog(slow_query_threshold) \
+            if slow_query_threshold is not None else None
+        self._auto_prepare = auto_prepare
+        self._prepared_cache_size = prepared_cache_size
+        self._prepared_statements = None
+        self._warm_up_report = None
+        self._catalog = TableCatalog(self._load_tables, ttl=catalog_ttl) \
+            if light_metadata else MetadataCatalog(self._keyspace_metadata)
+        self._light_metadata = light_metadata
+        self._keyspaces = list(keyspaces or ())
+        self._metadata_keyspaces = set()
+        self._host_tokens = None
 
         if profiles is None:
             self._execution_profiles = {
                 EXEC_PROFILE_DEFAULT: self.create_execution_profile(
-                    load_balancing_policy=RoundRobinPolicy(),
+                    load_balancing_policy=TokenAwarePolicy(
+                        DCAwareRoundRobinPolicy(local_dc=local_dc or '')
+                    ),
                     retry_policy=RetryPolicy()
                 )
             }
         else:
             self._execution_profiles = profiles
 
+        legacy_protocol = protocol_version is not None and protocol_version < 3
+
+        cluster_options = {}
+        if protocol_version is not None:
+            cluster_options['protocol_version'] = protocol_version
+
         self._cluster = Cluster(
             contact_points=self.contact_points,
             connect_timeout=connect_timeout,
             control_connection_timeout=control_connection_timeout,
             execution_profiles=self.execution_profiles,
             address_translator=self.address_translator,
-            auth_provider=auth_provider
+            auth_provider=auth_provider,
+            schema_metadata_enabled=not light_metadata,
+            compression=compression,
+            executor_threads=executor_threads,
+            connection_class=self.resolve_connection_class(
+                connection_class,
+                None if legacy_protocol else max_requests_per_connection
+            ),
+            **cluster_options
         )
 
+        if legacy_protocol:
+            if max_requests_per_connection is not None:
+                self._cluster.set_max_requests_per_connection(
+                    HostDistance.LOCAL, max_requests_per_connection
+                )
+            if connections_per_host is not None:
+                if isinstance(connections_per_host, int):
+                    connections_per_host = (connections_per_host, connections_per_host)
+                core, maximum = connections_per_host
+                self._cluster.set_max_connections_per_host(HostDistance.LOCAL, maximum)
+                self._cluster.set_core_connections_per_host(HostDistance.LOCAL, core)
+        elif connections_per_host is not None:
+            logging.warning(
+                "Connections per host are only supported by protocol versions 1 and 2, "
+                "a single connection per host is used."
+            )
+
+    @classmethod
+    def from_config(
+        cls, config: Union[Dict[str, Any], str, Path], **kwargs
+    ) -> 'CassandraManager':
+        """Creates a Cassandra manager from a configuration,
+        or from a yaml configuration file.
+
+        The configuration keys are the constructor options that can be
+        serialized: contact_points, connect_timeout,
+        control_connection_timeout, catalog_ttl, light_metadata, keyspaces,
+        protocol_version, compression, connections_per_host,
+        max_requests_per_connection, executor_threads, connection_class
+        (as a reactor name), local_dc, slow_query_threshold, auto_prepare
+        and prepared_cache_size (see
+        :attr:`~manager.CassandraManager.CONFIG_OPTIONS`).
+
+        :param config: configuration, or path to a yaml configuration file
+        :param kwargs: other constructor options (e.g. profiles or
+            auth_provider), overriding the configuration
+        :return: Cassandra manager
+        """
+        if not isinstance(config, dict):
+            config_file = Path(config)
+            if not config_file.is_file():
+                raise FileNotFoundError(f"Manager configuration '{config}' not found.")
+
+            config = yaml.safe_load(config_file.read_text(encoding='utf-8')) or {}
+
+        unrecognized = [key for key in config if key not in cls.CONFIG_OPTIONS]
+        if len(unrecognized) > 0:
+            raise ValueError(
+                f"Unrecognized manager options: {', '.join(unrecognized)}"
+            )
+
+        options = dict(config)
+        if isinstance(options.get('connections_per_host'), list):
+            options['connections_per_host'] = tuple(options['connections_per_host'])
+        options.update(kwargs)
+
+        return cls(**options)
+
     def connect(self, keyspace: str = None):
         """Connects to the Cassandra cluster, creating a session.
 
@@ -122,68 +459,789 @@ class CassandraManager:
         """
         self._session = self.cluster.connect(keyspace=keyspace)
 
+        if self._light_metadata:
+            for name in self._keyspaces + ([keyspace] if keyspace else []):
+                self._use_keyspace(name)
+
         return self
 
+    def _use_keyspace(self, keyspace: str) -> None:
+        """Fetch the keyspace metadata of a keyspace in light metadata
+        mode, once, so that token aware policies know its replicas."""
+        if not self._light_metadata or not keyspace or keyspace in self._metadata_keyspaces:
+            return
+
+        self._metadata_keyspaces.add(keyspace)
+        try:
+            self.cluster.refresh_keyspace_metadata(keyspace)
+        except DriverException as error:
+            logging.warning(
+                f"Keyspace metadata of '{keyspace}' not fetched, statements "
+                f"are not routed to replicas (error: {error})"
+            )
+
+    def _query_system(self, statement: str, parameters: tuple = None) -> List[tuple]:
+        """Execute a query on the system tables, returning tuple rows."""
+        profile = self._row_factory_profile(None, tuple_factory)
+
+        return list(self.session.execute(
+            statement, parameters, execution_profile=profile
+        ))
+
+    def _load_tables(self, keyspace: str) -> FrozenSet[str]:
+        """Returns the table and view names of a keyspace,
+        from the system schema tables."""
+        tables = self._query_system(
+            "SELECT table_name FROM system_schema.tables "
+            "WHERE keyspace_name=%s", (keyspace,)
+        )
+        views = self._query_system(
+            "SELECT view_name FROM system_schema.views "
+            "WHERE keyspace_name=%s", (keyspace,)
+        )
+
+        return frozenset(row[0] for row in tables + views)
+
+    def _keyspace_metadata(self, keyspace: str):
+        """Returns the driver schema metadata of a keyspace,
+        or None if the keyspace does not exist."""
+        return self.cluster.metadata.keyspaces.get(keyspace)
+
+    def host_tokens(self, refresh: bool = False) -> Dict[str, List[str]]:
+        """Returns the tokens owned by each host of the cluster,
+        from the token metadata, or from the system tables when the
+        driver has no token map. System table lookups are cached.
+
+        :param refresh: if True, tokens are looked up again (default: False)
+        :return: mapping from host address to sorted tokens
+        """
+        token_map = self.cluster.metadata.token_map
+        if token_map is not None:
+            host_tokens = {}
+            for token, host in token_map.token_to_host_owner.items():
+                host_tokens.setdefault(str(host.address), []).append(token.value)
+
+            return {host: sorted(tokens) for host, tokens in host_tokens.items()}
+
+        if self._host_tokens is None or refresh:
+            local = self._query_system(
+                "SELECT broadcast_address, tokens FROM system.local"
+            )
+            try:
+                peers = self._query_system("SELECT peer, tokens FROM system.peers_v2")
+            except InvalidRequest:
+                # Cassandra versions before 4.0 have no `peers_v2` table.
+                peers = self._query_system("SELECT peer, tokens FROM system.peers")
+
+            self._host_tokens = {
+                str(address): sorted(int(t) for t in tokens or ())
+                for address, tokens in local + peers
+            }
+
+        return self._host_tokens
+
+    def tables(self, keyspace: str) -> FrozenSet[str]:
+        """Returns the names of the existing tables and materialized views
+        of a keyspace. Names are cached in light metadata mode (see
+        :attr:`~manager.CassandraManager.catalog`)."""
+        return self._catalog.tables(keyspace)
+
+    def table_exists(self, keyspace: str, table: str) -> bool:
+        """Returns True if the table or materialized view exists."""
+        return self._catalog.exists(keyspace, table)
+
+    def _is_schema_change(self, statement) -> bool:
+        query_string = getattr(statement, 'query_string', statement)
+
+        return self.SCHEMA_CHANGE_RE.match(query_string) is not None
+
+    @staticmethod
+    def _statement_size(statement) -> int:
+        """Returns the size, in bytes, of the query string of a statement."""
+        return len(getattr(statement, 'query_string', statement).encode('utf-8'))
+
+    def _labelled(
+        self,
+        statements: Iterable,
+        labeler: Callable[[Any], MetricLabels] = None
+    ) -> Iterator[Tuple[Any, MetricLabels]]:
+        """Yields each statement with its metric labels, recording the time
+        spent building it, i.e. producing it from the statement stream."""
+        if labeler is None:
+            labeler = MetricsRegistry.statement_labels
+
+        statements = iter(statements)
+        while True:
+            start = time.perf_counter()
+            try:
+                statement = next(statements)
+            except StopIteration:
+                return
+            build = time.perf_counter() - start
+
+            labels = labeler(statement[0] if isinstance(statement, tuple) else statement)
+            self._metrics.record_build(labels, build)
+            if self._light_metadata:
+                self._use_keyspace(labels.keyspace)
+
+            yield statement, labels
+
+    def _bind(
+        self, statement: str or Statement or Tuple[str or Statement, Any]
+    ) -> str or Statement or Tuple[str or Statement, Any]:
+        """Returns the statement bound to its prepared statement
+        if auto-preparation is enabled, or the statement itself."""
+        if not self._auto_prepare:
+            return statement
+        elif isinstance(statement, tuple):
+            return (self.prepared_statements.bind(statement[0]),) + statement[1:]
+
+        return self.prepared_statements.bind(statement)
+
+    def _execute_statement(
+        self,
+        statement: str or Statement,
+        execution_profile: str or ExecutionProfile = None,
+        deadline: Deadline = None
+    ):
+        """Execute a statement, bound to its prepared statement if
+        auto-preparation is enabled. After an `Unprepared` response,
+        the statement is prepared again and executed once more.
+        With a deadline, the request gets the remaining budget as its
+        timeout, and waiting stops when the deadline is cancelled."""
+        kwargs = {}
+        if execution_profile is not None:
+            kwargs['execution_profile'] = execution_profile
+
+        def _execute(_statement):
+            if deadline is None:
+                return self.session.execute(_statement, **kwargs)
+
+            deadline.check()
+            timeout = deadline.request_timeout(self.session, execution_profile)
+            if timeout is not None:
+                kwargs['timeout'] = timeout
+
+            return deadline.wait(self.session.execute_async(_statement, **kwargs))
+
+        bound = self._bind(statement)
+        try:
+            return _execute(bound)
+        except Exception as error:
+            if not isinstance(bound, BoundStatement) or not is_unprepared(error):
+                raise
+
+        logging.warning(
+            f"Prepared statement unknown, preparing it again "
+            f"(statement: {bound.prepared_statement.query_string})"
+        )
+
+        return _execute(self.prepared_statements.rebind(bound))
+
+    def _rows(
+        self,
+        result: ResultSet,
+        execution_profile: str or ExecutionProfile = None,
+        deadline: Deadline = None
+    ) -> List[Any]:
+        """Returns the rows of every page of a result. With a deadline,
+        pages are fetched one at a time, see
+        :func:`~manager.CassandraManager._fetch_next_page`."""
+        if deadline is None:
+            return [row for row in result]
+
+        rows = list(result.current_rows)
+        while result.has_more_pages:
+            self._fetch_next_page(result, execution_profile, deadline)
+            rows += result.current_rows
+
+        return rows
+
+    def _fetch_next_page(
+        self,
+        result: ResultSet,
+        execution_profile: str or ExecutionProfile = None,
+        deadline: Deadline = None
+    ) -> None:
+        """Fetch the next page of a result. With a deadline, the deadline
+        is checked first, and the request gets the remaining budget as
+        its timeout instead of the timeout of the first page."""
+        if deadline is not None:
+            deadline.check()
+            timeout = deadline.request_timeout(self.session, execution_profile)
+            if timeout is not None:
+                result.response_future.timeout = timeout
+
+        result.fetch_next_page()
+
+    def _reprepare_failed(
+        self, results: List[StatementResult], deadline: Deadline = None
+    ) -> None:
+        """Execute again, after preparing them again, the bound statements
+        of a concurrent execution that failed with an `Unprepared` response."""
+        for statement_result in results:
+            if statement_result.success \
+                    or not isinstance(statement_result.statement, BoundStatement) \
+                    or not is_unprepared(statement_result.error):
+                continue
+
+            start = time.perf_counter()
+            try:
+                rows = list(self._execute_statement(
+                    self.prepared_statements.rebind(statement_result.statement),
+                    statement_result.execution_profile, deadline
+                ))
+            except Exception as error:
+                statement_result.error = error
+                continue
+            finally:
+                statement_result.retries += 1
+
+            statement_result.success = True
+            statement_result.rows = rows
+            statement_result.error = None
+            statement_result.latency = time.perf_counter() - start
+
+    def _record_execution(
+        self,
+        slow_queries: List[tuple],
+        statement: str or Statement,
+        labels: MetricLabels,
+        latency: Optional[float],
+        rows: int = 0,
+        size: int = 0,
+        error: BaseException = None
+    ) -> None:
+        """Records the metrics of an executed statement, and appends it to
+        `slow_queries` if it is slow. Slow statements are logged once the
+        fan-out of the call is known."""
+        self._metrics.record_execution(labels, latency, rows, size, error)
+        if self._slow_query_log is not None and self._slow_query_log.is_slow(latency):
+            slow_queries.append((statement, labels, latency, rows))
+
+    def _log_slow_queries(self, slow_queries: List[tuple], fan_out: int) -> None:
+        for statement, labels, latency, rows in slow_queries:
+            self._slow_query_log.record(statement, latency, rows, fan_out, labels)
+
+    def prepare_splits(
+        self,
+        table,
+        periods: int = 2,
+        now: datetime = None,
+        keyspace: str = None
+    ) -> int:
+        """Prepares ahead of time the insert and query statements of a
+        table for the current and following split periods, so that the
+        first statements of a new period, e.g. at midnight for daily
+        splits, do not wait for their preparation.
+
+        Statements are added to
+        :attr:`~manager.CassandraManager.prepared_statements`, and are
+        only used when auto-preparation is enabled.
+
+        :param table: Cassandra table
+        :param periods: number of split periods, from the current one
+            (default: 2)
+        :param now: current date in UTC (default: None)
+        :param keyspace: keyspace name (default: None)
+        :return: number of prepared statements
+        """
+        prepared = 0
+        for query_string in table.warm_up_statements(periods, now, keyspace):
+            if self.prepared_statements.prepare(query_string) is not None:
+                prepared += 1
+
+        return prepared
+
+    def _warm_up_prepare(self, query_string: str) -> bool:
+        """Prepares a warm-up statement, returning True if it is prepared."""
+        try:
+            return self.prepared_statements.prepare(query_string) is not None
+        except Exception as error:
+            logging.warning(f"Warm-up failed to prepare '{query_string}': {error}")
+            return False
+
+    def warm_up(
+        self,
+        tables: Iterable,
+        periods: int = 1,
+        now: datetime = None,
+        keyspace: str = None,
+        max_workers: int = 8,
+        timeout: Optional[float] = None
+    ) -> WarmUpReport:
+        """Warms up the manager before serving requests: opens the
+        connection pool of every host, connecting first if needed, and
+        concurrently prepares the insert and query statements of every
+        table, its materialized views and the current split periods
+        (see :func:`~table.CassandraTable.warm_up_statements`).
+
+        Prepared statements are kept in
+        :attr:`~manager.CassandraManager.prepared_statements`, and are
+        only used when auto-preparation is enabled.
+        The report is also kept in
+        :attr:`~manager.CassandraManager.warm_up_report`.
+
+        :param tables: Cassandra tables
+        :param periods: number of split periods, from the current one
+            (default: 1)
+        :param now: current date in UTC (default: None)
+        :param keyspace: keyspace name (default: None)
+        :param max_workers: number of statements prepared concurrently
+            (default: 8)
+        :param timeout: maximum number of seconds waiting for the host
+            pools. If None, there is no limit (default: None)
+        :return: warm-up report
+        """
+        start = time.perf_counter()
+
+        if self.session is None:
+            self.connect()
+
+        wait(self.session.update_created_pools(), timeout=timeout)
+        hosts = len(self.session.get_pools())
+
+        statements = list(dict.fromkeys(
+            query_string
+            for table in tables
+            for query_string in table.warm_up_statements(periods, now, keyspace)
+        ))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            prepared = list(executor.map(self._warm_up_prepare, statements))
+
+        self._warm_up_report = WarmUpReport(
+            hosts=hosts,
+            statements=len(statements),
+            prepared=sum(prepared),
+            failed=[s for s, is_prepared in zip(statements, prepared) if not is_prepared],
+            elapsed=time.perf_counter() - start
+        )
+        logging.info(
+            f"Warm-up of {hosts} hosts and {len(statements)} statements "
+            f"done in {self._warm_up_report.elapsed:.3f}s"
+        )
+
+        return self._warm_up_report
+
+    def stats(self) -> Dict[MetricLabels, Dict[str, Any]]:
+        """Returns a snapshot of the statement metrics, by label set
+        (see :func:`~metrics.MetricsRegistry.stats`)."""
+        return self._metrics.stats()
+
     def execute(
         self,
-        statements: List[str],
-        execution_profile: str or ExecutionProfile = None
+        statements: Iterable[str],
+        execution_profile: str or ExecutionProfile = None,
+        row_factory: Callable = None,
+        labeler: Callable[[Any], MetricLabels] = None,
+        deadline: Deadline or float = None
     ) -> List[tuple] or List[dict]:
         """Execute list of query statements sequentially.
 
-        :param statements: list of query statements
+        :param statements: query statements, consumed one at a time
         :param execution_profile: execution profile (default: None)
             This parameter can be both the name of a configured profile,
             or the execution profile itself.
+        :param row_factory: row factory replacing the one of the
+            execution profile, e.g. a
+            :class:`~rows.SlottedRowFactory` (default: None)
+        :param labeler: function returning the metric labels of a
+            statement. If None, labels are read from the query string
+            (default: None)
+        :param deadline: overall deadline of the statements, or its number
+            of seconds. Each request gets the remaining budget, and
+            :class:`~exceptions.DeadlineExceeded` or
+            :class:`~exceptions.QueryCancelled` is raised once it passes
+            or is cancelled (default: None)
         :return: list of rows as formatted by the rows_factory
             in the execution profile
         """
+        deadline = Deadline.of(deadline)
+        if row_factory is not None:
+            execution_profile = \
+                self._row_factory_profile(execution_profile, row_factory)
+
         result_list = []
-        for statement in statements:
-            if execution_profile is not None:
-                result = self.session.execute(statement, execution_profile=execution_profile)
-            else:
-                result = self.session.execute(statement)
+        slow_queries = []
+        fan_out = 0
+        try:
+            for statement, labels in self._labelled(statements, labeler):
+                fan_out += 1
+                size = self._statement_size(statement)
+                start = time.perf_counter()
+                try:
+                    result = self._execute_statement(statement, execution_profile, deadline)
+
+                    rows = self._rows(result, execution_profile, deadline)
+                except Exception as error:
+                    self._record_execution(
+                        slow_queries, statement, labels,
+                        time.perf_counter() - start, size=size, error=error
+                    )
+                    raise
+
+                self._record_execution(
+                    slow_queries, statement, labels,
+                    time.perf_counter() - start, len(rows), size
+                )
+
+                if self._is_schema_change(statement):
+                    self._catalog.invalidate()
 
-            result_list += [row for row in result]
+                result_list += rows
+        finally:
+            self._log_slow_queries(slow_queries, fan_out)
 
         return result_list
 
     def execute_concurrent(
         self,
-        statements: List[str],
-        raise_on_first_error: bool = False
-    ) -> List[tuple] or List[dict]:
+        statements: Iterable[str or Statement or Tuple[str or Statement, Any]],
+        raise_on_first_error: bool = False,
+        adaptive: bool = False,
+        execution_profile: str or ExecutionProfile = None,
+        max_retries: int = 0,
+        retry_budget: Optional[int] = None,
+        labeler: Callable[[Any], MetricLabels] = None,
+        deadline: Deadline or float = None
+    ) -> ExecutionResult:
         """Execute list of query statements concurrently.
 
-        This method does not allow to specify the execution profile to use,
-        it is thus encouraged to set the desired execution profile as default
-        when creating the CassandraManager object. You can do this with the
+        Statements may be (statement, execution profile) tuples, to use
+        another execution profile than `execution_profile` or the default
+        execution profile, which can be set with the
         :func:`~manager.CassandraManager.create_default_execution_profile`
         method.
 
-        :param statements: list of query statements
+        The result holds the rows of the successful statements, and the
+        :class:`~concurrency.StatementResult` of every statement in
+        :attr:`~concurrency.ExecutionResult.results`, so missing data can
+        be detected with :attr:`~concurrency.ExecutionResult.complete`.
+
+        :param statements: query statements, consumed one at a time
         :param raise_on_first_error: raise exception on first error
             or continue and log possible errors (default: True)
+        :param adaptive: if True, the number of in-flight requests is
+            adapted to the observed latency, timeouts and overload errors
+            by :attr:`~manager.CassandraManager.concurrency_limiter`,
+            instead of the fixed :attr:`~manager.CassandraManager.CONCURRENCY`
+            (default: False)
+        :param execution_profile: execution profile of the statements
+            without their own (default: None)
+        :param max_retries: maximum number of retries, with exponential
+            backoff, of each idempotent statement failing with a transient
+            error (default: 0)
+        :param retry_budget: maximum number of retries of the execution.
+            If None, only `max_retries` applies (default: None)
+        :param labeler: function returning the metric labels of a
+            statement (default: None)
+        :param deadline: overall deadline of the execution, or its number
+            of seconds. Each request gets the remaining budget, and once
+            it passes or is cancelled, no statement is sent and the
+            requests in flight fail with
+            :class:`~exceptions.DeadlineExceeded` or
+            :class:`~exceptions.QueryCancelled` (default: None)
         :return: list of rows as formatted by the rows_factory
             in the execution profile
         """
-        result_list = []
+        deadline = Deadline.of(deadline)
+        schema_changes = []
+        statement_labels = []
+
+        def _track(_statements):
+            for s, labels in self._labelled(_statements, labeler):
+                statement = s[0] if isinstance(s, tuple) else s
+                schema_changes.append(self._is_schema_change(statement))
+                statement_labels.append((statement, labels))
+                yield self._bind(s)
 
-        statements_and_params = [(s, ()) for s in statements]
-        query_results = concurrent.execute_concurrent(
-            self.session,
-            statements_and_params,
-            raise_on_first_error=raise_on_first_error
+        limiter = self.concurrency_limiter if adaptive \
+            else AIMDLimiter(self.CONCURRENCY, self.CONCURRENCY, self.CONCURRENCY)
+        executor = ConcurrentExecutor(
+            self.session, limiter,
+            max_retries=max_retries, retry_budget=retry_budget
         )
+        try:
+            query_results = executor.execute(
+                _track(statements),
+                execution_profile=execution_profile,
+                raise_on_first_error=raise_on_first_error,
+                deadline=deadline
+            )
+        finally:
+            if any(schema_changes):
+                self._catalog.invalidate()
 
-        for (success, result) in query_results:
-            if not success:
-                logging.error(f"A query failed with error: {result}")
-            else:
-                result_list += [row for row in result]
+        if self._auto_prepare:
+            self._reprepare_failed(query_results, deadline)
 
-        return result_list
+        result = ExecutionResult(query_results)
+        slow_queries = []
+        for statement_result, (statement, labels) in zip(result.results, statement_labels):
+            self._record_execution(
+                slow_queries, statement, labels,
+                statement_result.latency, len(statement_result.rows),
+                self._statement_size(statement), statement_result.error
+            )
+        self._log_slow_queries(slow_queries, len(result.results))
+
+        for statement_result in result.failed:
+            logging.error(
+                f"A query failed with error: {statement_result.error} "
+                f"(statement: {statement_result.query_string}, "
+                f"retries: {statement_result.retries})"
+            )
+
+        return result
+
+    async def execute_concurrent_async(
+        self,
+        statements: Iterable[str or Statement or Tuple[str or Statement, Any]],
+        deadline: Deadline or float = None,
+        **kwargs
+    ) -> ExecutionResult:
+        """Execute list of query statements concurrently, from a
+        coroutine. Statements are executed in the default executor of the
+        event loop, so the loop is never blocked.
+
+        When the awaiting task is cancelled, the deadline is cancelled,
+        so no other statement is sent and the execution stops waiting
+        for the requests in flight.
+
+        :param statements: query statements, consumed one at a time
+        :param deadline: overall deadline of the execution, or its number
+            of seconds (default: None)
+        :param kwargs: other
+            :func:`~manager.CassandraManager.execute_concurrent` parameters
+        :return: execution result
+        """
+        deadline = Deadline.of(deadline) or Deadline()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                None, partial(self.execute_concurrent, statements, deadline=deadline, **kwargs)
+            )
+        except asyncio.CancelledError:
+            deadline.cancel()
+            raise
+
+    def _row_factory_profile(
+        self,
+        execution_profile: str or ExecutionProfile = None,
+        row_factory: Callable = tuple_factory
+    ) -> ExecutionProfile:
+        """Returns a copy of the execution profile using another row factory."""
+        if isinstance(execution_profile, ExecutionProfile):
+            return self.session.execution_profile_clone_update(
+                execution_profile, row_factory=row_factory
+            )
+
+        name = EXEC_PROFILE_DEFAULT if execution_profile is None \
+            else execution_profile
+        key = (name, row_factory)
+        if key not in self._row_factory_profiles:
+            self._row_factory_profiles[key] = \
+                self.session.execution_profile_clone_update(
+                    name, row_factory=row_factory
+                )
+
+        return self._row_factory_profiles[key]
+
+    def speculative_profile(
+        self,
+        execution_profile: str or ExecutionProfile = None,
+        delay: float = 0.05,
+        max_attempts: int = 2
+    ) -> ExecutionProfile:
+        """Returns a copy of an execution profile that speculatively executes
+        idempotent statements, to be used for a single query, e.g.
+        `table.execute(execution_profile=manager.speculative_profile())`.
+        Copies of named profiles are cached.
+
+        :param execution_profile: execution profile name, or the execution
+            profile itself (default: None)
+        :param delay: seconds before each speculative execution (default: 0.05)
+        :param max_attempts: maximum number of speculative executions,
+            on top of the first one (default: 2)
+        :return: execution profile
+        """
+        policy = ConstantSpeculativeExecutionPolicy(delay, max_attempts)
+        if isinstance(execution_profile, ExecutionProfile):
+            return self.session.execution_profile_clone_update(
+                execution_profile, speculative_execution_policy=policy
+            )
+
+        name = EXEC_PROFILE_DEFAULT if execution_profile is None \
+            else execution_profile
+        key = (name, delay, max_attempts)
+        if key not in self._speculative_profiles:
+            self._speculative_profiles[key] = \
+                self.session.execution_profile_clone_update(
+                    name, speculative_execution_policy=policy
+                )
+
+        return self._speculative_profiles[key]
+
+    def timeout_profile(
+        self,
+        execution_profile: str or ExecutionProfile = None,
+        timeout: float = 10.0
+    ) -> ExecutionProfile:
+        """Returns a copy of an execution profile with another request
+        timeout, e.g. for the queries declaring a `timeout` in the yaml.
+        Copies of named profiles are cached.
+
+        :param execution_profile: execution profile name, or the execution
+            profile itself (default: None)
+        :param timeout: request timeout, in seconds (default: 10.0)
+        :return: execution profile
+        """
+        if isinstance(execution_profile, ExecutionProfile):
+            return self.session.execution_profile_clone_update(
+                execution_profile, request_timeout=timeout
+            )
+
+        name = EXEC_PROFILE_DEFAULT if execution_profile is None \
+            else execution_profile
+        key = (name, timeout)
+        if key not in self._timeout_profiles:
+            self._timeout_profiles[key] = \
+                self.session.execution_profile_clone_update(
+                    name, request_timeout=timeout
+                )
+
+        return self._timeout_profiles[key]
+
+    def _iter_pages(
+        self,
+        statements: Iterable[str],
+        execution_profile: str or ExecutionProfile = None,
+        row_factory: Callable = tuple_factory,
+        labeler: Callable[[Any], MetricLabels] = None,
+        deadline: Deadline or float = None
+    ) -> Iterator[Tuple[List[str], List[tuple]]]:
+        """Yields the (column names, tuple rows) of each result page."""
+        profile = self._row_factory_profile(execution_profile, row_factory)
+        deadline = Deadline.of(deadline)
+
+        slow_queries = []
+        fan_out = 0
+        try:
+            for statement, labels in self._labelled(statements, labeler):
+                fan_out += 1
+                size = self._statement_size(statement)
+                # Only the time spent in the driver is measured,
+                # not the time spent consuming the pages.
+                latency = 0.0
+                num_rows = 0
+                start = time.perf_counter()
+                try:
+                    result = self._execute_statement(statement, profile, deadline)
+                    while True:
+                        latency += time.perf_counter() - start
+                        num_rows += len(result.current_rows)
+                        yield result.column_names, result.current_rows
+                        if not result.has_more_pages:
+                            break
+                        start = time.perf_counter()
+                        self._fetch_next_page(result, profile, deadline)
+                except Exception as error:
+                    self._record_execution(
+                        slow_queries, statement, labels,
+                        latency + time.perf_counter() - start, num_rows, size, error
+                    )
+                    raise
+
+                self._record_execution(slow_queries, statement, labels, latency, num_rows, size)
+        finally:
+            self._log_slow_queries(slow_queries, fan_out)
+
+    def execute_columnar(
+        self,
+        statements: Iterable[str],
+        columns: List[CassandraColumn] = (),
+        execution_profile: str or ExecutionProfile = None,
+        row_factory: Callable = tuple_factory,
+        labeler: Callable[[Any], MetricLabels] = None,
+        deadline: Deadline or float = None
+    ) -> ColumnarResult:
+        """Execute list of query statements sequentially,
+        returning one NumPy array per column.
+
+        Rows are fetched as tuples and appended to typed arrays
+        page by page, so no dictionary is created per row.
+        Requires `numpy`.
+
+        :param statements: query statements, consumed one at a time
+        :param columns: table columns, used to choose the array types
+            (default: ())
+        :param execution_profile: execution profile (default: None)
+            This parameter can be both the name of a configured profile,
+            or the execution profile itself. Its row factory is ignored.
+        :param row_factory: row factory returning tuple rows, e.g. an
+            :class:`~rows.InterningRowFactory` (default: tuple_factory)
+        :param labeler: function returning the metric labels of a
+            statement (default: None)
+        :param deadline: overall deadline of the statements, or its number
+            of seconds (default: None)
+        :return: columnar result
+        """
+        builder = ColumnarResultBuilder(columns)
+        pages = self._iter_pages(
+            statements, execution_profile, row_factory, labeler, deadline
+        )
+        for column_names, rows in pages:
+            builder.append_page(column_names, rows)
+
+        return builder.build()
+
+    def iter_columnar(
+        self,
+        statements: Iterable[str],
+        chunksize: int,
+        columns: List[CassandraColumn] = (),
+        execution_profile: str or ExecutionProfile = None,
+        row_factory: Callable = tuple_factory,
+        labeler: Callable[[Any], MetricLabels] = None,
+        deadline: Deadline or float = None
+    ) -> Iterator[ColumnarResult]:
+        """Execute list of query statements sequentially,
+        yielding columnar results of about `chunksize` rows.
+
+        Pages are never split, so a chunk holds at least `chunksize` rows,
+        except the last one, and at most `chunksize` plus a page.
+        Only one chunk is held in memory at a time.
+        Requires `numpy`.
+
+        :param statements: query statements, consumed one at a time
+        :param chunksize: minimum number of rows per chunk
+        :param columns: table columns, used to choose the array types
+            (default: ())
+        :param execution_profile: execution profile (default: None)
+        :param row_factory: row factory returning tuple rows
+            (default: tuple_factory)
+        :param labeler: function returning the metric labels of a
+            statement (default: None)
+        :param deadline: overall deadline of the statements, or its number
+            of seconds (default: None)
+        :return: iterator of columnar results
+        """
+        if chunksize <= 0:
+            raise ValueError("Chunk size must be positive.")
+
+        builder = ColumnarResultBuilder(columns)
+        pages = self._iter_pages(
+            statements, execution_profile, row_factory, labeler, deadline
+        )
+        for column_names, rows in pages:
+            builder.append_page(column_names, rows)
+            if builder.num_rows >= chunksize:
+                yield builder.build()
+                builder = ColumnarResultBuilder(columns)
+
+        if builder.num_rows > 0:
+            yield builder.build()
 
     def close(self) -> None:
         """Close Cassandra cluster connection."""
@@ -0,0 +1,415 @@
+import re
+import threading
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class MetricLabels(NamedTuple):
+    """Labels of the statement metrics."""
+
+    keyspace: str
+    table: str
+    query: str
+    operation: str
+    split: str
+
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies, in the spirit of HdrHistogram.
+
+    Values are recorded in microseconds into buckets whose width is a
+    fixed fraction of their value, so any percentile is known within
+    `2 ** (1 - precision_bits)` relative error (1.6% by default), in
+    constant memory whatever the range of the latencies.
+
+    """
+
+    __slots__ = (
+        '_precision_bits', '_sub_buckets', '_half', '_counts',
+        '_count', '_total', '_min', '_max'
+    )
+
+    @property
+    def count(self) -> int:
+        """Returns the number of recorded values."""
+        return self._count
+
+    @property
+    def total(self) -> float:
+        """Returns the sum of the recorded values, in seconds."""
+        return self._total
+
+    @property
+    def min(self) -> Optional[float]:
+        """Returns the lowest recorded value, in seconds."""
+        return self._min
+
+    @property
+    def max(self) -> Optional[float]:
+        """Returns the highest recorded value, in seconds."""
+        return self._max
+
+    def __init__(self, precision_bits: int = 7):
+        """Latency histogram constructor.
+
+        :param precision_bits: number of bits of the bucket values.
+            Must be at least 2 (default: 7)
+        """
+        if precision_bits < 2:
+            raise ValueError("Precision must be at least 2 bits.")
+
+        self._precision_bits = precision_bits
+        self._sub_buckets = 1 << precision_bits
+        self._half = self._sub_buckets >> 1
+        self._counts: Dict[int, int] = {}
+        self._count = 0
+        self._total = 0.0
+        self._min = None
+        self._max = None
+
+    def _index(self, value: int) -> int:
+        """Returns the bucket index of a value in microseconds."""
+        if value < self._sub_buckets:
+            return value
+
+        shift = value.bit_length() - self._precision_bits
+        return self._sub_buckets + (shift - 1) * self._half + (value >> shift) - self._half
+
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        """Returns the lowest and highest values, in microseconds,
+        of a bucket."""
+        if index < self._sub_buckets:
+            return index, index
+
+        shift, offset = divmod(index - self._sub_buckets, self._half)
+        shift += 1
+        lowest = (offset + self._half) << shift
+        return lowest, lowest + (1 << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        """Record a latency.
+
+        :param seconds: latency, in seconds
+        """
+        index = self._index(max(0, int(seconds * 1e6)))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self._count += 1
+        self._total += seconds
+        if self._min is None or seconds < self._min:
+            self._min = seconds
+        if self._max is None or seconds > self._max:
+            self._max = seconds
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Returns a percentile of the recorded values, in seconds,
+        or None if no value was recorded.
+
+        :param percentile: percentile, between 0 and 100
+        """
+        if self._count == 0:
+            return None
+
+        rank = max(1, int(round(percentile / 100 * self._count)))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                lowest, highest = self._bounds(index)
+                value = (lowest + highest) / 2e6
+                return min(max(value, self._min), self._max)
+
+        return self._max
+
+    def snapshot(self, percentiles: Iterable[float] = (50, 90, 99, 99.9)) -> Dict[str, Any]:
+        """Returns the count, sum, min, max and percentiles of the
+        recorded values, in seconds."""
+        return {
+            'count': self._count,
+            'sum': self._total,
+            'min': self._min,
+            'max': self._max,
+            'percentiles': {p: self.percentile(p) for p in percentiles}
+        }
+
+    def __repr__(self):
+        return f"LatencyHistogram(count={self._count})"
+
+
+class _Series:
+    """Metrics of the statements sharing the same labels."""
+
+    __slots__ = ('statements', 'rows', 'bytes', 'errors', 'latency', 'build')
+
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+        self.bytes = 0
+        self.errors: Dict[str, int] = {}
+        self.latency = LatencyHistogram()
+        self.build = LatencyHistogram()
+
+
+class MetricsRegistry:
+    """Statement metrics, labelled by keyspace, table, query name,
+    operation and split period.
+
+    For each label set, the registry counts the executed statements,
+    the returned rows, the bytes of the statements sent and the errors
+    by type, and keeps a histogram of the execution latencies and a
+    histogram of the time spent building the statements.
+
+    Registries are thread-safe. Snapshots are read with
+    :func:`~metrics.MetricsRegistry.stats`, and pushed to the registered
+    exporters with :func:`~metrics.MetricsRegistry.export`.
+
+    """
+
+    TABLE_RE = re.compile(
+        r'\b(?:FROM|INTO|TABLE|VIEW)\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?(\w+)\.(\w+)',
+        re.IGNORECASE
+    )
+
+    OPERATIONS = {'SELECT': 'query', 'INSERT': 'insert'}
+
+    @property
+    def exporters(self) -> List['MetricsExporter']:
+        """Returns the registered exporters."""
+        return self._exporters
+
+    def __init__(self, exporters: Iterable['MetricsExporter'] = ()):
+        """Metrics registry constructor.
+
+        :param exporters: metrics exporters (default: ())
+        """
+        self._series: Dict[MetricLabels, _Series] = {}
+        self._exporters = list(exporters)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def statement_labels(cls, statement: Any) -> MetricLabels:
+        """Returns the labels of a statement, read from its query string.
+        The query name is `base` and the split period is empty.
+
+        :param statement: query string or driver statement
+        :return: labels
+        """
+        query_string = getattr(statement, 'query_string', statement)
+
+        keyword = query_string.lstrip().split(' ', 1)[0].upper()
+        operation = cls.OPERATIONS.get(keyword, keyword.lower())
+
+        match = cls.TABLE_RE.search(query_string)
+        if match is None:
+            return MetricLabels('', '', 'base', operation, '')
+
+        return MetricLabels(match.group(1), match.group(2), 'base', operation, '')
+
+    def _get(self, labels: MetricLabels) -> _Series:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series.setdefault(labels, _Series())
+
+        return series
+
+    def record_build(self, labels: MetricLabels, seconds: float) -> None:
+        """Record the time spent building a statement.
+
+        :param labels: statement labels
+        :param seconds: build time, in seconds
+        """
+        with self._lock:
+            self._get(labels).build.record(seconds)
+
+    def record_execution(
+        self,
+        labels: MetricLabels,
+        latency: Optional[float],
+        rows: int = 0,
+        size: int = 0,
+        error: BaseException = None
+    ) -> None:
+        """Record the execution of a statement.
+
+        :param labels: statement labels
+        :param latency: execution latency, in seconds, or None if unknown
+        :param rows: number of returned rows (default: 0)
+        :param size: size of the statement sent, in bytes (default: 0)
+        :param error: execution error, or None if it succeeded (default: None)
+        """
+        with self._lock:
+            series = self._get(labels)
+            series.statements += 1
+            series.rows += rows
+            series.bytes += size
+            if error is not None:
+                name = type(error).__name__
+                series.errors[name] = series.errors.get(name, 0) + 1
+            if latency is not None:
+                series.latency.record(latency)
+
+    def stats(self) -> Dict[MetricLabels, Dict[str, Any]]:
+        """Returns a snapshot of the metrics of every label set."""
+        with self._lock:
+            return {
+                labels: {
+                    'statements': series.statements,
+                    'rows': series.rows,
+                    'bytes': series.bytes,
+                    'errors': dict(series.errors),
+                    'latency': series.latency.snapshot(),
+                    'build': series.build.snapshot()
+                }
+                for labels, series in self._series.items()
+            }
+
+    def add_exporter(self, exporter: 'MetricsExporter') -> None:
+        """Register an exporter."""
+        self._exporters.append(exporter)
+
+    def export(self) -> List[Any]:
+        """Export a snapshot of the metrics with every registered exporter.
+
+        :return: result of each exporter
+        """
+        stats = self.stats()
+
+        return [exporter.export(stats) for exporter in self._exporters]
+
+    def reset(self) -> None:
+        """Remove every metric."""
+        with self._lock:
+            self._series.clear()
+
+    def __repr__(self):
+        return f"MetricsRegistry(series={len(self._series)})"
+
+
+class MetricsExporter(ABC):
+    """Base class of the metrics exporters.
+
+    Exporters receive the snapshots of
+    :func:`~metrics.MetricsRegistry.stats`, e.g. to send them to a
+    monitoring system.
+
+    """
+
+    @abstractmethod
+    def export(self, stats: Dict[MetricLabels, Dict[str, Any]]) -> Any:
+        """Export a metrics snapshot.
+
+        :param stats: metrics of every label set
+        """
+
+
+class PrometheusExporter(MetricsExporter):
+    """Renders metrics in the Prometheus text exposition format.
+
+    Latencies and build times are exposed as summaries, with the
+    quantiles of their histograms. Metrics may be scraped from a local
+    HTTP endpoint started with :func:`~metrics.PrometheusExporter.serve`.
+
+    """
+
+    @property
+    def prefix(self) -> str:
+        """Returns the prefix of the metric names."""
+        return self._prefix
+
+    def __init__(self, registry: MetricsRegistry = None, prefix: str = 'primeight'):
+        """Prometheus exporter constructor.
+
+        :param registry: registry scraped by the HTTP endpoint
+            (default: None)
+        :param prefix: prefix of the metric names (default: primeight)
+        """
+        self._registry = registry
+        self._prefix = prefix
+
+    @staticmethod
+    def _labels(labels: MetricLabels, **extra) -> str:
+        values = {**labels._asdict(), **extra}
+        return ','.join(
+            '{}="{}"'.format(
+                name,
+                str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            )
+            for name, value in values.items()
+        )
+
+    def export(self, stats: Dict[MetricLabels, Dict[str, Any]]) -> str:
+        """Returns a metrics snapshot in the Prometheus text format."""
+        prefix = self._prefix
+        lines = []
+
+        def _counter(name, help_text, key):
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            for labels, values in stats.items():
+                lines.append(f'{prefix}_{name}{{{self._labels(labels)}}} {values[key]}')
+
+        def _summary(name, help_text, key):
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} summary')
+            for labels, values in stats.items():
+                histogram = values[key]
+                if histogram['count'] == 0:
+                    continue
+                for percentile, value in histogram['percentiles'].items():
+                    quantile = self._labels(labels, quantile=f'{percentile / 100:g}')
+                    lines.append(f'{prefix}_{name}{{{quantile}}} {value}')
+                lines.append(f'{prefix}_{name}_sum{{{self._labels(labels)}}} {histogram["sum"]}')
+                lines.append(f'{prefix}_{name}_count{{{self._labels(labels)}}} {histogram["count"]}')
+
+        _counter('statements_total', 'Executed statements.', 'statements')
+        _counter('rows_total', 'Returned rows.', 'rows')
+        _counter('statement_bytes_total', 'Bytes of the statements sent.', 'bytes')
+
+        lines.append(f'# HELP {prefix}_errors_total Failed statements, by error type.')
+        lines.append(f'# TYPE {prefix}_errors_total counter')
+        for labels, values in stats.items():
+            for error, count in values['errors'].items():
+                lines.append(
+                    f'{prefix}_errors_total{{{self._labels(labels, error=error)}}} {count}'
+                )
+
+        _summary('latency_seconds', 'Statement execution latency.', 'latency')
+        _summary('build_seconds', 'Statement build time.', 'build')
+
+        return '\n'.join(lines) + '\n'
+
+    def render(self) -> str:
+        """Returns the metrics of the registry in the Prometheus text format."""
+        if self._registry is None:
+            raise ValueError("Metrics registry not specified.")
+
+        return self.export(self._registry.stats())
+
+    def serve(self, port: int = 9464, address: str = '127.0.0.1') -> ThreadingHTTPServer:
+        """Serve the metrics of the registry over HTTP, from a daemon
+        thread, so Prometheus can scrape them.
+
+        :param port: port (default: 9464)
+        :param address: address (default: 127.0.0.1)
+        :return: HTTP server, to be shut down with `server.shutdown()`
+        """
+        exporter = self
+
+        class _Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                body = exporter.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((address, port), _Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        return server
@@ -3,7 +3,10 @@ import warnings
 import logging
 from pathlib import Path
 
+from cassandra import ConsistencyLevel
+
 from primeight.column import CassandraColumn
+from primeight.schema import CassandraSchema
 from primeight.generators import Generators
 
 
@@ -13,12 +16,15 @@ logger = logging.getLogger(__name__)
 class Parser:
 
     _required_fields = ['version', 'keyspace', 'name', 'columns', 'query']
-    _optional_fields = ['generated_columns', 'split', 'lifetime', 'backup']
+    _optional_fields = ['generated_columns', 'split', 'split_mode', 'lifetime', 'backup']
 
     _recognized_splits = ['day', 'week', 'month', 'year']
+    _recognized_split_modes = CassandraSchema.SPLIT_MODES
 
     _required_query_fields = ['required']
-    _optional_query_fields = ['optional', 'order', 'description']
+    _optional_query_fields = [
+        'optional', 'order', 'description', 'consistency', 'timeout', 'fetch_size', 'profile'
+    ]
     _recognized_query_required = ['time', 'space', 'id']
 
     _recognized_orders = ['asc', 'desc']
@@ -29,6 +35,19 @@ class Parser:
     def parse(path: str or Path) -> dict:
         pass
 
+    @staticmethod
+    def compile(content: dict) -> CassandraSchema:
+        """Validates a table configuration and returns its compiled schema.
+        The schema is shared by every table and materialized view
+        created from the same configuration.
+
+        :param content: table template configuration
+        :return: compiled schema
+        """
+        Parser.is_valid_config(content)
+
+        return CassandraSchema.compile(content)
+
     @staticmethod
     def is_valid_name(name: str) -> bool:
         """Validate if a name is valid."""
@@ -86,12 +105,16 @@ class Parser:
         * generated columns dependent on undeclared columns
         * unrecognized backup strategy
         * unrecognized split strategy
+        * unrecognized split mode, or split mode without split
         * non integer lifetime
         * negative lifetime
         * query name with invalid characters
         * query unrecognized field
         * query required field keys not valid
         * undeclared columns as query required or optional columns
+        * unrecognized query consistency level
+        * non positive query timeout or fetch size
+        * empty query profile name
 
         #TODO: improve docstring
         """
@@ -168,6 +191,9 @@ class Parser:
                     float(col_content['min'])
                 except ValueError:
                     raise SyntaxError(f"{name} min value is not a number")
+            # If column has an intern flag, validate that it is a boolean.
+            if 'intern' in col_content and not isinstance(col_content['intern'], bool):
+                raise SyntaxError(f"{name} intern value is not a boolean")
 
         generated_columns = []
         if 'generated_columns' in content:
@@ -226,6 +252,22 @@ class Parser:
                     or content['split'] not in content['generated_columns']):
                 raise SyntaxError(f"Split needs to be a generated column")
 
+        if 'split_mode' in content:
+            # Validate that split mode is only declared with a split.
+            if 'split' not in content:
+                raise SyntaxError("Split mode requires a split.")
+            # Validate that split mode is recognized.
+            if content['split_mode'] not in Parser._recognized_split_modes:
+                raise SyntaxError(
+                    f"Unrecognized split mode '{content['split_mode']}'")
+            # Validate that the split bucket column is not a clustering key,
+            # since it is added to the partition key of every query.
+            if content['split_mode'] == 'bucket':
+                for name, query in (content.get('query') or {}).items():
+                    if content['split'] in ((query or {}).get('optional') or []):
+                        raise SyntaxError(
+                            f"{name} query optional column can not match split")
+
         if 'lifetime' in content:
             # Validate that lifetime is not empty.
             if content['lifetime'] is None:
@@ -352,3 +394,32 @@ class Parser:
                     if order not in Parser._recognized_orders:
                         raise SyntaxError(f"Order value {order} is not valid, "
                                           f"use either 'asc' or 'desc'")
+
+            if 'consistency' in query:
+                # Validate that consistency is a driver consistency level.
+                consistency = query['consistency']
+                if not isinstance(consistency, str) \
+                        or consistency.upper() not in ConsistencyLevel.name_to_value:
+                    raise SyntaxError(
+                        f"{name} query unrecognized consistency '{consistency}'")
+
+            if 'timeout' in query:
+                # Validate that timeout is a positive number of seconds.
+                timeout = query['timeout']
+                if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) \
+                        or timeout <= 0:
+                    raise SyntaxError(
+                        f"{name} query timeout '{timeout}' is not a positive number")
+
+            if 'fetch_size' in query:
+                # Validate that fetch size is a positive integer.
+                fetch_size = query['fetch_size']
+                if isinstance(fetch_size, bool) or not isinstance(fetch_size, int) \
+                        or fetch_size <= 0:
+                    raise SyntaxError(
+                        f"{name} query fetch size '{fetch_size}' is not a positive integer")
+
+            if 'profile' in query:
+                # Validate that profile is a profile name.
+                if not isinstance(query['profile'], str) or len(query['profile']) == 0:
+                    raise SyntaxError(f"{name} query profile not defined")
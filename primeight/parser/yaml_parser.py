@@ -4,6 +4,7 @@ import logging
 import yaml
 
 from primeight.parser.parser import Parser
+from primeight.schema import TableConfig
 
 
 logger = logging.getLogger(__name__)
@@ -12,7 +13,7 @@ logger = logging.getLogger(__name__)
 class YamlParser(Parser):
 
     @staticmethod
-    def parse(path: str or Path) -> dict:
+    def parse(path: str or Path) -> TableConfig:
         """Load Yaml from disk."""
         config_file = path if isinstance(path, Path) else Path(path)
 
@@ -37,4 +38,4 @@ class YamlParser(Parser):
             raise SyntaxError(f"Table yaml '{path}' is not a valid yaml.")
 
         YamlParser.is_valid_config(content)
-        return content
+        return TableConfig(content)
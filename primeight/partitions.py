@@ -0,0 +1,214 @@
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Iterator, Tuple
+
+import pytz
+
+
+GRANULARITIES = ['day', 'week', 'month', 'year']
+
+MS_PER_DAY = 86400000
+
+# 1970-01-01 was a Thursday, so the first Monday-aligned week
+# starts 3 days before the epoch.
+_WEEK_OFFSET = 3
+
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+_EPOCH = datetime(1970, 1, 1, tzinfo=pytz.UTC)
+
+
+def days_from_civil(year: int, month: int, day: int) -> int:
+    """Returns the number of days since 1970-01-01 of a date
+    of the proleptic Gregorian calendar."""
+    year -= month <= 2
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+
+    return era * 146097 + doe - 719468
+
+
+def civil_from_days(days: int) -> Tuple[int, int, int]:
+    """Returns the (year, month, day) of a number of days since 1970-01-01."""
+    days += 719468
+    era = days // 146097
+    doe = days - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + (3 if mp < 10 else -9)
+
+    return yoe + era * 400 + (month <= 2), month, day
+
+
+def bucket(granularity: str, days: int) -> int:
+    """Returns the index of the time bucket holding a day.
+
+    :param granularity: day, week, month or year
+    :param days: number of days since 1970-01-01
+    :return: bucket index
+    """
+    if granularity == 'day':
+        return days
+    elif granularity == 'week':
+        return (days + _WEEK_OFFSET) // 7
+    elif granularity == 'month':
+        year, month, _ = civil_from_days(days)
+        return year * 12 + month - 1
+    elif granularity == 'year':
+        return civil_from_days(days)[0]
+
+    raise ValueError(f"Unrecognized granularity '{granularity}'")
+
+
+def bucket_start(granularity: str, index: int) -> int:
+    """Returns the first day, in days since 1970-01-01, of a time bucket.
+
+    :param granularity: day, week, month or year
+    :param index: bucket index
+    :return: number of days since 1970-01-01
+    """
+    if granularity == 'day':
+        return index
+    elif granularity == 'week':
+        return index * 7 - _WEEK_OFFSET
+    elif granularity == 'month':
+        year, month = divmod(index, 12)
+        return days_from_civil(year, month + 1, 1)
+    elif granularity == 'year':
+        return days_from_civil(index, 1, 1)
+
+    raise ValueError(f"Unrecognized granularity '{granularity}'")
+
+
+def suffix(granularity: str, days: int) -> str:
+    """Returns the table suffix of the bucket starting on a day,
+    e.g. `07_01_2019` for days, `01_2019` for months and `2019` for years."""
+    year, month, day = civil_from_days(days)
+    if granularity in ['day', 'week']:
+        return f'{day:02d}_{month:02d}_{year}'
+    elif granularity == 'month':
+        return f'{month:02d}_{year}'
+
+    return f'{year}'
+
+
+def days_of(value: datetime or int) -> int:
+    """Returns the number of days since 1970-01-01 of a datetime,
+    or of a timestamp in milliseconds.
+
+    The calendar date of a datetime is used as is, whatever its timezone,
+    so naive datetimes are assumed to be in UTC."""
+    if isinstance(value, datetime):
+        return value.toordinal() - _EPOCH_ORDINAL
+
+    return value // MS_PER_DAY
+
+
+class PartitionRange:
+    """Sorted time buckets of a granularity between two dates.
+
+    Bucket boundaries are computed with integer calendar arithmetic,
+    and the table suffixes are formatted once.
+
+    """
+
+    __slots__ = ('_granularity', '_days', '_timestamps', '_suffixes')
+
+    @property
+    def granularity(self) -> str:
+        """Returns the granularity (day, week, month or year)."""
+        return self._granularity
+
+    @property
+    def timestamps(self) -> Tuple[int, ...]:
+        """Returns the start of each bucket, in milliseconds since epoch.
+        These are the values of the generated time columns."""
+        return self._timestamps
+
+    @property
+    def suffixes(self) -> Tuple[str, ...]:
+        """Returns the table suffix of each bucket."""
+        return self._suffixes
+
+    @property
+    def datetimes(self) -> Tuple[datetime, ...]:
+        """Returns the start of each bucket, as UTC datetimes."""
+        return tuple(_EPOCH + timedelta(days=d) for d in self._days)
+
+    def __init__(self, granularity: str, first: int, last: int):
+        """Partition range constructor.
+
+        :param granularity: day, week, month or year
+        :param first: index of the first bucket
+        :param last: index of the last bucket (included)
+        """
+        self._granularity = granularity
+        self._days = tuple(
+            bucket_start(granularity, i) for i in range(first, last + 1)
+        )
+        self._timestamps = tuple(d * MS_PER_DAY for d in self._days)
+        self._suffixes = tuple(suffix(granularity, d) for d in self._days)
+
+    def __len__(self) -> int:
+        return len(self._days)
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        """Yields the (timestamp, suffix) of each bucket."""
+        return zip(self._timestamps, self._suffixes)
+
+    def __repr__(self):
+        return (
+            f"PartitionRange(granularity='{self._granularity}', "
+            f"partitions={len(self._days)})"
+        )
+
+
+@lru_cache(maxsize=4096)
+def _partition_range(granularity: str, first: int, last: int) -> PartitionRange:
+    return PartitionRange(granularity, first, last)
+
+
+def partition_range(
+    granularity: str, start: datetime or int, end: datetime or int
+) -> PartitionRange:
+    """Returns the time buckets of a granularity from start to end date.
+
+    Ranges are memoized by (granularity, first bucket, last bucket),
+    so ranges falling in the same buckets share the same object.
+
+    :param granularity: day, week, month or year
+    :param start: start date, or timestamp in milliseconds
+    :param end: end date, or timestamp in milliseconds
+    :return: partition range, empty if end is before start
+    """
+    return _partition_range(
+        granularity,
+        bucket(granularity, days_of(start)),
+        bucket(granularity, days_of(end))
+    )
+
+
+@lru_cache(maxsize=4096)
+def partition_suffix(granularity: str, days: int) -> str:
+    """Returns the table suffix of the bucket holding a day.
+
+    :param granularity: day, week, month or year
+    :param days: number of days since 1970-01-01
+    :return: table suffix
+    """
+    return suffix(granularity, bucket_start(granularity, bucket(granularity, days)))
+
+
+@lru_cache(maxsize=4096)
+def partition_timestamp(granularity: str, days: int) -> int:
+    """Returns the start, in milliseconds since epoch, of the bucket
+    holding a day. This is the value of the generated time column.
+
+    :param granularity: day, week, month or year
+    :param days: number of days since 1970-01-01
+    :return: timestamp in milliseconds
+    """
+    return bucket_start(granularity, bucket(granularity, days)) * MS_PER_DAY
@@ -0,0 +1,293 @@
+import re
+import math
+from datetime import datetime
+from typing import List, Optional, Set
+
+import h3.api.basic_str as h3
+
+from primeight.partitions import partition_range
+from primeight.exceptions import DateNotDefinedError, SpaceQueryNotFound
+
+
+class QueryCandidate:
+    """Estimated cost of answering a space query with a given query."""
+
+    @property
+    def query_name(self) -> str:
+        return self._query_name
+
+    @property
+    def column(self) -> str:
+        return self._column
+
+    @property
+    def resolution(self) -> int:
+        return self._resolution
+
+    @property
+    def cells(self) -> List[str]:
+        return self._cells
+
+    @property
+    def time_partitions(self) -> int:
+        return self._time_partitions
+
+    @property
+    def partitions(self) -> int:
+        """Returns the estimated number of partitions read."""
+        return len(self._cells) * self._time_partitions
+
+    def __init__(
+        self,
+        query_name: str,
+        column: str,
+        resolution: int,
+        cells: List[str],
+        time_partitions: int
+    ):
+        """Query candidate constructor.
+
+        :param query_name: query name, as declared in the yaml
+        :param column: space column of the query
+        :param resolution: H3 resolution of the space column
+        :param cells: H3 cells covering the area at that resolution
+        :param time_partitions: number of time buckets or split tables
+            the time range spans
+        """
+        self._query_name = query_name
+        self._column = column
+        self._resolution = resolution
+        self._cells = cells
+        self._time_partitions = time_partitions
+
+    def __repr__(self):
+        return (
+            f"QueryCandidate(query_name={self.query_name!r}, "
+            f"column={self.column!r}, partitions={self.partitions})"
+        )
+
+
+class QueryPlan:
+    """Query chosen by the :class:`QueryPlanner`."""
+
+    @property
+    def table_name(self) -> str:
+        return self._table_name
+
+    @property
+    def chosen(self) -> QueryCandidate:
+        return self._chosen
+
+    @property
+    def candidates(self) -> List[QueryCandidate]:
+        return self._candidates
+
+    @property
+    def query_name(self) -> str:
+        return self.chosen.query_name
+
+    @property
+    def cells(self) -> List[str]:
+        return self.chosen.cells
+
+    def __init__(self, table_name: str, candidates: List[QueryCandidate]):
+        """Query plan constructor.
+
+        The candidate with the fewest estimated partition reads is chosen.
+        Ties are broken in favour of the finest resolution,
+        since it reads less data outside the requested area.
+
+        :param table_name: table name
+        :param candidates: evaluated query candidates
+        """
+        self._table_name = table_name
+        self._candidates = sorted(
+            candidates, key=lambda c: (c.partitions, -c.resolution, c.query_name)
+        )
+        self._chosen = self._candidates[0]
+
+    def explain(self) -> str:
+        """Returns a human readable report of the plan."""
+        lines = [f"Query plan for table '{self.table_name}':"]
+        for candidate in self.candidates:
+            marker = '*' if candidate is self.chosen else ' '
+            lines.append(
+                f" {marker} {candidate.query_name} "
+                f"({candidate.column}, resolution {candidate.resolution}): "
+                f"{len(candidate.cells)} cells x "
+                f"{candidate.time_partitions} time partitions = "
+                f"{candidate.partitions} partitions"
+            )
+        lines.append(
+            f"Chosen query '{self.chosen.query_name}' "
+            f"on column '{self.chosen.column}'."
+        )
+
+        return '\n'.join(lines)
+
+
+class QueryPlanner:
+    """Chooses the cheapest query to read a spatial area.
+
+    Every query with a `space` required column, and no `id` required column,
+    is a candidate. The H3 resolution of a candidate is taken from the name of
+    its space column (e.g. `h5` or `h5_begin` have resolution 5).
+
+    """
+
+    SPACE_COLUMN_RE = re.compile(r'^h(\d+)(_begin|_end)?$')
+
+    @property
+    def config(self) -> dict:
+        return self._config
+
+    def __init__(self, config: dict):
+        """Query planner constructor.
+
+        :param config: table template configuration
+        """
+        self._config = config
+
+    @staticmethod
+    def resolution(column: str) -> Optional[int]:
+        """Returns the H3 resolution of a space column,
+        or None if it can not be inferred from the column name."""
+        match = QueryPlanner.SPACE_COLUMN_RE.match(column)
+        if match is None:
+            return None
+
+        return int(match.group(1))
+
+    @staticmethod
+    def _polygon(area: dict) -> dict:
+        if area.get('type') == 'Feature':
+            area = area['geometry']
+
+        if area.get('type') != 'Polygon':
+            raise ValueError("Area must be a GeoJSON Polygon or Feature.")
+
+        return area
+
+    @staticmethod
+    def cover(area: dict or List[str], resolution: int) -> List[str]:
+        """Returns the sorted list of H3 cells covering an area.
+
+        The area may be a GeoJSON polygon, or a list of H3 cells
+        of any resolution.
+        Since `polyfill` only returns cells with their center inside the
+        polygon, the cells along the polygon boundary are also added.
+
+        :param area: GeoJSON polygon or list of H3 cells
+        :param resolution: H3 resolution
+        :return: sorted list of H3 cells
+        """
+        cells: Set[str] = set()
+
+        if isinstance(area, (list, tuple, set)):
+            for cell in area:
+                cell_resolution = h3.h3_get_resolution(cell)
+                if cell_resolution == resolution:
+                    cells.add(cell)
+                elif cell_resolution > resolution:
+                    cells.add(h3.h3_to_parent(cell, resolution))
+                else:
+                    cells.update(h3.h3_to_children(cell, resolution))
+
+            return sorted(cells)
+
+        polygon = QueryPlanner._polygon(area)
+        cells.update(h3.polyfill(polygon, resolution, geo_json_conformant=True))
+
+        # Sample each boundary edge at half the cell edge length,
+        # so that no cell crossed by the boundary is left out.
+        step = h3.edge_length(resolution, unit='km') / 2
+        for ring in polygon['coordinates']:
+            for (lng1, lat1), (lng2, lat2) in zip(ring, ring[1:]):
+                distance = h3.point_dist((lat1, lng1), (lat2, lng2), unit='km')
+                n = max(1, int(math.ceil(distance / step)))
+                for i in range(n + 1):
+                    lat = lat1 + (lat2 - lat1) * i / n
+                    lng = lng1 + (lng2 - lng1) * i / n
+                    cells.add(h3.geo_to_h3(lat, lng, resolution))
+
+        return sorted(cells)
+
+    def _time_partitions(
+        self, query: dict, start: datetime = None, end: datetime = None
+    ) -> int:
+        partitions = 1
+        granularities = []
+        if 'time' in query['required']:
+            granularities.append(query['required']['time'])
+        if 'split' in self.config:
+            granularities.append(self.config['split'])
+
+        if len(granularities) > 0 and (start is None or end is None):
+            raise DateNotDefinedError(
+                "When querying by time or splitting table by date, "
+                "you are required to specify a time frame."
+            )
+
+        # Each time bucket falls in a single split table, and each split
+        # table holds at least one bucket, so the coarser one is redundant.
+        for granularity in granularities:
+            partitions = max(
+                partitions, len(partition_range(granularity, start, end))
+            )
+
+        return partitions
+
+    def candidates(
+        self,
+        area: dict or List[str],
+        start: datetime = None,
+        end: datetime = None
+    ) -> List[QueryCandidate]:
+        """Returns the cost estimate of every candidate query.
+
+        :param area: GeoJSON polygon or list of H3 cells
+        :param start: start date in UTC (default: None)
+        :param end: end date in UTC (default: None)
+        :return: list of query candidates
+        """
+        candidates = []
+        covers = {}
+        for name, query in self.config['query'].items():
+            required = query['required']
+            if 'space' not in required or 'id' in required:
+                continue
+
+            column = required['space']
+            resolution = self.resolution(column)
+            if resolution is None:
+                continue
+
+            if resolution not in covers:
+                covers[resolution] = self.cover(area, resolution)
+
+            candidates.append(QueryCandidate(
+                name, column, resolution, covers[resolution],
+                self._time_partitions(query, start, end)
+            ))
+
+        return candidates
+
+    def plan(
+        self,
+        area: dict or List[str],
+        start: datetime = None,
+        end: datetime = None
+    ) -> QueryPlan:
+        """Returns the plan with the fewest estimated partition reads.
+
+        :param area: GeoJSON polygon or list of H3 cells
+        :param start: start date in UTC (default: None)
+        :param end: end date in UTC (default: None)
+        :return: query plan
+        """
+        candidates = self.candidates(area, start, end)
+        if len(candidates) == 0:
+            raise SpaceQueryNotFound(self.config['name'])
+
+        return QueryPlan(self.config['name'], candidates)
+
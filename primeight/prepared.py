@@ -0,0 +1,313 @@
+import copy
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from cassandra import DriverException, RequestValidationException
+from cassandra.cluster import NoHostAvailable, Session
+from cassandra.query import \
+    BoundStatement, PreparedStatement, SimpleStatement, Statement, FETCH_SIZE_UNSET
+from cassandra.protocol import PreparedQueryNotFound
+
+
+_STRING = r"'(?:[^']|'')*'"
+_UUID = r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}(?![\w-])'
+_NUMBER = r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?(?![\w.])'
+_LITERAL = rf'{_STRING}|{_UUID}|{_NUMBER}|(?:true|false)\b'
+
+_LITERAL_RE = re.compile(_LITERAL, re.IGNORECASE)
+# The type of a literal is the alternative it matches, e.g. `1e-05` is a
+# number although it contains a dash.
+_TYPED_LITERAL_RE = re.compile(
+    rf'(?P<string>{_STRING})|(?P<uuid>{_UUID})|(?P<number>{_NUMBER})|(?P<boolean>true|false)',
+    re.IGNORECASE
+)
+_STRING_RE = re.compile(_STRING)
+
+# Literals are only extracted from the positions accepting bind markers.
+# Other string literals are matched, and kept, so that no position inside
+# a string is ever mistaken for a value.
+_PARAMETER_RE = re.compile(
+    rf"(?P<json>\bJSON\s+)(?P<json_value>{_STRING})"
+    rf"|(?P<in>\bIN\s*)\(\s*(?P<in_values>(?:{_LITERAL})(?:\s*,\s*(?:{_LITERAL}))*)\s*\)"
+    rf"|(?P<op>(?:<=|>=|=|<|>)\s*)(?P<value>{_LITERAL})"
+    rf"|(?P<limit>\bLIMIT\s+)(?P<limit_value>\d+)\b"
+    rf"|(?P<string>{_STRING})",
+    re.IGNORECASE
+)
+
+_PARAMETERIZED_RE = re.compile(r'^\s*(SELECT|INSERT|UPDATE|DELETE)\b', re.IGNORECASE)
+
+
+def literal_value(literal: str) -> Any:
+    """Returns the value of a CQL literal.
+
+    :param literal: string, UUID, number or boolean literal
+    :return: value
+    :raise ValueError: if the literal is not supported
+    """
+    match = _TYPED_LITERAL_RE.fullmatch(literal)
+    kind = match.lastgroup if match is not None else None
+
+    if kind == 'string':
+        return literal[1:-1].replace("''", "'")
+    elif kind == 'uuid':
+        return UUID(literal)
+    elif kind == 'number':
+        if '.' in literal or 'e' in literal.lower():
+            return float(literal)
+        return int(literal)
+    elif kind == 'boolean':
+        return literal.lower() == 'true'
+
+    raise ValueError(f"Unsupported literal: {literal}")
+
+
+def parameterize(query_string: str) -> Optional[Tuple[str, List[Any]]]:
+    """Returns a statement with its literal values replaced by bind
+    markers, and the values.
+
+    Values of comparisons, `IN` lists, `LIMIT` clauses and `INSERT ... JSON`
+    rows are extracted. `IN` lists are bound as a single list, so they do
+    not change the statement whatever their length.
+
+    :param query_string: query or insert statement
+    :return: (normalized statement, values), or None if the statement
+        is not a query, insert, update or delete, or already has
+        bind markers
+    """
+    if _PARAMETERIZED_RE.match(query_string) is None \
+            or '?' in _STRING_RE.sub('', query_string):
+        return None
+
+    values = []
+
+    def _replace(match):
+        if match.group('json') is not None:
+            values.append(literal_value(match.group('json_value')))
+            return f"{match.group('json')}?"
+        elif match.group('in') is not None:
+            values.append([
+                literal_value(literal)
+                for literal in _LITERAL_RE.findall(match.group('in_values'))
+            ])
+            return f"{match.group('in')}?"
+        elif match.group('op') is not None:
+            values.append(literal_value(match.group('value')))
+            return f"{match.group('op')}?"
+        elif match.group('limit') is not None:
+            values.append(int(match.group('limit_value')))
+            return f"{match.group('limit')}?"
+
+        return match.group(0)
+
+    return _PARAMETER_RE.sub(_replace, query_string), values
+
+
+def is_unprepared(error: Exception) -> bool:
+    """Returns True if an error is an `Unprepared` response, i.e. a
+    prepared statement unknown to the coordinator or to the driver,
+    e.g. after a node restart or an eviction from the driver cache."""
+    if isinstance(error, PreparedQueryNotFound):
+        return True
+
+    return isinstance(error, DriverException) \
+        and 'unknown prepared statement' in str(error)
+
+
+class PreparedStatementCache:
+    """Bounded LRU registry of the prepared statements of normalized
+    statements.
+
+    Generated statements inline their values, so each of them has a
+    unique text. The cache extracts the values (see
+    :func:`~prepared.parameterize`), prepares the normalized statement
+    once, and binds the values, so generated statements get the
+    performance of prepared statements without any change to the code
+    building them.
+
+    Statements that can not be prepared, or whose values do not match
+    the types of the prepared statement, are executed as they are.
+    Statements whose preparation fails temporarily, e.g. on a timeout,
+    are executed as they are and prepared again on next use.
+
+    The driver only keeps weak references to prepared statements, so
+    evicted statements are released by the driver too. A statement
+    unknown to Cassandra, or evicted while in flight, is prepared again
+    with :func:`~prepared.PreparedStatementCache.rebind`.
+
+    """
+
+    @property
+    def max_size(self) -> int:
+        """Returns the maximum number of prepared statements."""
+        return self._max_size
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Returns the size, hits, misses, evictions and re-prepares."""
+        return {
+            'size': len(self._statements),
+            'max_size': self._max_size,
+            'hits': self._hits,
+            'misses': self._misses,
+            'evictions': self._evictions,
+            'reprepares': self._reprepares
+        }
+
+    def __init__(self, session: Session, max_size: int = 1024):
+        """Prepared statement cache constructor.
+
+        :param session: Cassandra session
+        :param max_size: maximum number of prepared statements.
+            The least recently used statements are evicted (default: 1024)
+        """
+        if max_size <= 0:
+            raise ValueError("Maximum size must be positive.")
+
+        self._session = session
+        self._max_size = max_size
+        self._statements: 'OrderedDict[str, Optional[PreparedStatement]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._reprepares = 0
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def __contains__(self, query_string: str) -> bool:
+        return query_string in self._statements
+
+    def prepare(self, query_string: str) -> Optional[PreparedStatement]:
+        """Returns the prepared statement of a normalized statement,
+        preparing it on first use.
+
+        :param query_string: statement with bind markers
+        :return: prepared statement, or None if the statement is rejected
+            by Cassandra, or could not be prepared, e.g. after a timeout.
+            Only rejected statements are remembered, others are prepared
+            again on next use
+        """
+        with self._lock:
+            if query_string in self._statements:
+                self._hits += 1
+                self._statements.move_to_end(query_string)
+                return self._statements[query_string]
+            self._misses += 1
+
+        try:
+            prepared = self._session.prepare(query_string)
+        except RequestValidationException:
+            prepared = None
+        except (DriverException, NoHostAvailable) as error:
+            logging.warning(
+                f"Statement not prepared, executing it as is "
+                f"(statement: {query_string}, error: {error})"
+            )
+            return None
+
+        with self._lock:
+            self._statements[query_string] = prepared
+            self._statements.move_to_end(query_string)
+            while len(self._statements) > self._max_size:
+                self._statements.popitem(last=False)
+                self._evictions += 1
+
+        return prepared
+
+    def invalidate(self, query_string: str) -> None:
+        """Remove the prepared statement of a normalized statement,
+        if any, so that it is prepared again on next use.
+
+        :param query_string: statement with bind markers
+        """
+        with self._lock:
+            self._statements.pop(query_string, None)
+
+    def bind(self, statement: str or Statement) -> str or Statement:
+        """Returns a statement bound to the prepared statement of its
+        normalized statement, or the statement itself if it can not be
+        prepared.
+
+        Simple statements keep their idempotence, consistency level and
+        fetch size.
+
+        :param statement: query string or simple statement
+        :return: bound statement, or the statement itself
+        """
+        if isinstance(statement, Statement) and not isinstance(statement, SimpleStatement):
+            return statement
+
+        query_string = getattr(statement, 'query_string', statement)
+        try:
+            parameterized = parameterize(query_string)
+        except ValueError:
+            parameterized = None
+        if parameterized is None:
+            return statement
+
+        normalized, values = parameterized
+        prepared = self.prepare(normalized)
+        if prepared is None:
+            return statement
+
+        try:
+            bound = prepared.bind(values)
+        except (TypeError, ValueError, AttributeError):
+            return statement
+
+        if isinstance(statement, SimpleStatement):
+            bound.is_idempotent = statement.is_idempotent
+            if statement.consistency_level is not None:
+                bound.consistency_level = statement.consistency_level
+            if statement.fetch_size is not FETCH_SIZE_UNSET:
+                bound.fetch_size = statement.fetch_size
+
+        return bound
+
+    def rebind(self, statement: BoundStatement) -> BoundStatement:
+        """Returns a statement bound to a newly prepared statement,
+        after an `Unprepared` response (see :func:`~prepared.is_unprepared`).
+
+        :param statement: bound statement
+        :return: bound statement, with the same values, idempotence
+            and fetch size
+        """
+        query_string = statement.prepared_statement.query_string
+        self.invalidate(query_string)
+        with self._lock:
+            self._reprepares += 1
+
+        prepared = self.prepare(query_string)
+        if prepared is None:
+            return statement
+
+        bound = copy.copy(statement)
+        bound.prepared_statement = prepared
+        bound.values = list(statement.values)
+
+        return bound
+
+    def clear(self) -> None:
+        """Remove every prepared statement."""
+        with self._lock:
+            self._statements.clear()
+
+    def __repr__(self):
+        return (
+            f"PreparedStatementCache(size={len(self._statements)}, "
+            f"max_size={self._max_size})"
+        )
+
+
+def query_string_of(statement: str or Statement) -> str:
+    """Returns the query string of a statement, bound statements included."""
+    if isinstance(statement, BoundStatement):
+        return statement.prepared_statement.query_string
+
+    return getattr(statement, 'query_string', statement)
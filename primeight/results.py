@@ -0,0 +1,334 @@
+from typing import \
+    Any, Collection, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from primeight.column import CassandraColumn
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover
+    pd = None
+
+_TYPE_TO_DTYPE = {int: 'int64', float: 'float64', bool: 'bool'}
+
+
+class ColumnarResult(Mapping):
+    """Query result stored as one NumPy array per column.
+
+    Integer and boolean columns can not hold nulls, so null values are
+    stored as zero (or False) and flagged in :attr:`~results.ColumnarResult.nulls`.
+    Floating point nulls are stored as NaN.
+
+    """
+
+    TEXT_TYPES = ['ascii', 'text', 'varchar', 'h3hex', 'inet']
+
+    @property
+    def columns(self) -> Dict[str, 'np.ndarray']:
+        """Returns the mapping from column name to array."""
+        return self._columns
+
+    @property
+    def nulls(self) -> Dict[str, 'np.ndarray']:
+        """Returns the null mask of the integer and boolean columns
+        with at least one null value."""
+        return self._nulls
+
+    @property
+    def types(self) -> Dict[str, str]:
+        """Returns the mapping from column name to type handle,
+        for the columns declared in the table schema."""
+        return self._types
+
+    @property
+    def num_rows(self) -> int:
+        """Returns the number of rows."""
+        return self._num_rows
+
+    def __init__(
+        self,
+        columns: Dict[str, 'np.ndarray'],
+        nulls: Dict[str, 'np.ndarray'],
+        num_rows: int,
+        types: Dict[str, str] = None
+    ):
+        """Columnar result constructor.
+
+        :param columns: mapping from column name to array
+        :param nulls: mapping from column name to null mask
+        :param num_rows: number of rows
+        :param types: mapping from column name to type handle (default: None)
+        """
+        self._columns = columns
+        self._nulls = nulls
+        self._num_rows = num_rows
+        self._types = types or {}
+
+    def __getitem__(self, name: str) -> 'np.ndarray':
+        return self._columns[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __repr__(self):
+        return (
+            f"ColumnarResult(columns={list(self._columns)}, "
+            f"num_rows={self._num_rows})"
+        )
+
+    def categorical(self, name: str) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Returns a column as categories and integer codes,
+        such that `categories[codes]` is the column.
+
+        :param name: column name
+        :return: sorted unique values and the code of each row
+        """
+        values = self._columns[name]
+        if values.dtype.kind == 'O':
+            # Nulls can not be sorted together with other values.
+            values = np.array(['' if v is None else v for v in values], dtype=object)
+
+        categories, codes = np.unique(values, return_inverse=True)
+
+        return categories, codes.astype(np.int32)
+
+    def categorical_columns(self, categorical_threshold: float = 0.5) -> List[str]:
+        """Returns the text columns whose ratio of distinct values to rows
+        is at most a threshold.
+
+        :param categorical_threshold: maximum ratio of distinct values
+            to rows (default: 0.5)
+        :return: column names
+        """
+        return [
+            name for name, values in self._columns.items()
+            if self._types.get(name) in ColumnarResult.TEXT_TYPES and len(values) > 0
+            and len(pd.unique(values)) <= categorical_threshold * len(values)
+        ]
+
+    def _series_values(self, name: str, categorical: bool):
+        values = self._columns[name]
+        nulls = self._nulls.get(name)
+        handle = self._types.get(name)
+
+        if handle == 'timestamp':
+            values = values.astype('datetime64[ms]')
+            if nulls is not None:
+                values[nulls] = np.datetime64('NaT')
+        elif nulls is not None and values.dtype.kind == 'i':
+            values = pd.arrays.IntegerArray(values, nulls)
+        elif nulls is not None and values.dtype.kind == 'b':
+            values = pd.arrays.BooleanArray(values, nulls)
+        elif categorical:
+            values = pd.Categorical(values)
+
+        return values
+
+    def to_dataframe(
+        self,
+        categorical_threshold: float = 0.5,
+        categorical_columns: Collection[str] = None
+    ) -> 'pd.DataFrame':
+        """Returns the result as a pandas DataFrame.
+
+        `timestamp` columns are converted to `datetime64[ms]`, integer and
+        boolean columns with nulls to pandas nullable types, and text columns
+        with few distinct values to categoricals. Requires `pandas` 2.0 or
+        later, earlier versions convert timestamps to `datetime64[ns]`.
+
+        :param categorical_threshold: text columns whose ratio of distinct
+            values to rows is at most this value are made categorical.
+            Set to 0 to disable categoricals (default: 0.5)
+        :param categorical_columns: if defined, the columns made
+            categorical, instead of the columns chosen with
+            `categorical_threshold` (default: None)
+        :return: DataFrame
+        """
+        if pd is None:
+            raise ImportError("DataFrame results require pandas to be installed.")
+
+        if categorical_columns is None:
+            categorical_columns = self.categorical_columns(categorical_threshold)
+        categorical_columns = set(categorical_columns)
+
+        return pd.DataFrame(
+            {
+                name: self._series_values(name, name in categorical_columns)
+                for name in self._columns
+            },
+            columns=list(self._columns)
+        )
+
+    def to_structured(self) -> 'np.ndarray':
+        """Returns the result as a NumPy structured array."""
+        dtype = [(name, values.dtype) for name, values in self._columns.items()]
+        structured = np.empty(self._num_rows, dtype=dtype)
+        for name, values in self._columns.items():
+            structured[name] = values
+
+        return structured
+
+
+def iter_dataframes(
+    results: Iterable[ColumnarResult],
+    categorical_threshold: float = 0.5
+) -> Iterator['pd.DataFrame']:
+    """Yields the DataFrame of each columnar result chunk.
+
+    Categorical columns are chosen once, from the first chunk, so every
+    DataFrame has the same column types. The categories of a column are
+    the values of its chunk, so they may differ from chunk to chunk.
+
+    :param results: columnar result chunks
+    :param categorical_threshold: see
+        :func:`~results.ColumnarResult.to_dataframe` (default: 0.5)
+    :return: iterator of DataFrames
+    """
+    categorical_columns = None
+    for result in results:
+        if categorical_columns is None:
+            categorical_columns = result.categorical_columns(categorical_threshold)
+        yield result.to_dataframe(categorical_columns=categorical_columns)
+
+
+class ColumnarResultBuilder:
+    """Builds a :class:`~results.ColumnarResult` page by page.
+
+    The array type of each column is derived from the table schema:
+    int64 for integer types (including `timestamp`, stored in milliseconds),
+    float64 for floating point types, bool for booleans, and object for
+    everything else (e.g. text and h3hex). Requires `numpy`.
+
+    """
+
+    # `time` values are returned by the driver as objects, and `varint`
+    # values may not fit in 64 bits.
+    HANDLE_TO_DTYPE = {
+        handle: _TYPE_TO_DTYPE[python_type]
+        for handle, python_type in CassandraColumn.HANDLE_TO_TYPE.items()
+        if python_type in _TYPE_TO_DTYPE and handle not in ['time', 'varint']
+    }
+
+    @property
+    def num_rows(self) -> int:
+        """Returns the number of rows appended so far."""
+        return self._num_rows
+
+    def __init__(self, columns: Iterable[CassandraColumn] = ()):
+        """Columnar result builder constructor.
+
+        :param columns: table columns, used to choose the array types.
+            Columns missing from the schema (e.g. aggregates) are stored
+            as object arrays (default: ())
+        """
+        if np is None:
+            raise ImportError("Columnar results require numpy to be installed.")
+
+        self._types = {col.name: col.type for col in columns}
+        self._dtypes = {
+            name: self.HANDLE_TO_DTYPE.get(handle, 'object')
+            for name, handle in self._types.items()
+        }
+
+        self._column_names: Optional[List[str]] = None
+        self._chunks: Dict[str, List['np.ndarray']] = {}
+        self._null_chunks: Dict[str, List[Optional['np.ndarray']]] = {}
+        self._num_rows = 0
+
+    def dtype(self, name: str) -> str:
+        """Returns the array type of a column."""
+        return self._dtypes.get(name, 'object')
+
+    @staticmethod
+    def _to_array(values: Sequence[Any], dtype: str) -> Tuple['np.ndarray', Optional['np.ndarray']]:
+        n = len(values)
+        if dtype == 'object':
+            array = np.empty(n, dtype=object)
+            for i, v in enumerate(values):
+                array[i] = v
+            return array, None
+
+        has_nulls = None in values
+        if dtype == 'float64':
+            if has_nulls:
+                values = [np.nan if v is None else v for v in values]
+            return np.fromiter(values, np.float64, count=n), None
+
+        nulls = None
+        if has_nulls:
+            nulls = np.fromiter((v is None for v in values), bool, count=n)
+            values = [0 if v is None else v for v in values]
+
+        return np.fromiter(values, dtype, count=n), nulls
+
+    def append_page(
+        self,
+        column_names: Sequence[str],
+        rows: Sequence[Sequence[Any] or Mapping[str, Any]]
+    ) -> 'ColumnarResultBuilder':
+        """Append a page of rows.
+
+        Rows should be tuples, as returned by the `tuple_factory` row factory.
+        Dictionary rows are also accepted.
+
+        :param column_names: column names of the page
+        :param rows: page rows
+        :return: self
+        """
+        column_names = list(column_names)
+        if self._column_names is None:
+            self._column_names = column_names
+            for name in column_names:
+                self._chunks[name] = []
+                self._null_chunks[name] = []
+        elif column_names != self._column_names:
+            raise ValueError("All pages must have the same columns.")
+
+        if len(rows) == 0:
+            return self
+
+        if isinstance(rows[0], Mapping):
+            columns = [[row[name] for row in rows] for name in column_names]
+        else:
+            columns = list(zip(*rows))
+
+        for name, values in zip(column_names, columns):
+            array, nulls = self._to_array(values, self.dtype(name))
+            self._chunks[name].append(array)
+            self._null_chunks[name].append(nulls)
+
+        self._num_rows += len(rows)
+
+        return self
+
+    def build(self) -> ColumnarResult:
+        """Returns the columnar result of all the appended pages."""
+        columns = {}
+        nulls = {}
+        for name in self._column_names or []:
+            chunks = self._chunks[name]
+            dtype = self.dtype(name)
+            if len(chunks) == 0:
+                columns[name] = np.empty(0, dtype=dtype)
+            elif len(chunks) == 1:
+                columns[name] = chunks[0]
+            else:
+                columns[name] = np.concatenate(chunks)
+
+            null_chunks = self._null_chunks[name]
+            if any(c is not None for c in null_chunks):
+                nulls[name] = np.concatenate([
+                    np.zeros(len(chunk), dtype=bool) if c is None else c
+                    for chunk, c in zip(chunks, null_chunks)
+                ])
+
+        types = {name: self._types[name] for name in columns if name in self._types}
+
+        return ColumnarResult(columns, nulls, self._num_rows, types)
@@ -0,0 +1,170 @@
+import json
+import re
+import struct
+from decimal import Decimal
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+from cassandra.cqltypes import \
+    AsciiType, LongType, BooleanType, CounterColumnType, DecimalType, \
+    DoubleType, FloatType, InetAddressType, Int32Type, ShortType, ByteType, \
+    UTF8Type, TimeUUIDType, UUIDType, VarcharType, IntegerType
+from cassandra.query import SimpleStatement
+
+
+class RoutingKeyBuilder:
+    """Computes the routing key of generated statements.
+
+    The partition key values of a statement are read from its
+    `<column>=<value>` clauses, or from the row of a `INSERT ... JSON`
+    statement, and serialized as the driver does for bound statements.
+    Token aware load balancing policies then send the statement straight
+    to a replica, instead of paying an extra coordinator hop.
+
+    Statements with unbound (`?`) or multiple (`IN`) partition key values
+    have no routing key.
+
+    """
+
+    TABLE_RE = re.compile(r'\b(?:FROM|INTO)\s+(\w+)\.(\w+)', re.IGNORECASE)
+    JSON_RE = re.compile(r"\bJSON\s+'(.*)'", re.DOTALL)
+
+    # Types without a literal representation in generated statements
+    # (e.g. date, time, duration and blob) are not routed.
+    CASSANDRA_TYPE_TO_CQLTYPE = {
+        'ASCII': AsciiType,
+        'BIGINT': LongType,
+        'BOOLEAN': BooleanType,
+        'COUNTER': CounterColumnType,
+        'DECIMAL': DecimalType,
+        'DOUBLE': DoubleType,
+        'FLOAT': FloatType,
+        'INET': InetAddressType,
+        'INT': Int32Type,
+        'SMALLINT': ShortType,
+        'TINYINT': ByteType,
+        'TEXT': UTF8Type,
+        'TIMEUUID': TimeUUIDType,
+        'UUID': UUIDType,
+        'VARCHAR': VarcharType,
+        'VARINT': IntegerType
+    }
+
+    @property
+    def columns(self) -> Tuple[Tuple[str, str], ...]:
+        """Returns the (name, Cassandra type) of the partition key columns."""
+        return self._columns
+
+    @property
+    def protocol_version(self) -> int:
+        """Returns the protocol version used to serialize values."""
+        return self._protocol_version
+
+    def __init__(self, columns: Sequence[Tuple[str, str]], protocol_version: int = 4):
+        """Routing key builder constructor.
+
+        :param columns: (name, Cassandra type) of the partition key columns,
+            in partition key order
+        :param protocol_version: protocol version used to serialize values.
+            Partition key values are serialized the same way by every
+            version from 3 (default: 4)
+        """
+        self._columns = tuple(columns)
+        self._protocol_version = protocol_version
+        self._patterns = tuple(
+            re.compile(rf"(?:\bWHERE|\bAND)\s+{name}=('(?:[^']|'')*'|[^\s;']+)")
+            for name, _ in self._columns
+        )
+
+    @staticmethod
+    def _parse_literal(cassandra_type: str, literal: str) -> Any:
+        """Returns the value of a CQL literal."""
+        if literal.startswith("'"):
+            return literal[1:-1].replace("''", "'")
+        elif cassandra_type in ['FLOAT', 'DOUBLE']:
+            return float(literal)
+        elif cassandra_type == 'DECIMAL':
+            return Decimal(literal)
+        elif cassandra_type == 'BOOLEAN':
+            return literal.lower() == 'true'
+        elif cassandra_type in ['UUID', 'TIMEUUID']:
+            return UUID(literal)
+
+        return int(literal)
+
+    def _serialize(self, values: Sequence[Any]) -> Optional[List[bytes]]:
+        parts = []
+        for (_, cassandra_type), value in zip(self._columns, values):
+            cql_type = self.CASSANDRA_TYPE_TO_CQLTYPE.get(cassandra_type)
+            if cql_type is None or value is None:
+                return None
+
+            if cassandra_type in ['UUID', 'TIMEUUID'] and isinstance(value, str):
+                value = UUID(value)
+
+            try:
+                parts.append(cql_type.serialize(value, self._protocol_version))
+            except (TypeError, ValueError, struct.error):
+                return None
+
+        return parts
+
+    def routing_key(self, statement: str) -> Optional[List[bytes]]:
+        """Returns the serialized partition key values of a statement,
+        or None if any of them is unknown.
+
+        :param statement: query or insert statement
+        :return: one serialized value per partition key column, or None
+        """
+        if len(self._columns) == 0:
+            return None
+
+        match = self.JSON_RE.search(statement)
+        if match is not None:
+            try:
+                row = json.loads(match.group(1).replace("''", "'"))
+            except ValueError:
+                return None
+
+            return self.row_routing_key(row)
+
+        values = []
+        for (_, cassandra_type), pattern in zip(self._columns, self._patterns):
+            match = pattern.search(statement)
+            if match is None or match.group(1) == '?':
+                return None
+
+            try:
+                values.append(self._parse_literal(cassandra_type, match.group(1)))
+            except ValueError:
+                return None
+
+        return self._serialize(values)
+
+    def row_routing_key(self, row: Mapping[str, Any]) -> Optional[List[bytes]]:
+        """Returns the serialized partition key values of a row,
+        or None if any of them is missing."""
+        return self._serialize([row.get(name) for name, _ in self._columns])
+
+    def statement(self, statement: str, **kwargs) -> SimpleStatement:
+        """Returns a statement with its routing key and keyspace set,
+        when they can be computed.
+
+        :param statement: query or insert statement
+        :param kwargs: other statement options (e.g. `is_idempotent`)
+        :return: statement
+        """
+        match = self.TABLE_RE.search(statement)
+        keyspace = match.group(1) if match is not None else None
+
+        routed = SimpleStatement(statement, keyspace=keyspace, **kwargs)
+
+        # Set through the property, which packs composite partition keys.
+        routing_key = self.routing_key(statement)
+        if routing_key is not None:
+            routed.routing_key = routing_key
+
+        return routed
+
+    def __repr__(self):
+        return f"RoutingKeyBuilder(columns={[name for name, _ in self._columns]})"
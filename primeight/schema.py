@@ -0,0 +1,461 @@
+import hashlib
+import json
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from cassandra import ConsistencyLevel
+from pydantic import create_model
+
+from primeight.column import CassandraColumn
+from primeight.rows import SlottedRowFactory, InterningRowFactory, StringInterner
+from primeight.routing import RoutingKeyBuilder
+from primeight.validation import RowValidator, BatchValidator
+
+
+def config_fingerprint(config: dict) -> str:
+    """Returns the fingerprint of the content of a table configuration."""
+    content = json.dumps(config, sort_keys=True, default=str)
+
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+class TableConfig(dict):
+    """Table configuration returned by the parsers.
+
+    The fingerprint of its content is computed once, on first use, so
+    that compiling the schema of each table and view created from it is
+    a dictionary lookup. Setting or removing a top level key resets the
+    fingerprint; nested values must not be modified in place.
+
+    """
+
+    __slots__ = ('_fingerprint',)
+
+    @property
+    def fingerprint(self) -> str:
+        """Returns the fingerprint of the configuration content."""
+        if self._fingerprint is None:
+            self._fingerprint = config_fingerprint(self)
+        return self._fingerprint
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fingerprint = None
+
+    def __setitem__(self, key, value):
+        self._fingerprint = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._fingerprint = None
+        super().__delitem__(key)
+
+
+class QuerySchema:
+    """Compiled query configuration.
+    Holds the role of each key column of a query (base table or
+    materialized view).
+
+    """
+
+    __slots__ = (
+        '_name', '_required', '_partition_keys', '_clustering_keys',
+        '_order', '_description', '_consistency_level', '_timeout', '_fetch_size',
+        '_profile'
+    )
+
+    @property
+    def name(self) -> str:
+        """Returns the query name."""
+        return self._name
+
+    @property
+    def required(self) -> Mapping[str, str]:
+        """Returns the mapping from required role (id, time, space)
+        to column name."""
+        return self._required
+
+    @property
+    def partition_keys(self) -> Tuple[str, ...]:
+        """Returns the partition key column names."""
+        return self._partition_keys
+
+    @property
+    def clustering_keys(self) -> Tuple[str, ...]:
+        """Returns the clustering key column names."""
+        return self._clustering_keys
+
+    @property
+    def primary_keys(self) -> Tuple[str, ...]:
+        """Returns the partition and clustering key column names."""
+        return self._partition_keys + self._clustering_keys
+
+    @property
+    def order(self) -> Mapping[str, str]:
+        """Returns the clustering order of each ordered column."""
+        return self._order
+
+    @property
+    def description(self) -> Optional[str]:
+        """Returns the query description."""
+        return self._description
+
+    @property
+    def consistency_level(self) -> Optional[int]:
+        """Returns the consistency level of the query statements,
+        or None to use the one of the execution profile."""
+        return self._consistency_level
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """Returns the request timeout of the query, in seconds,
+        or None to use the one of the execution profile."""
+        return self._timeout
+
+    @property
+    def fetch_size(self) -> Optional[int]:
+        """Returns the page size of the query statements,
+        or None to use the one of the session."""
+        return self._fetch_size
+
+    @property
+    def profile(self) -> Optional[str]:
+        """Returns the execution profile name of the query,
+        or None to use the default execution profile."""
+        return self._profile
+
+    @property
+    def statement_options(self) -> Dict[str, int]:
+        """Returns the statement options (consistency level and fetch size)
+        declared by the query."""
+        options = {}
+        if self._consistency_level is not None:
+            options['consistency_level'] = self._consistency_level
+        if self._fetch_size is not None:
+            options['fetch_size'] = self._fetch_size
+
+        return options
+
+    def __init__(self, name: str, config: dict, bucket: str = None):
+        """Query schema constructor.
+
+        :param name: query name
+        :param config: query configuration, as declared in the yaml
+        :param bucket: split column prepended to the partition keys,
+            when the table is split in buckets (default: None)
+        """
+        self._name = name
+        self._required = MappingProxyType(dict(config['required']))
+        self._partition_keys = \
+            ((bucket,) if bucket is not None else ()) + tuple(config['required'].values())
+        self._clustering_keys = tuple(config.get('optional') or ())
+        self._order = MappingProxyType(dict(config.get('order') or {}))
+        self._description = config.get('description')
+        self._consistency_level = \
+            ConsistencyLevel.name_to_value[config['consistency'].upper()] \
+            if config.get('consistency') is not None else None
+        self._timeout = config.get('timeout')
+        self._fetch_size = config.get('fetch_size')
+        self._profile = config.get('profile')
+
+
+class CassandraSchema:
+    """Compiled table schema.
+
+    The schema is built once per table configuration and shared by every
+    table and materialized view instance created from it.
+    Use :func:`~schema.CassandraSchema.compile` instead of the constructor
+    to benefit from that sharing.
+
+    """
+
+    __slots__ = (
+        '_name', '_split', '_split_mode', '_columns', '_positions', '_by_name', '_by_alias',
+        '_generated_columns', '_ddl_types', '_column_definitions', '_queries',
+        '_model', '_validator', '_batch_validator', '_row_factory',
+        '_interned_columns', '_interner', '_interning_row_factories',
+        '_routing_key_builders'
+    )
+
+    TIME_GENERATORS = ['day', 'week', 'month', 'year']
+
+    SPLIT_MODES = ['table', 'bucket']
+
+    TEXT_TYPES = ['ascii', 'text', 'varchar', 'h3hex']
+
+    MAX_CACHED_SCHEMAS = 256
+
+    _cache: Dict[str, 'CassandraSchema'] = {}
+    _cache_lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        """Returns the table name."""
+        return self._name
+
+    @property
+    def split(self) -> Optional[str]:
+        """Returns the table split, or None if the table has no split."""
+        return self._split
+
+    @property
+    def split_mode(self) -> Optional[str]:
+        """Returns how the table is split, either in one table per time
+        bucket (`table`) or in a partition key column of a single table
+        (`bucket`), or None if the table has no split."""
+        return self._split_mode
+
+    @property
+    def columns(self) -> Tuple[CassandraColumn, ...]:
+        """Returns the table columns, generated columns last."""
+        return self._columns
+
+    @property
+    def by_name(self) -> Mapping[str, CassandraColumn]:
+        """Returns the mapping from column name to column."""
+        return self._by_name
+
+    @property
+    def by_alias(self) -> Mapping[str, CassandraColumn]:
+        """Returns the mapping from column alias to column."""
+        return self._by_alias
+
+    @property
+    def generated_columns(self) -> Mapping[str, Tuple[str, ...]]:
+        """Returns the mapping from generated column to its argument columns."""
+        return self._generated_columns
+
+    @property
+    def ddl_types(self) -> Mapping[str, str]:
+        """Returns the mapping from column name to Cassandra type."""
+        return self._ddl_types
+
+    @property
+    def column_definitions(self) -> str:
+        """Returns the column definitions used to create the table."""
+        return self._column_definitions
+
+    @property
+    def queries(self) -> Mapping[str, QuerySchema]:
+        """Returns the mapping from query name to query schema."""
+        return self._queries
+
+    @property
+    def model(self):
+        """Returns a Pydantic model of the table arguments.
+        The model is created on first access."""
+        if self._model is None:
+            name = self._name.title().replace('_', '')
+            fields = {col.name: (col.pydantic_type(), None) for col in self._columns}
+            self._model = create_model(name, **fields)
+
+        return self._model
+
+    @property
+    def validator(self) -> RowValidator:
+        """Returns the row validator of the table.
+        The validator is created on first access."""
+        if self._validator is None:
+            self._validator = RowValidator(self.model, self._columns)
+
+        return self._validator
+
+    @property
+    def key_columns(self) -> Tuple[str, ...]:
+        """Returns the columns of an inserted row that can not be null.
+        These are the base primary key columns, or the columns they are
+        generated from."""
+        key_columns = []
+        for name in self._queries['base'].primary_keys:
+            for column in self._generated_columns.get(name, (name,)):
+                if column not in key_columns:
+                    key_columns.append(column)
+
+        return tuple(key_columns)
+
+    @property
+    def batch_validator(self) -> BatchValidator:
+        """Returns the vectorized batch validator of the table.
+        The validator is created on first access and requires `numpy`."""
+        if self._batch_validator is None:
+            self._batch_validator = \
+                BatchValidator(self._columns, key_columns=self.key_columns)
+
+        return self._batch_validator
+
+    @property
+    def row_factory(self) -> SlottedRowFactory:
+        """Returns the slotted row factory of the table."""
+        if self._row_factory is None:
+            self._row_factory = SlottedRowFactory(self._name)
+
+        return self._row_factory
+
+    @property
+    def interned_columns(self) -> FrozenSet[str]:
+        """Returns the columns whose values are interned in query results:
+        the columns declared with `intern: true`, the h3hex columns and
+        the text partition key columns."""
+        return self._interned_columns
+
+    @property
+    def interner(self) -> StringInterner:
+        """Returns the intern table of the table.
+        The table is created on first access."""
+        if self._interner is None:
+            self._interner = StringInterner()
+
+        return self._interner
+
+    def interning_row_factory(self, row_factory: Callable) -> InterningRowFactory:
+        """Returns a row factory interning the values of
+        :attr:`~schema.CassandraSchema.interned_columns` before passing the
+        rows to another row factory. Factories are cached per wrapped factory.
+
+        :param row_factory: wrapped row factory
+        :return: interning row factory
+        """
+        factory = self._interning_row_factories.get(row_factory)
+        if factory is None:
+            factory = InterningRowFactory(
+                row_factory, self._interned_columns, self.interner
+            )
+            factory = self._interning_row_factories.setdefault(row_factory, factory)
+
+        return factory
+
+    def routing_key_builder(self, query_name: str = 'base') -> RoutingKeyBuilder:
+        """Returns the routing key builder of a query, computing routing
+        keys from its partition key columns. Builders are created on first
+        access.
+
+        :param query_name: query name (default: base)
+        :return: routing key builder
+        """
+        builder = self._routing_key_builders.get(query_name)
+        if builder is None:
+            builder = RoutingKeyBuilder([
+                (name, self._ddl_types[name])
+                for name in self._queries[query_name].partition_keys
+            ])
+            builder = self._routing_key_builders.setdefault(query_name, builder)
+
+        return builder
+
+    def __init__(self, config: dict):
+        """Cassandra schema constructor.
+
+        :param config: table template configuration
+        """
+        self._name = config['name']
+        self._split = config.get('split')
+        self._split_mode = None
+        if self._split is not None:
+            self._split_mode = config.get('split_mode') or 'table'
+
+        columns = []
+        for name, content in config['columns'].items():
+            columns.append(CassandraColumn(
+                name, content['type'],
+                min_value=content.get('min', None),
+                max_value=content.get('max', None),
+                alias=content.get('alias', None),
+                description=content.get('description', None),
+                intern=content.get('intern', False)
+            ))
+
+        generated_columns = {}
+        for name, content in (config.get('generated_columns') or {}).items():
+            if name in self.TIME_GENERATORS:
+                columns.append(CassandraColumn(name, 'timestamp'))
+            else:
+                columns.append(CassandraColumn(name, 'h3hex'))
+
+            generated_columns[name] = tuple("".join(content.split()).split(','))
+
+        self._columns = tuple(columns)
+        self._positions = MappingProxyType(
+            {col.name: index for index, col in enumerate(columns)}
+        )
+        self._by_name = MappingProxyType({col.name: col for col in columns})
+        self._by_alias = MappingProxyType(
+            {col.alias: col for col in columns if col.alias is not None}
+        )
+        self._generated_columns = MappingProxyType(generated_columns)
+
+        self._ddl_types = MappingProxyType(
+            {col.name: col.cassandra_type() for col in columns}
+        )
+        self._column_definitions = ', '.join(
+            [f'{name} {ddl_type}' for name, ddl_type in self._ddl_types.items()]
+        )
+
+        bucket = self._split if self._split_mode == 'bucket' else None
+        self._queries = MappingProxyType({
+            name: QuerySchema(name, query, bucket=bucket)
+            for name, query in config['query'].items()
+        })
+
+        self._model = None
+        self._validator = None
+        self._batch_validator = None
+        self._row_factory = None
+
+        partition_keys = {
+            name for query in self._queries.values() for name in query.partition_keys
+        }
+        self._interned_columns = frozenset(
+            col.name for col in columns
+            if col.intern or col.type == 'h3hex'
+            or (col.name in partition_keys and col.type in self.TEXT_TYPES)
+        )
+        self._interner = None
+        self._interning_row_factories = {}
+        self._routing_key_builders = {}
+
+    @classmethod
+    def compile(cls, config: dict) -> 'CassandraSchema':
+        """Returns the compiled schema of a table configuration.
+
+        Schemas are cached by configuration content, so that the same yaml
+        always returns the same schema object. The fingerprint of a
+        :class:`~schema.TableConfig`, as returned by the parsers, is only
+        computed once, other configurations are fingerprinted on each call.
+
+        :param config: table template configuration
+        :return: compiled schema
+        """
+        key = config.fingerprint if isinstance(config, TableConfig) else config_fingerprint(config)
+
+        schema = cls._cache.get(key)
+        if schema is None:
+            schema = cls(config)
+            with cls._cache_lock:
+                if len(cls._cache) >= cls.MAX_CACHED_SCHEMAS:
+                    cls._cache.pop(next(iter(cls._cache)))
+                schema = cls._cache.setdefault(key, schema)
+
+        return schema
+
+    def get(self, name: str) -> Optional[CassandraColumn]:
+        """Returns column, returns None if column does not exist in table."""
+        return self._by_name.get(name.lower())
+
+    def get_columns(
+        self, names: List[str] = None, alias: List[str] = None
+    ) -> List[CassandraColumn]:
+        """Returns the columns matching the names or alias,
+        in table order."""
+        columns = {}
+        for name in names or ():
+            col = self._by_name.get(name)
+            if col is not None:
+                columns[col.name] = col
+
+        for a in alias or ():
+            col = self._by_alias.get(a)
+            if col is not None:
+                columns[col.name] = col
+
+        return sorted(columns.values(), key=lambda c: self._positions[c.name])
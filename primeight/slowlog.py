@@ -0,0 +1,218 @@
+import logging
+import re
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+
+from primeight.metrics import MetricLabels
+
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_UUID_RE = re.compile(
+    r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b'
+)
+_NUMBER_RE = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?(?![\w.])')
+_IN_RE = re.compile(r'\bIN\s*\([^)]*\)', re.IGNORECASE)
+# Suffix of the split tables, e.g. `_07_01_2019`, `_01_2019` or `_2019`.
+_SPLIT_RE = re.compile(r'(?<=\w)_(?:\d{2}_){0,2}\d{4}(?![0-9])')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint(statement: Any) -> str:
+    """Returns the shape of a statement: string, number and UUID literals,
+    e.g. ids, timestamps and H3 cells, are replaced by `?`, `IN` lists by
+    `IN (?)`, split table suffixes by `_{date}`, and whitespace is collapsed.
+
+    :param statement: query string or driver statement
+    :return: fingerprint
+    """
+    query_string = getattr(statement, 'query_string', statement)
+
+    query_string = _STRING_RE.sub('?', query_string)
+    query_string = _UUID_RE.sub('?', query_string)
+    query_string = _SPLIT_RE.sub('_{date}', query_string)
+    query_string = _NUMBER_RE.sub('?', query_string)
+    query_string = _IN_RE.sub('IN (?)', query_string)
+
+    return _SPACE_RE.sub(' ', query_string).strip()
+
+
+class SlowQuery(NamedTuple):
+    """Slow statement recorded by a :class:`SlowQueryLog`."""
+
+    fingerprint: str
+    statement: str
+    labels: Optional[MetricLabels]
+    latency: float
+    rows: int
+    fan_out: int
+
+
+class _Aggregate:
+    """Slow statements sharing the same fingerprint."""
+
+    __slots__ = ('count', 'total_latency', 'max_latency', 'rows', 'max_fan_out', 'example')
+
+    def __init__(self, example: str):
+        self.count = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.rows = 0
+        self.max_fan_out = 0
+        self.example = example
+
+
+class SlowQueryLog:
+    """Log of the statements slower than a latency threshold.
+
+    Slow statements are logged as warnings, kept in a bounded list of the
+    most recent ones, and aggregated by fingerprint (see
+    :func:`~slowlog.fingerprint`), so the few query shapes behind most
+    of the load stand out in :func:`~slowlog.SlowQueryLog.summary`.
+
+    The fan-out of a statement is the number of statements executed by
+    the same call, e.g. one per split table and time bucket of a query.
+
+    """
+
+    @property
+    def threshold(self) -> float:
+        """Returns the latency threshold, in seconds."""
+        return self._threshold
+
+    @property
+    def entries(self) -> List[SlowQuery]:
+        """Returns the most recent slow statements, oldest first."""
+        with self._lock:
+            return list(self._entries)
+
+    @property
+    def dropped(self) -> int:
+        """Returns the number of slow statements not aggregated because
+        `max_fingerprints` was reached."""
+        return self._dropped
+
+    def __init__(
+        self,
+        threshold: float = 1.0,
+        max_entries: int = 1000,
+        max_fingerprints: int = 10000,
+        log_level: Optional[int] = logging.WARNING
+    ):
+        """Slow query log constructor.
+
+        :param threshold: latency, in seconds, from which a statement is
+            slow (default: 1.0)
+        :param max_entries: number of recent slow statements kept
+            (default: 1000)
+        :param max_fingerprints: maximum number of aggregated
+            fingerprints (default: 10000)
+        :param log_level: level of the slow statement log records.
+            If None, slow statements are not logged (default: WARNING)
+        """
+        if threshold < 0:
+            raise ValueError("Threshold can not be negative.")
+
+        self._threshold = threshold
+        self._max_fingerprints = max_fingerprints
+        self._log_level = log_level
+        self._entries: Deque[SlowQuery] = deque(maxlen=max_entries)
+        self._aggregates: Dict[str, _Aggregate] = {}
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def is_slow(self, latency: Optional[float]) -> bool:
+        """Returns True if a latency is over the threshold."""
+        return latency is not None and latency >= self._threshold
+
+    def record(
+        self,
+        statement: Any,
+        latency: float,
+        rows: int = 0,
+        fan_out: int = 1,
+        labels: MetricLabels = None
+    ) -> Optional[SlowQuery]:
+        """Record a statement, if it is slow.
+
+        :param statement: query string or driver statement
+        :param latency: execution latency, in seconds
+        :param rows: number of returned rows (default: 0)
+        :param fan_out: number of statements executed by the same call
+            (default: 1)
+        :param labels: statement metric labels (default: None)
+        :return: slow query entry, or None if the statement is not slow
+        """
+        if not self.is_slow(latency):
+            return None
+
+        query_string = getattr(statement, 'query_string', statement)
+        entry = SlowQuery(
+            fingerprint(query_string), query_string, labels, latency, rows, fan_out
+        )
+
+        with self._lock:
+            self._entries.append(entry)
+
+            aggregate = self._aggregates.get(entry.fingerprint)
+            if aggregate is None:
+                if len(self._aggregates) >= self._max_fingerprints:
+                    self._dropped += 1
+                else:
+                    aggregate = self._aggregates[entry.fingerprint] = _Aggregate(query_string)
+
+            if aggregate is not None:
+                aggregate.count += 1
+                aggregate.total_latency += latency
+                aggregate.max_latency = max(aggregate.max_latency, latency)
+                aggregate.rows += rows
+                aggregate.max_fan_out = max(aggregate.max_fan_out, fan_out)
+
+        if self._log_level is not None:
+            logging.log(
+                self._log_level,
+                f"Slow query ({latency:.3f}s, {rows} rows, fan-out {fan_out}): "
+                f"{entry.fingerprint}"
+            )
+
+        return entry
+
+    def summary(self, limit: int = None) -> List[Dict[str, Any]]:
+        """Returns the slow statements aggregated by fingerprint,
+        by decreasing total latency.
+
+        :param limit: maximum number of fingerprints (default: None)
+        :return: count, total, mean and max latency, rows, max fan-out
+            and an example statement of each fingerprint
+        """
+        with self._lock:
+            summary = [
+                {
+                    'fingerprint': key,
+                    'count': aggregate.count,
+                    'total_latency': aggregate.total_latency,
+                    'mean_latency': aggregate.total_latency / aggregate.count,
+                    'max_latency': aggregate.max_latency,
+                    'rows': aggregate.rows,
+                    'max_fan_out': aggregate.max_fan_out,
+                    'example': aggregate.example
+                }
+                for key, aggregate in self._aggregates.items()
+            ]
+
+        summary.sort(key=lambda item: item['total_latency'], reverse=True)
+
+        return summary[:limit] if limit is not None else summary
+
+    def reset(self) -> None:
+        """Remove every entry and aggregate."""
+        with self._lock:
+            self._entries.clear()
+            self._aggregates.clear()
+            self._dropped = 0
+
+    def __repr__(self):
+        return (
+            f"SlowQueryLog(threshold={self._threshold}, "
+            f"fingerprints={len(self._aggregates)})"
+        )
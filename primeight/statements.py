@@ -0,0 +1,80 @@
+from itertools import chain
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+
+class StatementStream:
+    """Lazy stream of query statements.
+
+    A stream holds the base statements and the list of transformations
+    applied by the query builder. Adding a transformation returns a new
+    stream without producing any statement, and statements are only
+    produced, one at a time, when the stream is iterated.
+    Streams can be iterated more than once.
+
+    """
+
+    __slots__ = ('_source', '_stages')
+
+    MAP = 'map'
+    FLAT_MAP = 'flat_map'
+    FILTER = 'filter'
+
+    @property
+    def source(self) -> Tuple[str, ...]:
+        """Returns the base statements."""
+        return self._source
+
+    def __init__(
+        self,
+        source: Iterable[str] = (),
+        stages: Tuple[Tuple[str, Callable], ...] = ()
+    ):
+        """Statement stream constructor.
+
+        :param source: base statements
+        :param stages: transformations, as (kind, function) tuples
+            (default: ())
+        """
+        self._source = tuple(source)
+        self._stages = stages
+
+    def map(self, function: Callable[[str], str]) -> 'StatementStream':
+        """Returns a stream with every statement replaced by
+        `function(statement)`."""
+        return StatementStream(self._source, self._stages + ((self.MAP, function),))
+
+    def flat_map(self, function: Callable[[str], Iterable[str]]) -> 'StatementStream':
+        """Returns a stream with every statement replaced by
+        the statements of `function(statement)`."""
+        return StatementStream(
+            self._source, self._stages + ((self.FLAT_MAP, function),)
+        )
+
+    def filter(self, function: Callable[[str], bool]) -> 'StatementStream':
+        """Returns a stream with only the statements for which
+        `function(statement)` is True."""
+        return StatementStream(
+            self._source, self._stages + ((self.FILTER, function),)
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        statements = iter(self._source)
+        for kind, function in self._stages:
+            if kind == self.MAP:
+                statements = map(function, statements)
+            elif kind == self.FILTER:
+                statements = filter(function, statements)
+            else:
+                statements = chain.from_iterable(map(function, statements))
+
+        return statements
+
+    def __repr__(self):
+        return (
+            f"StatementStream(source={len(self._source)}, "
+            f"stages={len(self._stages)})"
+        )
+
+    def to_list(self) -> List[str]:
+        """Returns all the statements."""
+        return list(self)
@@ -1,20 +1,35 @@
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Any, List, Dict, Optional
+import re
+from functools import partial
+from datetime import datetime
+from typing import Any, Callable, List, Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple
 from uuid import UUID
 
 import pytz
+from cassandra.cluster import ExecutionProfile
 from cassandra.encoder import cql_quote
-from pydantic import create_model
+from cassandra.query import Statement, dict_factory, tuple_factory
 import h3.api.basic_str as h3
 from geojson import Polygon
 
 from primeight.base import CassandraBase
+from primeight.concurrency import Deadline
 from primeight.manager import CassandraManager
+from primeight.metrics import MetricLabels, MetricsRegistry
 from primeight.keyspace import CassandraKeyspace
 from primeight.column import CassandraColumn
+from primeight.schema import CassandraSchema
+from primeight.validation import ValidationReport
+from primeight.results import ColumnarResult, iter_dataframes
+from primeight.rows import SlottedRow
 from primeight.generators import Generators
+from primeight.planner import QueryPlanner
+from primeight.statements import StatementStream
+from primeight.partitions import \
+    PartitionRange, partition_range, partition_suffix, partition_timestamp, \
+    bucket, days_of
+from primeight.prepared import parameterize
 from primeight.utils import UUIDEncoder
 from primeight.exceptions import \
     DateNotDefinedError, QueryNotFound, \
@@ -23,6 +38,8 @@ from primeight.exceptions import \
 
 class CassandraTable(CassandraBase):
 
+    SPLIT_TABLE_RE = re.compile(r'\bFROM\s+(\w+)\.(\w*)\{date\}(\w*)')
+
     TABLE_FORMAT = {
         'day': '%d_%m_%Y',
         'week': '%d_%m_%Y',
@@ -54,32 +71,47 @@ class CassandraTable(CassandraBase):
         return _name
 
     @property
-    def columns(self) -> List[CassandraColumn]:
+    def schema(self) -> CassandraSchema:
+        """Returns the compiled table schema."""
+        return self._schema
+
+    @property
+    def columns(self) -> Tuple[CassandraColumn, ...]:
         """Returns the table column list."""
-        return self._columns
+        return self._schema.columns
 
     @property
-    def col(self) -> Dict[str, CassandraColumn]:
-        return {col.name.lower(): col for col in self.columns}
+    def col(self) -> Mapping[str, CassandraColumn]:
+        return self._schema.by_name
 
     @property
     def model(self):
-        """Returns a Pydantic model of the table arguments."""
-        name = self.config['name'].title().replace('_', '')
-        fields = {}
-        for f in self.columns:
-            fields[f.name] = (f.pydantic_type(), None)
+        """Returns a Pydantic model of the table arguments.
+        The model is shared by every table with the same schema."""
+        return self._schema.model
 
-        return create_model(name, **fields)
+    @property
+    def missing_splits(self) -> List[str]:
+        """Returns the sorted `<keyspace>.<table>` names of the split tables
+        skipped by :func:`~table.CassandraTable.time` or
+        :func:`~table.CassandraTable.between` because they do not exist."""
+        return sorted(self._missing_splits)
 
     @property
     def statements(self) -> list:
         """Returns current statements."""
+        return list(self.iter_statements())
+
+    def iter_statements(self) -> Iterator[str]:
+        """Yields current statements one at a time.
+
+        Query statements are produced lazily, so long time ranges
+        do not require building every statement upfront.
+        """
         if self._current_statements is None:
-            return []
+            return
 
         _tags = ['where', 'and', 'limit']
-        _statements = []
         for statement in self._current_statements:
             if '{columns}' in statement:
                 statement = self._replace(statement, 'columns', '*')
@@ -89,27 +121,122 @@ class CassandraTable(CassandraBase):
                 if _tag in statement:
                     statement = self._replace(statement, tag, '')
 
-            _statements.append(statement)
+            yield statement
+
+    def iter_routed_statements(self) -> Iterator[str or Statement]:
+        """Yields current statements one at a time, as executed.
+
+        Query and insert statements carry the routing key computed from
+        their partition key values, so that token aware load balancing
+        policies send them straight to a replica. Query statements are
+        also marked idempotent, so they can be speculatively executed
+        (see :func:`~manager.CassandraManager.speculative_profile`),
+        while inserts never are. Query statements have the consistency
+        level and fetch size declared by their query, if any.
+        Other statements (e.g. create and drop) are returned as is.
+
+        Statements on split tables without a time frame raise a
+        :class:`~exceptions.DateNotDefinedError` when they are reached.
+        """
+        statements = map(self._validate_statement, self.iter_statements())
+
+        if self._current_operation == 'query':
+            builder = self._schema.routing_key_builder(self._current_query)
+            options = self._schema.queries[self._current_query].statement_options
+            return map(
+                partial(builder.statement, is_idempotent=True, **options),
+                statements
+            )
+        elif self._current_operation == 'insert':
+            builder = self._schema.routing_key_builder('base')
+            return map(builder.statement, statements)
+
+        return statements
+
+    def _label_query(self) -> str:
+        """Returns the query name of the metric labels."""
+        return self._current_query if self._current_operation == 'query' else 'base'
 
-        return _statements
+    def _execution_profile(
+        self, execution_profile: str or ExecutionProfile = None
+    ) -> str or ExecutionProfile:
+        """Returns the execution profile of the current statements:
+        `execution_profile` if defined, or else the profile and timeout
+        declared by the current query, if any."""
+        if execution_profile is not None or self._current_operation != 'query':
+            return execution_profile
+
+        query = self._schema.queries[self._current_query]
+        if query.timeout is None:
+            return query.profile
+
+        return self.cassandra_manager.timeout_profile(query.profile, query.timeout)
+
+    def metric_labels(self, statement: str or Statement) -> MetricLabels:
+        """Returns the labels of the metrics of a statement: keyspace,
+        table name, query name, operation and split period, i.e. the split
+        table suffix, or the suffix of the split bucket.
+
+        :param statement: statement of the current operation
+        :return: labels
+        """
+        labels = MetricsRegistry.statement_labels(statement)
+        query = self._label_query()
+
+        split = ''
+        if self.has_split() and labels.table.startswith(f'{self.name}_'):
+            split = labels.table[len(self.name) + 1:]
+            if query != 'base' and split.endswith(f'_{query}'):
+                split = split[:-len(query) - 1]
+        elif self.has_split_bucket():
+            granularity = self.config['split']
+            query_string = getattr(statement, 'query_string', statement)
+            match = re.search(rf'\b{granularity}=(\d+)', query_string)
+            if match is not None:
+                split = partition_suffix(granularity, days_of(int(match.group(1))))
+
+        return MetricLabels(
+            labels.keyspace, self.name, query,
+            self._current_operation or labels.operation, split
+        )
 
     def get_columns(
         self, names: List[str] = None, alias: List[str] = None
     ) -> List[CassandraColumn]:
         """Returns list of columns."""
-        column_list = []
-        for col in self.columns:
-            if names is not None and col.name in names:
-                column_list.append(col)
-
-            elif alias is not None and col.alias in alias:
-                column_list.append(col)
-
-        return column_list
+        return self._schema.get_columns(names=names, alias=alias)
 
     def get(self, name: str) -> Optional[CassandraColumn]:
         """Returns column, returns None if column does not exist in table."""
-        return self.col.get(name.lower())
+        return self._schema.get(name)
+
+    def validate_many(
+        self, rows: Iterable[Dict[str, Any]], coerce: bool = True
+    ) -> ValidationReport:
+        """Validate a batch of rows against the column types and
+        min/max values.
+
+        :param rows: rows to validate
+        :param coerce: if True, values are coerced to the column types.
+            If False, values must already have the column types, which is
+            much faster and suited to trusted producers (default: True)
+        :return: validation report with the accepted rows and rejections
+        """
+        return self._schema.validator.validate_many(rows, coerce=coerce)
+
+    def validate_batch(
+        self, rows: Sequence[Dict[str, Any]] or Mapping[str, Sequence[Any]]
+    ):
+        """Validate a batch of rows in a single vectorized pass.
+
+        Checks the min/max values of every column and that the primary key
+        columns are not null. Requires `numpy`.
+
+        :param rows: list of rows, or mapping of column name to column values
+        :return: boolean mask of the valid rows and the reason code of each
+            row (see :attr:`~validation.BatchValidator.REASONS`)
+        """
+        return self._schema.batch_validator.validate(rows)
 
     def __init__(
             self,
@@ -127,107 +254,194 @@ class CassandraTable(CassandraBase):
         self._config = config
         self._keyspace = keyspace
 
-        columns = []
-        for name, content in self._config['columns'].items():
-            col_min = content.get('min', None)
-            col_max = content.get('max', None)
-            col_alias = content.get('alias', None)
-            col_description = content.get('description', None)
-
-            col = CassandraColumn(
-                name, content['type'],
-                min_value=col_min, max_value=col_max,
-                alias=col_alias, description=col_description
-            )
-            columns.append(col)
-
-        if 'generated_columns' in self._config:
-            for name, content in self._config['generated_columns'].items():
-                if name in ['day', 'week', 'month', 'year']:
-                    col = CassandraColumn(name, 'timestamp')
-                else:
-                    col = CassandraColumn(name, 'h3hex')
-
-                columns.append(col)
-
-        self._columns = columns
+        self._schema = CassandraSchema.compile(config)
 
         self._current_operation = None
         self._current_query = None
         self._current_statements = None
+        self._current_plan = None
+        self._missing_splits = set()
 
         self._manager = cassandra_manager
 
-    def has_split(self) -> bool:
-        """Returns True if table has split, False otherwise."""
-        return 'split' in self.config
+    def _row_factory(self, row_factory: Callable, intern: bool) -> Callable:
+        if intern:
+            return self._schema.interning_row_factory(row_factory)
 
-    def _is_query_valid(self) -> bool:
-        """Raises an Exception if statement is not ready to be executed."""
+        return row_factory
 
-        for statement in self._current_statements:
-            if '{date}' in statement:
-                raise DateNotDefinedError(
-                    "When splitting table by date, "
-                    "you are required to specify a time frame."
-                )
+    def execute(
+        self,
+        execution_profile: str or ExecutionProfile = None,
+        row_factory: Callable = None,
+        intern: bool = False,
+        deadline: Deadline or float = None
+    ) -> List[tuple] or List[dict]:
+        """Execute list of query statements sequentially.
+
+        :param execution_profile: execution profile (default: None)
+            This parameter can be both the name of a configured profile,
+            or the execution profile itself.
+        :param row_factory: row factory replacing the one of the
+            execution profile (default: None)
+        :param intern: if True, repeated values of the interned columns
+            share a single object (see
+            :attr:`~schema.CassandraSchema.interned_columns`). Rows are
+            dictionaries unless `row_factory` is defined (default: False)
+        :param deadline: overall deadline of the statements, or its
+            number of seconds (see :class:`~concurrency.Deadline`)
+            (default: None)
+        :return: list of rows as formatted by the rows_factory
+            in the execution profile
+        """
+        if intern:
+            row_factory = self._row_factory(row_factory or dict_factory, intern)
 
-        return True
+        return super().execute(execution_profile, row_factory, deadline)
 
-    @staticmethod
-    def _calculate_table_partitions(partition: str, start: datetime, end: datetime) -> List[datetime]:
-        """Create list of datetime from start to end date, based on partition.
-        Partition may be day, month, or year.
-        All datetime are return representing the initial moment of the start
-        of that partition.
-
-        :param partition: partition
-        :param start: start date
-        :param end: end date
-        :return: list of datetime
+    def execute_slotted(
+        self,
+        execution_profile: str or ExecutionProfile = None,
+        intern: bool = False,
+        deadline: Deadline or float = None
+    ) -> List[SlottedRow]:
+        """Execute list of query statements sequentially,
+        returning slotted rows instead of dictionaries.
+
+        Rows are tuples with one attribute per selected column and
+        a `to_dict()` method. Their class is created once per table
+        and selected columns.
+
+        :param execution_profile: execution profile (default: None)
+            This parameter can be both the name of a configured profile,
+            or the execution profile itself. Its row factory is ignored.
+        :param intern: if True, repeated values of the interned columns
+            share a single object (default: False)
+        :param deadline: overall deadline of the statements, or its
+            number of seconds (default: None)
+        :return: list of rows
         """
+        row_factory = self._row_factory(self._schema.row_factory, intern)
 
-        if partition == 'day':
-            dd = (end - start).days + 1
+        return super().execute(execution_profile, row_factory, deadline)
 
-            days = []
-            for i in range(dd):
-                d = start + timedelta(days=i)
-                days.append(d.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=pytz.UTC))
+    def execute_columnar(
+        self,
+        execution_profile: str or ExecutionProfile = None,
+        intern: bool = False,
+        deadline: Deadline or float = None
+    ) -> ColumnarResult:
+        """Execute list of query statements sequentially,
+        returning one NumPy array per column.
+
+        Array types are derived from the table columns, e.g. `timestamp`
+        columns are int64 arrays of milliseconds. Requires `numpy`.
+
+        :param execution_profile: execution profile (default: None)
+            This parameter can be both the name of a configured profile,
+            or the execution profile itself.
+        :param intern: if True, repeated values of the interned columns
+            share a single object (default: False)
+        :param deadline: overall deadline of the statements, or its
+            number of seconds (default: None)
+        :return: columnar result, a mapping from column name to array
+        """
+        return self.cassandra_manager.execute_columnar(
+            self.iter_routed_statements(), self.columns,
+            self._execution_profile(execution_profile),
+            self._row_factory(tuple_factory, intern), self.metric_labels, deadline
+        )
 
-            return days
-        elif partition == 'week':
-            weeks = set()
+    def to_dataframe(
+        self,
+        chunksize: int = None,
+        categorical_threshold: float = 0.5,
+        execution_profile: str or ExecutionProfile = None,
+        intern: bool = False,
+        deadline: Deadline or float = None
+    ) -> Any:
+        """Execute list of query statements sequentially,
+        returning the result as a pandas DataFrame.
+
+        DataFrames are built directly from the result pages, with column
+        types derived from the table columns: `timestamp` columns are
+        `datetime64[ms]`, and text columns with few distinct values are
+        categoricals. Requires `numpy` and `pandas`.
+
+        :param chunksize: if defined, returns an iterator of DataFrames of
+            at least `chunksize` rows (pages are never split), so large time
+            ranges do not have to fit in memory at once. Categorical columns
+            are chosen from the first chunk (default: None)
+        :param categorical_threshold: text columns whose ratio of distinct
+            values to rows is at most this value are made categorical.
+            Set to 0 to disable categoricals (default: 0.5)
+        :param execution_profile: execution profile (default: None)
+        :param intern: if True, repeated values of the interned columns
+            share a single object (default: False)
+        :param deadline: overall deadline of the statements, or its
+            number of seconds (default: None)
+        :return: DataFrame, or iterator of DataFrames if `chunksize` is defined
+        """
+        if chunksize is None:
+            return self.execute_columnar(execution_profile, intern, deadline) \
+                .to_dataframe(categorical_threshold)
+
+        chunks = self.cassandra_manager.iter_columnar(
+            self.iter_routed_statements(), chunksize, self.columns,
+            self._execution_profile(execution_profile),
+            self._row_factory(tuple_factory, intern), self.metric_labels, deadline
+        )
+        return iter_dataframes(chunks, categorical_threshold)
 
-            dd = (end - start).days + 1
-            for i in range(dd):
-                d = start + timedelta(days=i)
-                last_monday = d - timedelta(days=d.weekday())
-                weeks.add(last_monday)
+    @property
+    def split_mode(self) -> Optional[str]:
+        """Returns the split mode (table or bucket),
+        or None if the table has no split."""
+        if 'split' not in self.config:
+            return None
 
-            return list(weeks)
-        elif partition == 'month':
+        return self.config.get('split_mode') or 'table'
 
-            def total_months(dt):
-                return dt.month + 12 * dt.year
+    def has_split(self) -> bool:
+        """Returns True if table is split in one table per time bucket,
+        False otherwise."""
+        return self.split_mode == 'table'
+
+    def has_split_bucket(self) -> bool:
+        """Returns True if table is split by a time bucket partition key
+        column, False otherwise."""
+        return self.split_mode == 'bucket'
+
+    def _validate_statement(self, statement: str) -> str:
+        """Returns a statement, raising an Exception if it is not ready
+        to be executed, i.e. if its split is not defined."""
+        if '{date}' in statement or (
+            self.has_split_bucket() and self._current_operation == 'query'
+            and f" {self.config['split']}=" not in statement
+        ):
+            raise DateNotDefinedError(
+                "When splitting table by date, "
+                "you are required to specify a time frame."
+            )
 
-            months = []
-            for tot_m in range(total_months(start) - 1, total_months(end)):
-                y, m = divmod(tot_m, 12)
-                months.append(datetime(y, m + 1, 1, 0, 0, 0, 0, tzinfo=pytz.UTC))
+        return statement
 
-            return months
-        elif partition == 'year':
-            dy = (end.year - start.year) + 1
+    @staticmethod
+    def _calculate_table_partitions(partition: str, start: datetime, end: datetime) -> List[datetime]:
+        """Create list of datetime from start to end date, based on partition.
+        Partition may be day, week, month, or year.
+        All datetime are return representing the initial moment of the start
+        of that partition, sorted.
 
-            years = []
-            for i in range(dy):
-                y = start.year + i
-                years.append(start.replace(year=y, month=1, day=1,
-                                           hour=0, minute=0, second=0,
-                                           microsecond=0, tzinfo=pytz.UTC))
+        To also get the table suffixes and timestamps use
+        :func:`~partitions.partition_range` instead.
 
-            return years
+        :param partition: partition
+        :param start: start date
+        :param end: end date
+        :return: list of datetime
+        """
+        return list(partition_range(partition, start, end).datetimes)
 
     @staticmethod
     def _replace(statement, column, value):
@@ -293,9 +507,8 @@ class CassandraTable(CassandraBase):
             if self.has_split():
                 statement += "_{date}"
 
-            columns = \
-                ', '.join([f'{a.name} {a.cassandra_type()}' for a in self.columns])
-            primary_keys = ', '.join([pk for _, pk in base['required'].items()])
+            columns = self._schema.column_definitions
+            primary_keys = ', '.join(self._schema.queries['base'].partition_keys)
             statement += f" ( {columns}, PRIMARY KEY ( ({primary_keys})"
 
             if 'optional' in base:
@@ -416,16 +629,9 @@ class CassandraTable(CassandraBase):
 
         # Create generated columns using the predefined generators.
         generated_columns = {}
-        if 'generated_columns' in self.config:
-            for name, column in self.config['generated_columns'].items():
-                generator = getattr(Generators, name)
-
-                if ',' in column:
-                    columns = "".join(column.split()).split(',')
-                    values = [row[a] for a in columns]
-                    generated_columns[name] = generator(*values)
-                else:
-                    generated_columns[name] = generator(row[column])
+        for name, columns in self._schema.generated_columns.items():
+            generator = getattr(Generators, name)
+            generated_columns[name] = generator(*[row[a] for a in columns])
 
         json_values = json.dumps({**row, **generated_columns}, cls=UUIDEncoder)
 
@@ -444,8 +650,7 @@ class CassandraTable(CassandraBase):
                     raise ValueError("time column type not known.")
 
                 date = datetime.fromtimestamp(timestamp, tz=pytz.UTC)
-                split_date = self._calculate_table_partitions(split, date, date)[0]
-                date_str = split_date.strftime(self.TABLE_FORMAT[split])
+                date_str = partition_range(split, date, date).suffixes[0]
 
                 statement += f"_{date_str}"
             statement += f" JSON \'{json_values}\' "
@@ -485,6 +690,7 @@ class CassandraTable(CassandraBase):
 
         self._current_operation = 'query'
         self._current_query = name
+        self._missing_splits = set()
 
         keyspaces = keyspace
         if keyspaces is None:
@@ -509,8 +715,126 @@ class CassandraTable(CassandraBase):
                     .query(keyspace=keyspace) \
                     ._current_statements
 
+        self._current_statements = StatementStream(self._current_statements)
+
+        return self
+
+    def split_periods(self, periods: int = 1, now: datetime = None) -> List[datetime]:
+        """Returns the start of the current and following split periods.
+
+        :param periods: number of split periods, from the current one
+            (default: 1)
+        :param now: current date in UTC (default: None)
+            If not defined, the current date is used.
+        :return: start of each split period, or `[now]` if the table
+            has no split
+        """
+        if now is None:
+            now = datetime.now(tz=pytz.UTC)
+
+        if self.split_mode is None:
+            return [now]
+
+        split = self.config['split']
+        first = bucket(split, days_of(now))
+
+        return list(PartitionRange(split, first, first + periods - 1).datetimes)
+
+    def warm_up_statements(
+        self,
+        periods: int = 1,
+        now: datetime = None,
+        keyspace: str = None
+    ) -> List[str]:
+        """Returns the normalized insert and query statements of the
+        current and following split periods, i.e. the statements prepared
+        when executing them with auto-preparation (see
+        :attr:`~manager.CassandraManager.auto_prepare`).
+
+        Queries, including materialized views, are built with their
+        required columns in the order they are declared, each with a
+        single value.
+
+        :param periods: number of split periods, from the current one
+            (default: 1)
+        :param now: current date in UTC (default: None)
+        :param keyspace: keyspace name (default: None)
+        :return: statements with bind markers
+        """
+        keyspace_name = keyspace or self.keyspace_name
+
+        statements = []
+        for start in self.split_periods(periods, now):
+            table = CassandraTable(self.config, self._keyspace)
+
+            # Inserts only differ by their JSON row.
+            if self.has_split():
+                suffix = partition_range(self.config['split'], start, start).suffixes[0]
+                statements.append(f"INSERT INTO {keyspace_name}.{self.name}_{suffix} JSON ? ;")
+            else:
+                statements.append(f"INSERT INTO {keyspace_name}.{self.name} JSON ? ;")
+
+            for name, query in self.config['query'].items():
+                table.query(name, keyspace=keyspace_name)
+                if 'time' in query['required'] or self.split_mode is not None:
+                    table.time(start, start)
+                for kind in query['required']:
+                    if kind != 'time':
+                        getattr(table, kind)('0')
+
+                statements += [
+                    parameterized[0]
+                    for parameterized in map(parameterize, table.iter_statements())
+                    if parameterized is not None
+                ]
+
+        return list(dict.fromkeys(statements))
+
+    def plan(
+        self,
+        area: dict or List[str],
+        start: datetime = None,
+        end: datetime = None,
+        keyspace: str or List[str] = None
+    ):
+        """Query a spatial area with the cheapest query.
+
+        Every query with a `space` required column (and no `id`) is a
+        candidate, be it the base table or a materialized view.
+        The query, and thus the H3 resolution, that reads the fewest
+        partitions is chosen, and the query is built for the whole area
+        and time frame.
+        The choice can be inspected with :func:`~table.CassandraTable.explain`.
+
+        :param area: GeoJSON polygon or list of H3 identifiers
+        :param start: start date in UTC.
+            Required when the query has a time column or the table has split
+            (default: None)
+        :param end: end date in UTC (default: None)
+        :param keyspace: keyspace name.
+            This may be an str or List[str]  (default: None)
+        :return: self
+        """
+        plan = QueryPlanner(self.config).plan(area, start, end)
+
+        self.query(plan.query_name, keyspace=keyspace)
+        query = self.config['query'][plan.query_name]
+        if 'time' in query['required'] or self.split_mode is not None:
+            self.time(start, end)
+        self.space(plan.cells)
+
+        self._current_plan = plan
+
         return self
 
+    def explain(self) -> str:
+        """Returns the report of the plan chosen by
+        :func:`~table.CassandraTable.plan`."""
+        if self._current_plan is None:
+            raise ValueError("No query plan, call plan() first.")
+
+        return self._current_plan.explain()
+
     def select(self, columns: List[str]):
         """Select which columns to query.
         If not called it will load all columns.
@@ -518,14 +842,13 @@ class CassandraTable(CassandraBase):
         :param columns: list of column names to retrieve
         :return: self
         """
-        column_names = [a.name for a in self.columns]
         for column in columns:
-            if column not in column_names:
+            if column not in self._schema.by_name:
                 raise MissingColumnError(f"{column} not in table columns")
 
         cols_str = ", ".join(columns)
-        self._current_statements = [self._replace(s, 'columns', cols_str)
-                                    for s in self._current_statements]
+        self._current_statements = self._stream() \
+            .map(partial(self._replace, column='columns', value=cols_str))
 
         return self
 
@@ -550,34 +873,63 @@ class CassandraTable(CassandraBase):
             f"{prefix}{key}{sufix}"
         )
 
-    def _prepare_column_clause(self, column_name: str):
+    @staticmethod
+    def _column_clause(statement: str, column_name: str) -> str:
+        """Prepare statement to specify a required column."""
+        if '{where}' in statement:
+            prefix = "WHERE "
+        else:
+            prefix = "AND "
+        key = '{' + column_name + '}'
+        sufix = " {and}"
+
+        return CassandraTable._replace(
+            statement,
+            prefix.lower().replace(' ', ''),
+            f"{prefix}{key}{sufix}"
+        )
+
+    def _stream(self) -> StatementStream:
+        """Returns the current statements as a statement stream."""
+        if isinstance(self._current_statements, StatementStream):
+            return self._current_statements
+
+        return StatementStream(self._current_statements or ())
+
+    def _prepare_column_clause(self, column_name: str) -> StatementStream:
         """Prepare statements to specify required columns.
         This method is required because we allow the query of the whole table.
 
         :param column_name: column name to prepare for
-        :return: list of prepared statements
+        :return: stream of prepared statements
         """
-        statements = []
-        for statement in self._current_statements:
-            if '{where}' in statement:
-                prefix = "WHERE "
-            else:
-                prefix = "AND "
-            key = '{' + column_name + '}'
-            sufix = " {and}"
+        return self._stream() \
+            .map(partial(self._column_clause, column_name=column_name))
 
-            statements.append(self._replace(
-                statement,
-                prefix.lower().replace(' ', ''),
-                f"{prefix}{key}{sufix}"
-            ))
+    def _skip_missing_tables(self) -> None:
+        """Drop the statements querying tables that do not exist,
+        according to the catalog of the Cassandra manager."""
+        if self.cassandra_manager is None:
+            raise ValueError("Cassandra manager not specified.")
 
-        return statements
+        catalog = self.cassandra_manager.catalog
+        missing = self._missing_splits
+
+        def _exists(statement):
+            match = catalog.TABLE_RE.search(statement)
+            if match is None or catalog.exists(match.group(1), match.group(2)):
+                return True
+
+            missing.add(f'{match.group(1)}.{match.group(2)}')
+            return False
+
+        self._current_statements = self._stream().filter(_exists)
 
     def time(
         self,
         start: datetime, end: datetime,
-        prepare: bool = False, split_only: bool = False
+        prepare: bool = False, split_only: bool = False,
+        skip_missing: bool = False
     ):
         """Select query time frame.
 
@@ -588,75 +940,148 @@ class CassandraTable(CassandraBase):
         :param prepare: if True, will only define table name
             and (if applicable) will leave the required key as
             a named parameter (default: False)
-        :param split_only: if True, will only replace the table split
-            (default: False)
+        :param split_only: if True, will only replace the table split,
+            or the split bucket column (default: False)
+        :param skip_missing: if True, statements on split tables that do
+            not exist are dropped, and the missing tables are reported by
+            :attr:`~table.CassandraTable.missing_splits`.
+            Requires a Cassandra manager (default: False)
         :return: self
         """
 
         if self.has_split():
-            split = self.config['split']
-            split_date_list = self._calculate_table_partitions(split, start, end)
-
-            statements = []
-            for statement in self._current_statements:
-                if '{date}' in statement:
-                    for date in split_date_list:
-                        date_str = date.strftime(self.TABLE_FORMAT[split])
-                        statements.append(
-                            self._replace(statement, 'date', date_str))
-                else:
-                    statements.append(statement)
-
-            self._current_statements = statements
+            self._split_tables(partition_range(self.config['split'], start, end), skip_missing)
+        elif self.has_split_bucket() and self._current_operation == 'query':
+            self._split_buckets(partition_range(self.config['split'], start, end))
 
-        if not split_only and self._current_operation == 'query':
-            query = self.config['query'][self._current_query]
+        if split_only or self._current_operation != 'query':
+            return self
 
-            if 'time' not in query['required'] and not self.has_split():
+        query = self.config['query'][self._current_query]
+        if 'time' not in query['required']:
+            if self.split_mode is None:
                 raise NotARequiredColumnError('time', self._current_query)
-            elif 'time' in query['required']:
-                partition = query['required']['time']
+            return self
 
-                if self.has_split() and self.config['split'] == partition:
-                    return self
+        partition = query['required']['time']
+        if self.split_mode is not None and self.config['split'] == partition:
+            return self
 
-                self._current_statements = \
-                    self._prepare_column_clause(partition)
+        statements = self._prepare_column_clause(partition)
 
-                date_list = self._calculate_table_partitions(partition, start, end)
+        if prepare:
+            replacement = f"{partition}=?"
+            self._current_statements = statements.map(
+                partial(self._replace, column=partition, value=replacement)
+            )
+            return self
+
+        timestamps = partition_range(partition, start, end).timestamps
+        split_timestamps = self._split_timestamps(timestamps)
+
+        def _time_buckets(statement):
+            if split_timestamps is not None:
+                statement_timestamps = [
+                    ts
+                    for key, key_timestamps in split_timestamps.items()
+                    if key in statement
+                    for ts in key_timestamps
+                ]
+            else:
+                statement_timestamps = timestamps
 
-                statements = []
-                for statement in self._current_statements:
-                    if prepare:
-                        replacement = f"{partition}=?"
-                        s = self._replace(statement, partition, replacement)
-                        statements.append(s)
-                    else:
-                        for date in date_list:
-                            if self.has_split():
-                                split = self.config['split']
-                                date_str = \
-                                    date.strftime(self.TABLE_FORMAT[split])
-                                if f'{self.name}_{date_str}' in statement:
-                                    ts = int(date.timestamp() * 1000)
-                                    replacement = f"{partition}={ts}"
-                                    s = self._replace(
-                                        statement, partition, replacement
-                                    )
-
-                                    statements.append(s)
-                            else:
-                                ts = int(date.timestamp() * 1000)
-                                replacement = f"{partition}={ts}"
-                                s = self._replace(
-                                    statement, partition, replacement
-                                )
-
-                                statements.append(s)
-                self._current_statements = statements
+            return (
+                self._replace(statement, partition, f"{partition}={ts}")
+                for ts in statement_timestamps
+            )
+
+        self._current_statements = statements.flat_map(_time_buckets)
 
         return self
 
+    def _split_tables(self, split_range: PartitionRange, skip_missing: bool = False) -> None:
+        """Replace each statement on the split table template by a
+        statement on every split table of a time range.
+
+        :param split_range: time range of the table split
+        :param skip_missing: if True, statements on split tables that do
+            not exist are dropped (default: False)
+        """
+        split_suffixes = split_range.suffixes
+
+        if skip_missing:
+            self._record_missing_splits(split_suffixes)
+
+        def _split(statement):
+            if '{date}' not in statement:
+                return (statement,)
+
+            return (
+                self._replace(statement, 'date', date_str)
+                for date_str in split_suffixes
+            )
+
+        self._current_statements = self._stream().flat_map(_split)
+        if skip_missing:
+            self._skip_missing_tables()
+
+    def _record_missing_splits(self, split_suffixes: Iterable[str]) -> None:
+        """Add the split tables of the current statements that do not
+        exist, according to the catalog of the Cassandra manager, to the
+        missing splits."""
+        if self.cassandra_manager is None:
+            raise ValueError("Cassandra manager not specified.")
+
+        catalog = self.cassandra_manager.catalog
+        for template in self._stream().source:
+            match = self.SPLIT_TABLE_RE.search(template)
+            if match is None:
+                continue
+
+            keyspace_name, prefix, suffix = match.groups()
+            for date_str in split_suffixes:
+                table_name = f'{prefix}{date_str}{suffix}'
+                if not catalog.exists(keyspace_name, table_name):
+                    self._missing_splits.add(f'{keyspace_name}.{table_name}')
+
+    def _split_buckets(self, split_range: PartitionRange) -> None:
+        """Replace each query statement by a statement on every split
+        bucket of a time range."""
+        split = self.config['split']
+        bucket_timestamps = split_range.timestamps
+
+        def _split(statement):
+            statement = self._column_clause(statement, split)
+
+            return (
+                self._replace(statement, split, f"{split}={ts}")
+                for ts in bucket_timestamps
+            )
+
+        self._current_statements = self._stream().flat_map(_split)
+
+    def _split_timestamps(self, timestamps: List[int]) -> Optional[Dict[str, List[int]]]:
+        """Group time buckets by the split table, or split bucket clause,
+        holding them.
+
+        :param timestamps: time bucket timestamps
+        :return: mapping from table name, or split bucket clause, to the
+            timestamps it holds, or None if the table has no split
+        """
+        if self.split_mode is None:
+            return None
+
+        split = self.config['split']
+        split_timestamps = {}
+        for ts in timestamps:
+            if self.has_split():
+                key = f'{self.name}_{partition_suffix(split, days_of(ts))}'
+            else:
+                key = f'{split}={partition_timestamp(split, days_of(ts))} '
+            split_timestamps.setdefault(key, []).append(ts)
+
+        return split_timestamps
+
     def space(self, identifier: str or List[str] = None):
         """Select query spacial region.
 
@@ -704,7 +1129,7 @@ class CassandraTable(CassandraBase):
 
         statements = self._prepare_column_clause(level)
         self._current_statements = \
-            [self._replace(s, level, replacement) for s in statements]
+            statements.map(partial(self._replace, column=level, value=replacement))
 
         logger = logging.getLogger()
         if logger.level == logging.DEBUG:
@@ -746,7 +1171,7 @@ class CassandraTable(CassandraBase):
 
         statements = self._prepare_column_clause(name)
         self._current_statements = \
-            [self._replace(s, name, replacement) for s in statements]
+            statements.map(partial(self._replace, column=name, value=replacement))
 
         return self
 
@@ -769,7 +1194,7 @@ class CassandraTable(CassandraBase):
 
         statements = self._prepare_column_clause(column)
         self._current_statements = \
-            [self._replace(s, column, replacement) for s in statements]
+            statements.map(partial(self._replace, column=column, value=replacement))
 
         return self
 
@@ -793,13 +1218,14 @@ class CassandraTable(CassandraBase):
 
         statements = self._prepare_column_clause(column)
         self._current_statements = \
-            [self._replace(s, column, replacement) for s in statements]
+            statements.map(partial(self._replace, column=column, value=replacement))
 
         return self
 
     def between(
         self, column: str,
-        lower: int or float = None, higher: int or float = None
+        lower: int or float = None, higher: int or float = None,
+        skip_missing: bool = False
     ):
         """Select range of values to query on a specified column.
 
@@ -812,6 +1238,10 @@ class CassandraTable(CassandraBase):
         :param column: column name
         :param lower: lower boundary
         :param higher: higher boundary
+        :param skip_missing: if True, statements on split tables that do
+            not exist are dropped, and the missing tables are reported by
+            :attr:`~table.CassandraTable.missing_splits`.
+            Requires a Cassandra manager (default: False)
         :return: self
         """
         if lower is None:
@@ -827,22 +1257,14 @@ class CassandraTable(CassandraBase):
         if self.has_split() and column in ['day', 'month', 'year']:
             split = self.config.get('split')
 
-            lower_datetime = datetime.fromtimestamp(lower / 1000, tz=pytz.UTC)
-            higher_datetime = datetime.fromtimestamp(higher / 1000, tz=pytz.UTC)
+            lower = int(lower)
+            higher = int(higher)
+            split_suffixes = partition_range(split, lower, higher).suffixes
+            lower_split = partition_suffix(split, days_of(lower))
+            higher_split = partition_suffix(split, days_of(higher))
 
-            date_list = self._calculate_table_partitions(
-                self.config['split'], lower_datetime, higher_datetime
-            )
-
-            statements = []
-            for statement in self._current_statements:
-                lower_split = \
-                    lower_datetime.strftime(self.TABLE_FORMAT[split])
-                higher_split = \
-                    higher_datetime.strftime(self.TABLE_FORMAT[split])
-
-                for date in date_list:
-                    date_str = date.strftime(self.TABLE_FORMAT[split])
+            def _split_bounds(statement):
+                for date_str in split_suffixes:
                     if f'_{date_str}' in statement:
                         if lower_split == date_str:
                             s = self._prepare_column_clause_single(
@@ -858,20 +1280,23 @@ class CassandraTable(CassandraBase):
                             statement = \
                                 self._replace(s, column, replacement_higher)
 
-                statements.append(statement)
+                return statement
 
-            self._current_statements = statements
+            self._current_statements = self._stream().map(_split_bounds)
+            if skip_missing:
+                self._skip_missing_tables()
         else:
             replacement = f"{replacement_lower} AND {replacement_higher}"
             statements = self._prepare_column_clause(column)
             self._current_statements = \
-                [self._replace(s, column, replacement) for s in statements]
+                statements.map(partial(self._replace, column=column, value=replacement))
 
         return self
 
     def between_including(
         self, column: str,
-        lower: int or float = None, higher: int or float = None
+        lower: int or float = None, higher: int or float = None,
+        skip_missing: bool = False
     ):
         """Select range of values to query on a specified column
         including the boundary.
@@ -885,6 +1310,10 @@ class CassandraTable(CassandraBase):
         :param column: column name
         :param lower: lower boundary
         :param higher: higher boundary
+        :param skip_missing: if True, statements on split tables that do
+            not exist are dropped, and the missing tables are reported by
+            :attr:`~table.CassandraTable.missing_splits`.
+            Requires a Cassandra manager (default: False)
         :return: self
         """
         if lower is None:
@@ -900,22 +1329,14 @@ class CassandraTable(CassandraBase):
         if self.has_split() and column in ['day', 'month', 'year']:
             split = self.config.get('split')
 
-            lower_datetime = datetime.fromtimestamp(lower / 1000, tz=pytz.UTC)
-            higher_datetime = datetime.fromtimestamp(higher / 1000, tz=pytz.UTC)
-
-            date_list = self._calculate_table_partitions(
-                self.config['split'], lower_datetime, higher_datetime
-            )
+            lower = int(lower)
+            higher = int(higher)
+            split_suffixes = partition_range(split, lower, higher).suffixes
+            lower_split = partition_suffix(split, days_of(lower))
+            higher_split = partition_suffix(split, days_of(higher))
 
-            statements = []
-            for statement in self._current_statements:
-                lower_split = \
-                    lower_datetime.strftime(self.TABLE_FORMAT[split])
-                higher_split = \
-                    higher_datetime.strftime(self.TABLE_FORMAT[split])
-
-                for date in date_list:
-                    date_str = date.strftime(self.TABLE_FORMAT[split])
+            def _split_bounds(statement):
+                for date_str in split_suffixes:
                     if f'_{date_str}' in statement:
                         if lower_split == date_str:
                             s = self._prepare_column_clause_single(
@@ -931,14 +1352,16 @@ class CassandraTable(CassandraBase):
                             statement = \
                                 self._replace(s, column, replacement_higher)
 
-                statements.append(statement)
+                return statement
 
-            self._current_statements = statements
+            self._current_statements = self._stream().map(_split_bounds)
+            if skip_missing:
+                self._skip_missing_tables()
         else:
             replacement = f"{replacement_lower} AND {replacement_higher}"
             statements = self._prepare_column_clause(column)
             self._current_statements = \
-                [self._replace(s, column, replacement) for s in statements]
+                statements.map(partial(self._replace, column=column, value=replacement))
 
         return self
 
@@ -961,7 +1384,7 @@ class CassandraTable(CassandraBase):
 
         statements = self._prepare_column_clause(column)
         self._current_statements = \
-            [self._replace(s, column, replacement) for s in statements]
+            statements.map(partial(self._replace, column=column, value=replacement))
 
         return self
 
@@ -984,7 +1407,7 @@ class CassandraTable(CassandraBase):
 
         statements = self._prepare_column_clause(column)
         self._current_statements = \
-            [self._replace(s, column, replacement) for s in statements]
+            statements.map(partial(self._replace, column=column, value=replacement))
 
         return self
 
@@ -1007,7 +1430,7 @@ class CassandraTable(CassandraBase):
 
         statements = self._prepare_column_clause(column)
         self._current_statements = \
-            [self._replace(s, column, replacement) for s in statements]
+            statements.map(partial(self._replace, column=column, value=replacement))
 
         return self
 
@@ -1030,7 +1453,7 @@ class CassandraTable(CassandraBase):
 
         statements = self._prepare_column_clause(column)
         self._current_statements = \
-            [self._replace(s, column, replacement) for s in statements]
+            statements.map(partial(self._replace, column=column, value=replacement))
 
         return self
 
@@ -1041,8 +1464,8 @@ class CassandraTable(CassandraBase):
         :return: self
         """
         replacement = f"LIMIT {value}"
-        self._current_statements = [self._replace(s, 'limit', replacement)
-                                    for s in self._current_statements]
+        self._current_statements = self._stream() \
+            .map(partial(self._replace, column='limit', value=replacement))
 
         return self
 
@@ -1075,6 +1498,9 @@ class CassandraMaterializedView(CassandraTable):
 
         self._query_name = query_name
 
+    def _label_query(self) -> str:
+        return self.query_name
+
     def create(
         self,
         keyspace: str or List[str] = None,
@@ -1118,7 +1544,8 @@ class CassandraMaterializedView(CassandraTable):
             if self.has_split():
                 statement += "_{date}"
 
-            required_keys = list(query['required'].values())
+            partition_keys = self._schema.queries[self.query_name].partition_keys
+            required_keys = list(partition_keys)
             if 'optional' in query:
                 required_keys += query['optional']
 
@@ -1129,7 +1556,7 @@ class CassandraMaterializedView(CassandraTable):
                 else:
                     statement += f"AND {key} IS NOT NULL "
 
-            primary_keys = ', '.join([pk for _, pk in query['required'].items()])
+            primary_keys = ', '.join(partition_keys)
             statement += f"PRIMARY KEY ( ({primary_keys})"
 
             if 'optional' in query:
@@ -1209,6 +1636,7 @@ class CassandraMaterializedView(CassandraTable):
         """
         self._current_operation = 'query'
         self._current_query = self.query_name
+        self._missing_splits = set()
 
         keyspaces = keyspace
         if keyspaces is None:
@@ -1230,4 +1658,6 @@ class CassandraMaterializedView(CassandraTable):
             )
             self._current_statements.append(statement)
 
+        self._current_statements = StatementStream(self._current_statements)
+
         return self
@@ -0,0 +1,316 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from pydantic import validate_model
+
+from primeight.column import CassandraColumn
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class ValidationReport:
+    """Result of validating a batch of rows.
+
+    Rejections are kept as compact `(row index, column, reason)` tuples.
+
+    """
+
+    UNKNOWN_COLUMN = 'unknown column'
+    INVALID_TYPE = 'invalid type'
+    BELOW_MIN = 'below min'
+    ABOVE_MAX = 'above max'
+
+    @property
+    def accepted(self) -> List[Dict[str, Any]]:
+        """Returns the accepted rows."""
+        return self._accepted
+
+    @property
+    def rejected(self) -> List[Tuple[int, str, str]]:
+        """Returns the rejections."""
+        return self._rejected
+
+    @property
+    def rejected_rows(self) -> List[int]:
+        """Returns the sorted indexes of the rejected rows."""
+        return sorted({index for index, _, _ in self._rejected})
+
+    @property
+    def counts(self) -> Dict[Tuple[str, str], int]:
+        """Returns the number of rejections by column and reason."""
+        counts = {}
+        for _, column, reason in self._rejected:
+            key = (column, reason)
+            counts[key] = counts.get(key, 0) + 1
+
+        return counts
+
+    def __init__(self):
+        """Validation report constructor."""
+        self._accepted = []
+        self._rejected = []
+
+    def __repr__(self):
+        return (
+            f"ValidationReport(accepted={len(self._accepted)}, "
+            f"rejected={len(self.rejected_rows)})"
+        )
+
+
+class RowValidator:
+    """Validates rows against the column types and min/max bounds
+    of a table schema.
+
+    """
+
+    @property
+    def model(self):
+        """Returns the Pydantic model used to coerce rows."""
+        return self._model
+
+    def __init__(self, model, columns: Iterable[CassandraColumn]):
+        """Row validator constructor.
+
+        :param model: Pydantic model of the table columns
+        :param columns: table columns
+        """
+        self._model = model
+
+        self._types = {}
+        self._bounds = []
+        for col in columns:
+            self._types[col.name] = self.python_type(col.type)
+            if col.min_value is not None or col.max_value is not None:
+                self._bounds.append((col.name, col.min_value, col.max_value))
+
+    @staticmethod
+    def python_type(handle: str) -> type or Tuple[type, ...]:
+        """Returns the Python type(s) accepted without coercion
+        for a column type handle."""
+        handle = handle.lower().replace(' ', '')
+        if handle.startswith('list') or handle.startswith('tuple'):
+            return list, tuple
+        elif handle.startswith('set'):
+            return set, frozenset, list, tuple
+        elif handle.startswith('map'):
+            return dict
+
+        python_type = CassandraColumn.HANDLE_TO_TYPE[handle]
+        if python_type is float:
+            return float, int
+
+        return python_type
+
+    def _check_bounds(self, index: int, row: dict, report: ValidationReport) -> bool:
+        valid = True
+        for name, col_min, col_max in self._bounds:
+            value = row.get(name)
+            if value is None:
+                continue
+
+            if col_max is not None and value > col_max:
+                report.rejected.append((index, name, ValidationReport.ABOVE_MAX))
+                valid = False
+            elif col_min is not None and value < col_min:
+                report.rejected.append((index, name, ValidationReport.BELOW_MIN))
+                valid = False
+
+        return valid
+
+    def _check_types(self, index: int, row: dict, report: ValidationReport) -> bool:
+        valid = True
+        for name, value in row.items():
+            expected = self._types.get(name)
+            if expected is None:
+                report.rejected.append((index, name, ValidationReport.UNKNOWN_COLUMN))
+                valid = False
+            elif value is not None and (
+                not isinstance(value, expected)
+                # bool is a subclass of int, but not a valid number.
+                or (type(value) is bool and expected is not bool)
+            ):
+                report.rejected.append((index, name, ValidationReport.INVALID_TYPE))
+                valid = False
+
+        return valid
+
+    def _coerce(
+        self, index: int, row: dict, report: ValidationReport
+    ) -> Optional[dict]:
+        unknown = [name for name in row if name not in self._types]
+        for name in unknown:
+            report.rejected.append((index, name, ValidationReport.UNKNOWN_COLUMN))
+
+        values, fields_set, errors = validate_model(self._model, row)
+        if errors is not None:
+            for error in errors.errors():
+                report.rejected.append(
+                    (index, str(error['loc'][0]), ValidationReport.INVALID_TYPE)
+                )
+            return None
+
+        if len(unknown) > 0:
+            return None
+
+        # Only keep the columns that were set, since inserting a None value
+        # deletes the column in Cassandra.
+        return {name: values[name] for name in row if name in fields_set}
+
+    def validate_many(
+        self, rows: Iterable[Dict[str, Any]], coerce: bool = True
+    ) -> ValidationReport:
+        """Validate a batch of rows.
+
+        :param rows: rows to validate
+        :param coerce: if True, values are coerced to the column types by
+            Pydantic. If False, values must already have the column types,
+            which is much faster and suited to trusted producers.
+            (default: True)
+        :return: validation report
+        """
+        report = ValidationReport()
+        for index, row in enumerate(rows):
+            if coerce:
+                row = self._coerce(index, row, report)
+                if row is None:
+                    continue
+            elif not self._check_types(index, row, report):
+                continue
+
+            if self._check_bounds(index, row, report):
+                report.accepted.append(row)
+
+        return report
+
+
+class BatchValidator:
+    """Vectorized validator for ingest batches.
+
+    A batch is turned into one NumPy array per column and all the declared
+    min/max values, and the null constraints of the primary key columns,
+    are checked in a single pass per column.
+    Requires `numpy`.
+
+    """
+
+    VALID = 0
+    NULL_KEY = 1
+    NOT_A_NUMBER = 2
+    BELOW_MIN = 3
+    ABOVE_MAX = 4
+
+    REASONS = {
+        VALID: 'valid',
+        NULL_KEY: 'null key',
+        NOT_A_NUMBER: 'not a number',
+        BELOW_MIN: 'below min',
+        ABOVE_MAX: 'above max'
+    }
+
+    @property
+    def key_columns(self) -> Tuple[str, ...]:
+        """Returns the columns that can not be null."""
+        return self._key_columns
+
+    @property
+    def bounds(self) -> List[Tuple[str, Optional[float], Optional[float]]]:
+        """Returns the (column, min, max) bounds checked."""
+        return self._bounds
+
+    def __init__(
+        self,
+        columns: Iterable[CassandraColumn],
+        key_columns: Iterable[str] = ()
+    ):
+        """Batch validator constructor.
+
+        :param columns: table columns
+        :param key_columns: columns that can not be null (default: ())
+        """
+        if np is None:
+            raise ImportError("BatchValidator requires numpy to be installed.")
+
+        self._key_columns = tuple(key_columns)
+        self._bounds = [
+            (col.name, col.min_value, col.max_value) for col in columns
+            if col.min_value is not None or col.max_value is not None
+        ]
+
+    @staticmethod
+    def _numbers(values: Sequence[Any]) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Returns the values as float64, with NaN for nulls,
+        and the mask of values that are not numbers."""
+        n = len(values)
+        try:
+            numbers = np.fromiter(
+                (np.nan if v is None else v for v in values), np.float64, count=n
+            )
+            return numbers, np.zeros(n, dtype=bool)
+        except (TypeError, ValueError):
+            pass
+
+        numbers = np.full(n, np.nan)
+        invalid = np.zeros(n, dtype=bool)
+        for i, v in enumerate(values):
+            if v is None:
+                continue
+            try:
+                numbers[i] = v
+            except (TypeError, ValueError):
+                invalid[i] = True
+
+        return numbers, invalid
+
+    def validate(
+        self, rows: Sequence[Dict[str, Any]] or Mapping[str, Sequence[Any]]
+    ) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Validate a batch of rows.
+
+        :param rows: list of rows, or mapping of column name to column values
+        :return: boolean mask of valid rows, and the reason code of
+            each row (see :attr:`~validation.BatchValidator.REASONS`).
+            When a row fails several checks, the first failing column in
+            table order is reported, key columns first.
+        """
+        if isinstance(rows, Mapping):
+            n = len(next(iter(rows.values()), ()))
+
+            def column(name):
+                values = rows.get(name)
+                return [None] * n if values is None else values
+        else:
+            n = len(rows)
+
+            def column(name):
+                return [row.get(name) for row in rows]
+
+        reasons = np.zeros(n, dtype=np.uint8)
+
+        def flag(condition, reason):
+            reasons[(reasons == self.VALID) & condition] = reason
+
+        for name in self._key_columns:
+            values = column(name)
+            if isinstance(values, np.ndarray) and values.dtype.kind != 'O':
+                nulls = np.isnan(values) if values.dtype.kind == 'f' \
+                    else np.zeros(n, dtype=bool)
+            else:
+                nulls = np.fromiter((v is None for v in values), bool, count=n)
+            flag(nulls, self.NULL_KEY)
+
+        for name, col_min, col_max in self._bounds:
+            values = column(name)
+            if isinstance(values, np.ndarray) and values.dtype.kind in 'iuf':
+                numbers = values
+            else:
+                numbers, invalid = self._numbers(values)
+                flag(invalid, self.NOT_A_NUMBER)
+
+            if col_min is not None:
+                flag(numbers < col_min, self.BELOW_MIN)
+            if col_max is not None:
+                flag(numbers > col_max, self.ABOVE_MAX)
+
+        return reasons == self.VALID, reasons
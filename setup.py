@@ -18,6 +18,10 @@ setup(
     long_description_content_type="text/markdown",
     packages=['primeight', 'primeight.parser'],
     install_requires=requires,
+    extras_require={
+        'numpy': ['numpy>=1.17.0'],
+        'pandas': ['numpy>=1.17.0', 'pandas>=2.0'],
+    },
     license='Apache License 2.0',
     python_requires='>=3.7',
     classifiers=[
@@ -140,6 +140,53 @@ class ParserTestCase(unittest.TestCase):
         with self.assertRaises(SyntaxError):
             Parser.is_valid_config(self._config)
 
+    def test_is_valid_config_split_mode(self):
+        self._config['split_mode'] = 'bucket'
+        with self.assertRaises(SyntaxError):
+            Parser.is_valid_config(self._config)
+
+        self._config['split'] = 'day'
+        self._config['query'] = {'base': self._config['query']['base']}
+        with self.assertRaises(SyntaxError):
+            Parser.is_valid_config(self._config)
+
+        self._config['query']['base']['optional'] = ['arrival_time']
+        Parser.is_valid_config(self._config)
+
+        self._config['split_mode'] = 'random'
+        with self.assertRaises(SyntaxError):
+            Parser.is_valid_config(self._config)
+
+    def test_is_valid_config_intern_not_a_boolean(self):
+        self._config['columns']['user_id']['intern'] = 'yes'
+        with self.assertRaises(SyntaxError):
+            Parser.is_valid_config(self._config)
+
+        self._config['columns']['user_id']['intern'] = True
+        Parser.is_valid_config(self._config)
+
+    def test_is_valid_config_query_execution_options(self):
+        self._config['query']['arrival_day'].update({
+            'consistency': 'local_quorum',
+            'timeout': 60,
+            'fetch_size': 5000,
+            'profile': 'analytics'
+        })
+        Parser.is_valid_config(self._config)
+
+        for field, value in [
+            ('consistency', 'random'),
+            ('timeout', 0),
+            ('timeout', '10s'),
+            ('fetch_size', 1.5),
+            ('fetch_size', -1),
+            ('profile', '')
+        ]:
+            query = {**self._config['query']['arrival_day'], field: value}
+            config = {**self._config, 'query': {**self._config['query'], 'arrival_day': query}}
+            with self.assertRaises(SyntaxError):
+                Parser.is_valid_config(config)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import patch
 
 from primeight.parser.yaml_parser import YamlParser, yaml, Path
+from primeight.schema import TableConfig
 
 
 class YamlParserTestCase(unittest.TestCase):
@@ -40,6 +41,7 @@ class YamlParserTestCase(unittest.TestCase):
                 patch.object(yaml, 'safe_load', return_value=self._config):
             config = YamlParser.parse('test.yaml')
         self.assertEqual(self._config, config)
+        self.assertIsInstance(config, TableConfig)
 
     def test_parse_raise_marked_yaml_error(self):
         with patch.object(Path, 'is_dir', return_value=False), \
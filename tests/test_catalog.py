@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from primeight.catalog import MetadataCatalog, TableCatalog
+
+
+class TableCatalogTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.loader = MagicMock(return_value=['mock_table_01_2019', 'mock_table_02_2019'])
+
+    def test_tables_are_cached(self) -> None:
+        catalog = TableCatalog(self.loader)
+
+        self.assertTrue(catalog.exists('mock_keyspace', 'mock_table_01_2019'))
+        self.assertFalse(catalog.exists('mock_keyspace', 'mock_table_03_2019'))
+        self.loader.assert_called_once_with('mock_keyspace')
+
+    def test_tables_expire(self) -> None:
+        catalog = TableCatalog(self.loader, ttl=10)
+
+        with patch('primeight.catalog.time.monotonic', side_effect=[0, 5, 20]):
+            catalog.tables('mock_keyspace')
+            catalog.tables('mock_keyspace')
+            self.assertEqual(1, self.loader.call_count)
+            catalog.tables('mock_keyspace')
+            self.assertEqual(2, self.loader.call_count)
+
+    def test_invalidate(self) -> None:
+        catalog = TableCatalog(self.loader, ttl=None)
+
+        catalog.tables('mock_keyspace')
+        catalog.invalidate('other_keyspace')
+        catalog.tables('mock_keyspace')
+        self.assertEqual(1, self.loader.call_count)
+
+        catalog.invalidate()
+        catalog.tables('mock_keyspace')
+        self.assertEqual(2, self.loader.call_count)
+
+    def test_statement_exists(self) -> None:
+        catalog = TableCatalog(self.loader)
+
+        self.assertTrue(catalog.statement_exists(
+            "SELECT * FROM mock_keyspace.mock_table_01_2019 WHERE day=1 ;"
+        ))
+        self.assertFalse(catalog.statement_exists(
+            "SELECT * FROM mock_keyspace.mock_table_03_2019 WHERE day=1 ;"
+        ))
+        self.assertTrue(catalog.statement_exists("INSERT INTO mock_keyspace.t JSON '{}' ;"))
+
+
+class MetadataCatalogTestCase(unittest.TestCase):
+
+    def test_tables_are_not_cached(self) -> None:
+        keyspace_metadata = MagicMock()
+        keyspace_metadata.tables = {'mock_table_01_2019': None}
+        keyspace_metadata.views = {}
+        keyspaces = {'mock_keyspace': keyspace_metadata}
+        catalog = MetadataCatalog(keyspaces.get)
+
+        self.assertFalse(catalog.exists('mock_keyspace', 'mock_table_02_2019'))
+
+        # Tables created by other clients are seen as soon as the driver
+        # metadata is refreshed.
+        keyspace_metadata.tables['mock_table_02_2019'] = None
+        self.assertTrue(catalog.exists('mock_keyspace', 'mock_table_02_2019'))
+        self.assertEqual(
+            {'mock_table_01_2019', 'mock_table_02_2019'}, catalog.tables('mock_keyspace')
+        )
+        self.assertFalse(catalog.exists('other_keyspace', 'mock_table_01_2019'))
+        self.assertEqual(frozenset(), catalog.tables('other_keyspace'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,400 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from cassandra import OperationTimedOut, InvalidRequest
+from cassandra.cluster import ExecutionProfile, EXEC_PROFILE_DEFAULT
+from cassandra.query import SimpleStatement
+
+from primeight.concurrency import \
+    AIMDLimiter, ConcurrentExecutor, Deadline, ExecutionResult, StatementResult
+from primeight.exceptions import DeadlineExceeded, QueryCancelled
+
+
+class MockFuture:
+
+    def __init__(self, pages, error=None):
+        self._pages = list(pages)
+        self._error = error
+
+    @property
+    def has_more_pages(self):
+        return len(self._pages) > 0
+
+    def add_callbacks(self, callback, errback):
+        self._callback = callback
+        if self._error is not None:
+            errback(self._error)
+        else:
+            self._result = self._pages.pop(0)
+            callback(self._result)
+
+    def start_fetching_next_page(self):
+        self._callback(self._pages.pop(0))
+
+    def result(self):
+        return self._result
+
+
+class PendingFuture:
+    """Response future of a request that never completes."""
+
+    has_more_pages = False
+
+    def add_callbacks(self, callback, errback):
+        pass
+
+
+class AIMDLimiterTestCase(unittest.TestCase):
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            AIMDLimiter(initial_limit=0)
+        with self.assertRaises(ValueError):
+            AIMDLimiter(decrease=1.5)
+
+    def test_additive_increase(self) -> None:
+        limiter = AIMDLimiter(initial_limit=4, latency_tolerance=None)
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(0.01)
+
+        self.assertEqual(5, limiter.limit)
+        self.assertEqual(0, limiter.in_flight)
+        self.assertEqual(0.01, limiter.min_latency)
+
+    def test_multiplicative_decrease(self) -> None:
+        limiter = AIMDLimiter(initial_limit=32, min_limit=10)
+
+        with patch('primeight.concurrency.time.monotonic', side_effect=[10, 10, 20]):
+            limiter.acquire()
+            limiter.release(0.01, OperationTimedOut('mock'))
+            self.assertEqual(16, limiter.limit)
+
+            # A burst of errors within a round trip decreases the limit once.
+            limiter.acquire()
+            limiter.release(0.01, OperationTimedOut('mock'))
+            self.assertEqual(16, limiter.limit)
+
+            limiter.acquire()
+            limiter.release(0.01, OperationTimedOut('mock'))
+            self.assertEqual(10, limiter.limit)
+
+    def test_errors_other_than_overload(self) -> None:
+        limiter = AIMDLimiter(initial_limit=4)
+        limiter.acquire()
+        limiter.release(0.01, InvalidRequest('mock'))
+
+        self.assertEqual(4, limiter.limit)
+
+    def test_latency_congestion(self) -> None:
+        limiter = AIMDLimiter(initial_limit=8, latency_tolerance=2.0)
+        limiter.acquire()
+        limiter.release(0.01)
+        self.assertFalse(limiter.is_congestion(0.015))
+        self.assertTrue(limiter.is_congestion(0.05))
+
+        limiter.acquire()
+        limiter.release(0.05)
+        self.assertEqual(4, limiter.limit)
+
+    def test_acquire_blocks(self) -> None:
+        limiter = AIMDLimiter(initial_limit=1)
+        limiter.acquire()
+
+        acquired = threading.Event()
+
+        def _acquire():
+            limiter.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=_acquire)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+
+        limiter.release(0.01)
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+
+
+class ConcurrentExecutorTestCase(unittest.TestCase):
+
+    def test_execute(self) -> None:
+        session = MagicMock()
+        session.execute_async = MagicMock(side_effect=[
+            MockFuture([[1, 2], [3]]),
+            MockFuture([], error=InvalidRequest('mock')),
+            MockFuture([[4]])
+        ])
+        limiter = AIMDLimiter(initial_limit=2)
+
+        results = ConcurrentExecutor(session, limiter) \
+            .execute(iter(['s1', 's2', 's3']), execution_profile='mock_profile')
+
+        self.assertTrue(results[0].success)
+        self.assertEqual([1, 2, 3], results[0].rows)
+        self.assertFalse(results[1].success)
+        self.assertIsInstance(results[1].error, InvalidRequest)
+        self.assertEqual(0, results[1].retries)
+        self.assertEqual([4], results[2].rows)
+        self.assertIsNotNone(results[2].latency)
+        session.execute_async.assert_called_with('s3', execution_profile='mock_profile')
+        self.assertEqual(0, limiter.in_flight)
+
+    def test_execute_raise_on_first_error(self) -> None:
+        session = MagicMock()
+        session.execute_async = MagicMock(side_effect=[
+            MockFuture([], error=InvalidRequest('mock')),
+            MockFuture([[1]])
+        ])
+
+        with self.assertRaises(InvalidRequest):
+            ConcurrentExecutor(session).execute(['s1', 's2'], raise_on_first_error=True)
+        session.execute_async.assert_called_once_with('s1')
+
+    def test_execute_sync_error(self) -> None:
+        session = MagicMock()
+        session.execute_async = MagicMock(side_effect=InvalidRequest('mock'))
+        limiter = AIMDLimiter()
+
+        results = ConcurrentExecutor(session, limiter).execute(['s1'])
+
+        self.assertFalse(results[0].success)
+        self.assertEqual(0, limiter.in_flight)
+
+    def test_execute_statement_profiles(self) -> None:
+        session = MagicMock()
+        session.execute_async = MagicMock(side_effect=[MockFuture([[1]]), MockFuture([[2]])])
+
+        ConcurrentExecutor(session).execute(
+            [('s1', 'mock_profile'), 's2'], execution_profile='default_profile'
+        )
+
+        session.execute_async.assert_any_call('s1', execution_profile='mock_profile')
+        session.execute_async.assert_any_call('s2', execution_profile='default_profile')
+
+    def test_execute_retry(self) -> None:
+        session = MagicMock()
+        session.execute_async = MagicMock(side_effect=[
+            MockFuture([], error=OperationTimedOut('mock')),
+            MockFuture([], error=OperationTimedOut('mock')),
+            MockFuture([[1]])
+        ])
+        limiter = AIMDLimiter()
+
+        results = ConcurrentExecutor(session, limiter, max_retries=2, backoff=0) \
+            .execute(['SELECT * FROM k.t'])
+
+        self.assertTrue(results[0].success)
+        self.assertEqual([1], results[0].rows)
+        self.assertIsNone(results[0].error)
+        self.assertEqual(2, results[0].retries)
+        self.assertEqual(3, session.execute_async.call_count)
+        self.assertEqual(0, limiter.in_flight)
+
+    def test_execute_retry_exhausted(self) -> None:
+        session = MagicMock()
+        session.execute_async = MagicMock(
+            side_effect=lambda *args, **kwargs: MockFuture([], error=OperationTimedOut('mock'))
+        )
+
+        results = ConcurrentExecutor(session, max_retries=2, backoff=0) \
+            .execute(['SELECT * FROM k.t'])
+
+        self.assertFalse(results[0].success)
+        self.assertIsInstance(results[0].error, OperationTimedOut)
+        self.assertEqual(2, results[0].retries)
+
+    def test_execute_retry_budget(self) -> None:
+        session = MagicMock()
+        session.execute_async = MagicMock(
+            side_effect=lambda *args, **kwargs: MockFuture([], error=OperationTimedOut('mock'))
+        )
+
+        results = ConcurrentExecutor(session, max_retries=5, backoff=0, retry_budget=3) \
+            .execute(['SELECT 1', 'SELECT 2'])
+
+        self.assertEqual(3, sum(result.retries for result in results))
+        self.assertEqual(5, session.execute_async.call_count)
+
+    def test_is_retryable(self) -> None:
+        executor = ConcurrentExecutor(MagicMock())
+
+        def _result(statement, error):
+            result = StatementResult(statement)
+            result.error = error
+            return result
+
+        self.assertTrue(executor.is_retryable(_result('SELECT 1', OperationTimedOut())))
+        self.assertFalse(executor.is_retryable(_result('SELECT 1', InvalidRequest())))
+        self.assertFalse(executor.is_retryable(_result('INSERT INTO k.t', OperationTimedOut())))
+        self.assertTrue(executor.is_retryable(
+            _result(SimpleStatement('INSERT INTO k.t', is_idempotent=True), OperationTimedOut())
+        ))
+        self.assertFalse(executor.is_retryable(
+            _result(SimpleStatement('SELECT 1'), OperationTimedOut())
+        ))
+
+    def test_backoff(self) -> None:
+        executor = ConcurrentExecutor(MagicMock(), backoff=0.1, max_backoff=0.3)
+
+        for retry in range(5):
+            self.assertLessEqual(executor.backoff(retry), min(0.3, 0.1 * 2 ** retry))
+
+
+class DeadlineTestCase(unittest.TestCase):
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            Deadline(-1)
+
+    def test_of(self) -> None:
+        deadline = Deadline(1)
+        self.assertIs(deadline, Deadline.of(deadline))
+        self.assertIsNone(Deadline.of(None))
+        self.assertEqual(2.5, Deadline.of(2.5).timeout)
+
+    def test_remaining(self) -> None:
+        self.assertIsNone(Deadline().remaining())
+        self.assertLessEqual(Deadline(10).remaining(), 10)
+        self.assertEqual(0, Deadline(0).remaining())
+
+        Deadline(10).check()
+        self.assertTrue(Deadline(0).expired)
+        with self.assertRaises(DeadlineExceeded):
+            Deadline(0).check()
+
+    def test_cancel(self) -> None:
+        deadline = Deadline()
+        errors = []
+        deadline.add_callback(errors.append)
+        deadline.add_callback(errors.append)
+        deadline.remove_callback(errors.append)
+
+        deadline.cancel()
+        deadline.cancel()
+        self.assertTrue(deadline.cancelled)
+        self.assertEqual(1, len(errors))
+        self.assertIsInstance(errors[0], QueryCancelled)
+        with self.assertRaises(QueryCancelled):
+            deadline.check()
+
+        # Callbacks added after cancellation are called at once.
+        deadline.add_callback(errors.append)
+        self.assertEqual(2, len(errors))
+
+    def test_request_timeout(self) -> None:
+        session = MagicMock()
+        session.get_execution_profile = MagicMock(return_value=ExecutionProfile(request_timeout=1.0))
+
+        self.assertIsNone(Deadline().request_timeout(session))
+        self.assertEqual(1.0, Deadline(60).request_timeout(session))
+        session.get_execution_profile.assert_called_with(EXEC_PROFILE_DEFAULT)
+        self.assertLessEqual(
+            Deadline(0.5).request_timeout(session, ExecutionProfile(request_timeout=None)), 0.5
+        )
+
+    def test_wait(self) -> None:
+        self.assertEqual([1], Deadline(10).wait(MockFuture([[1]])))
+
+        with self.assertRaises(DeadlineExceeded):
+            Deadline(0.01).wait(PendingFuture())
+
+        deadline = Deadline()
+        threading.Timer(0.01, deadline.cancel).start()
+        with self.assertRaises(QueryCancelled):
+            deadline.wait(PendingFuture())
+
+
+class ConcurrentExecutorDeadlineTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.session = MagicMock()
+        self.session.get_execution_profile = MagicMock(
+            return_value=ExecutionProfile(request_timeout=10.0)
+        )
+
+    def test_request_timeout(self) -> None:
+        self.session.execute_async = MagicMock(return_value=MockFuture([[1]]))
+
+        results = ConcurrentExecutor(self.session).execute(['s1'], deadline=Deadline(5))
+
+        self.assertTrue(results[0].success)
+        _, kwargs = self.session.execute_async.call_args
+        self.assertLessEqual(kwargs['timeout'], 5)
+
+    def test_expires_between_pages(self) -> None:
+        future = MockFuture([[1], [2]])
+        future.start_fetching_next_page = MagicMock()
+        self.session.execute_async = MagicMock(return_value=future)
+        deadline = Deadline(10)
+
+        # The deadline passes once the first page is received.
+        with patch.object(deadline, 'error', side_effect=lambda: (
+            DeadlineExceeded(10) if self.session.execute_async.called else None
+        )):
+            results = ConcurrentExecutor(self.session).execute(['s1'], deadline=deadline)
+
+        self.assertIsInstance(results[0].error, DeadlineExceeded)
+        future.start_fetching_next_page.assert_not_called()
+
+    def test_page_timeout(self) -> None:
+        future = MockFuture([[1], [2]])
+        self.session.execute_async = MagicMock(return_value=future)
+
+        results = ConcurrentExecutor(self.session).execute(['s1'], deadline=Deadline(5))
+
+        self.assertEqual([1, 2], results[0].rows)
+        self.assertLessEqual(future.timeout, 5)
+
+    def test_expired(self) -> None:
+        results = ConcurrentExecutor(self.session).execute(
+            iter(['s1', 's2']), deadline=Deadline(0)
+        )
+
+        self.assertEqual(1, len(results))
+        self.assertIsInstance(results[0].error, DeadlineExceeded)
+        self.assertFalse(ExecutionResult(results).complete)
+        self.session.execute_async.assert_not_called()
+
+    def test_expires_in_flight(self) -> None:
+        self.session.execute_async = MagicMock(side_effect=[MockFuture([[1]]), PendingFuture()])
+
+        results = ConcurrentExecutor(self.session).execute(['s1', 's2'], deadline=Deadline(0.05))
+
+        self.assertTrue(results[0].success)
+        self.assertIsInstance(results[1].error, DeadlineExceeded)
+
+    def test_cancel_in_flight(self) -> None:
+        self.session.execute_async = MagicMock(return_value=PendingFuture())
+        deadline = Deadline()
+        threading.Timer(0.05, deadline.cancel).start()
+
+        with self.assertRaises(QueryCancelled):
+            ConcurrentExecutor(self.session).execute(
+                ['s1', 's2'], raise_on_first_error=True, deadline=deadline
+            )
+
+
+class ExecutionResultTestCase(unittest.TestCase):
+
+    def test_result(self) -> None:
+        success = StatementResult('s1')
+        success.success = True
+        success.rows = [1, 2]
+        success.retries = 1
+        failure = StatementResult('s2')
+        failure.error = InvalidRequest('mock')
+
+        result = ExecutionResult([success, failure])
+
+        self.assertEqual([1, 2], result)
+        self.assertEqual([success, failure], result.results)
+        self.assertEqual([failure], result.failed)
+        self.assertFalse(result.complete)
+        self.assertEqual(1, result.retries)
+        self.assertTrue(ExecutionResult([success]).complete)
+
+
+if __name__ == '__main__':
+    unittest.main()
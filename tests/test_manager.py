@@ -1,11 +1,47 @@
+import asyncio
+import tempfile
+import time
 import unittest
-from unittest.mock import patch, call, MagicMock
+from collections import namedtuple
+from pathlib import Path
+from unittest.mock import patch, call, ANY, MagicMock, PropertyMock
+
+from cassandra import DriverException, InvalidRequest, OperationTimedOut
+from cassandra.protocol import PreparedQueryNotFound
+from cassandra.cqltypes import UTF8Type
+from cassandra.query import SimpleStatement, PreparedStatement, BoundStatement
 
 from primeight.manager import \
     CassandraManager, \
     Cluster, ExecutionProfile, AddressTranslator, AuthProvider, \
     EXEC_PROFILE_DEFAULT, LoadBalancingPolicy, RetryPolicy, dict_factory, \
-    concurrent
+    tuple_factory, CassandraColumn, HostDistance, \
+    TokenAwarePolicy, DCAwareRoundRobinPolicy, ConstantSpeculativeExecutionPolicy
+from primeight.rows import SlottedRowFactory
+from primeight.metrics import MetricLabels, MetricsRegistry
+from primeight.concurrency import AIMDLimiter, ConcurrentExecutor, Deadline, StatementResult
+from primeight.exceptions import DeadlineExceeded
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class MockFuture:
+    """Response future of a single page request."""
+
+    has_more_pages = False
+
+    def __init__(self, rows, error=None):
+        self._rows = rows
+        self._error = error
+
+    def add_callbacks(self, callback, errback):
+        if self._error is not None:
+            errback(self._error)
+        else:
+            callback(self._rows)
 
 
 class CassandraManagerTestCase(unittest.TestCase):
@@ -61,6 +97,14 @@ class CassandraManagerTestCase(unittest.TestCase):
             cm.execution_profiles
         )
 
+    def test_constructor_default_profile(self) -> None:
+        cm = CassandraManager(self.contact_points, local_dc='mock_dc')
+
+        policy = cm.execution_profiles[EXEC_PROFILE_DEFAULT].load_balancing_policy
+        self.assertIsInstance(policy, TokenAwarePolicy)
+        self.assertIsInstance(policy._child_policy, DCAwareRoundRobinPolicy)
+        self.assertEqual('mock_dc', policy._child_policy.local_dc)
+
     def test_constructor_with_profiles(self) -> None:
         mock_execution_profiles = {'mock': MagicMock(spec=ExecutionProfile)}
 
@@ -72,6 +116,75 @@ class CassandraManagerTestCase(unittest.TestCase):
         self.assertEqual(self.contact_points, cm.contact_points)
         self.assertEqual(mock_execution_profiles, cm.execution_profiles)
 
+    def test_constructor_with_tuning(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cm = CassandraManager(
+                self.contact_points,
+                protocol_version=2,
+                compression='lz4',
+                connections_per_host=(2, 4),
+                max_requests_per_connection=50,
+                executor_threads=4,
+                connection_class='asyncio'
+            )
+
+        self.assertEqual(2, cm.cluster.protocol_version)
+        self.assertEqual('lz4', cm.cluster.compression)
+        self.assertEqual(2, cm.cluster.get_core_connections_per_host(HostDistance.LOCAL))
+        self.assertEqual(4, cm.cluster.get_max_connections_per_host(HostDistance.LOCAL))
+        self.assertEqual(50, cm.cluster.get_max_requests_per_connection(HostDistance.LOCAL))
+        self.assertEqual(4, cm.cluster.executor._max_workers)
+        self.assertEqual('AsyncioConnection', cm.cluster.connection_class.__name__)
+
+        with self.assertRaises(ValueError):
+            CassandraManager(self.contact_points, compression='zstd')
+        with self.assertRaises(ValueError):
+            CassandraManager(self.contact_points, connection_class='random')
+
+    def test_constructor_with_max_requests_per_connection(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cm = CassandraManager(
+                self.contact_points, max_requests_per_connection=1024
+            )
+
+        self.assertEqual(1024, cm.cluster.connection_class.max_in_flight)
+
+    def test_from_config(self) -> None:
+        config = {
+            'contact_points': self.contact_points,
+            'protocol_version': 2,
+            'connections_per_host': [1, 3],
+            'executor_threads': 3,
+            'slow_query_threshold': 0.5,
+            'auto_prepare': True,
+            'prepared_cache_size': 10
+        }
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cm = CassandraManager.from_config(config, connect_timeout=1.0)
+
+        self.assertEqual(self.contact_points, cm.contact_points)
+        self.assertEqual(0.5, cm.slow_query_log.threshold)
+        self.assertTrue(cm.auto_prepare)
+        for option in CassandraManager.CONFIG_OPTIONS:
+            self.assertIn(option, CassandraManager.from_config.__doc__)
+        self.assertEqual(1.0, cm.cluster.connect_timeout)
+        self.assertEqual(3, cm.cluster.get_max_connections_per_host(HostDistance.LOCAL))
+        self.assertEqual(3, cm.cluster.executor._max_workers)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'cassandra.yaml'
+            path.write_text(
+                "contact_points: ['127.0.0.1']\ncompression: snappy\n", encoding='utf-8'
+            )
+            with patch.object(CassandraManager, 'create_execution_profile'):
+                cm = CassandraManager.from_config(path)
+
+        self.assertEqual(['127.0.0.1'], cm.contact_points)
+        self.assertEqual('snappy', cm.cluster.compression)
+
+        with self.assertRaises(ValueError):
+            CassandraManager.from_config({'random': 1})
+
     def test_connect(self) -> None:
         with patch.object(CassandraManager, 'create_execution_profile'):
             cassandra_manager = CassandraManager(self.contact_points)
@@ -117,30 +230,639 @@ class CassandraManagerTestCase(unittest.TestCase):
 
         self.assertEqual(mock_result * 10, result)
 
+    def test_execute_metrics(self) -> None:
+        registry = MetricsRegistry()
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points, metrics=registry)
+        self.assertIs(registry, cassandra_manager.metrics)
+
+        mock_session = MagicMock()
+        mock_session.execute = MagicMock(side_effect=[
+            [{'mock_col': 'mock_val'}] * 2, OperationTimedOut('mock')
+        ])
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        labels = MetricLabels('ks', 'table', 'mock_query', 'query', 'mock_split')
+        cassandra_manager.execute(
+            ['SELECT * FROM ks.table ;'], labeler=lambda statement: labels
+        )
+        with self.assertRaises(OperationTimedOut):
+            cassandra_manager.execute(['SELECT * FROM ks.other ;'])
+
+        stats = cassandra_manager.stats()
+        self.assertEqual(1, stats[labels]['statements'])
+        self.assertEqual(2, stats[labels]['rows'])
+        self.assertEqual(len('SELECT * FROM ks.table ;'), stats[labels]['bytes'])
+        self.assertEqual(1, stats[labels]['latency']['count'])
+        self.assertEqual(1, stats[labels]['build']['count'])
+
+        other = MetricLabels('ks', 'other', 'base', 'query', '')
+        self.assertEqual({'OperationTimedOut': 1}, stats[other]['errors'])
+
+    def test_execute_slow_query_log(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points, slow_query_threshold=0)
+        self.assertEqual(0, cassandra_manager.slow_query_log.threshold)
+
+        mock_session = MagicMock()
+        mock_session.execute = MagicMock(return_value=[{'mock_col': 'mock_val'}])
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        with self.assertLogs(level='WARNING'):
+            cassandra_manager.execute(
+                [f"SELECT * FROM ks.table WHERE a={i} ;" for i in range(3)]
+            )
+
+        summary = cassandra_manager.slow_query_log.summary()
+        self.assertEqual(1, len(summary))
+        self.assertEqual("SELECT * FROM ks.table WHERE a=? ;", summary[0]['fingerprint'])
+        self.assertEqual(3, summary[0]['count'])
+        self.assertEqual(3, summary[0]['rows'])
+        self.assertEqual(3, summary[0]['max_fan_out'])
+
+    def test_execute_without_slow_query_log(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points)
+        self.assertIsNone(cassandra_manager.slow_query_log)
+
+    def test_execute_auto_prepare(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(
+                self.contact_points, auto_prepare=True, prepared_cache_size=10
+            )
+        self.assertTrue(cassandra_manager.auto_prepare)
+
+        column = namedtuple('ColumnMetadata', 'keyspace_name table_name name type')
+        prepared = PreparedStatement(
+            [column('ks', 'table', 'col1', UTF8Type)], b'id', None,
+            "SELECT * FROM ks.table WHERE col1=? ;", 'ks', 4, [], None
+        )
+        mock_session = MagicMock()
+        mock_session.prepare = MagicMock(return_value=prepared)
+        mock_session.execute = MagicMock(return_value=[])
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        cassandra_manager.execute(
+            ["SELECT * FROM ks.table WHERE col1='a' ;", "SELECT * FROM ks.table WHERE col1='b' ;"]
+        )
+
+        mock_session.prepare.assert_called_once_with("SELECT * FROM ks.table WHERE col1=? ;")
+        self.assertEqual(2, mock_session.execute.call_count)
+        for (statement,), _ in mock_session.execute.call_args_list:
+            self.assertIsInstance(statement, BoundStatement)
+            self.assertIs(prepared, statement.prepared_statement)
+        self.assertEqual(10, cassandra_manager.prepared_statements.max_size)
+
+    def test_execute_auto_prepare_error(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points, auto_prepare=True)
+
+        mock_session = MagicMock()
+        mock_session.prepare = MagicMock(side_effect=OperationTimedOut())
+        mock_session.execute = MagicMock(return_value=[{'col1': 'a'}])
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        statement = SimpleStatement("SELECT * FROM ks.table WHERE col1='a' ;")
+        with self.assertLogs(level='WARNING'):
+            result = cassandra_manager.execute([statement])
+
+        self.assertEqual([{'col1': 'a'}], result)
+        mock_session.execute.assert_called_once_with(statement)
+
+    def test_execute_reprepare(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points, auto_prepare=True)
+
+        column = namedtuple('ColumnMetadata', 'keyspace_name table_name name type')
+        first, second = [
+            PreparedStatement(
+                [column('ks', 'table', 'col1', UTF8Type)], query_id, None,
+                "SELECT * FROM ks.table WHERE col1=? ;", 'ks', 4, [], None
+            )
+            for query_id in [b'first', b'second']
+        ]
+        mock_session = MagicMock()
+        mock_session.prepare = MagicMock(side_effect=[first, second])
+        mock_session.execute = MagicMock(side_effect=[
+            DriverException("Tried to execute unknown prepared statement: id=6669727374"),
+            [{'col1': 'a'}]
+        ])
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        with self.assertLogs(level='WARNING'):
+            result = cassandra_manager.execute(["SELECT * FROM ks.table WHERE col1='a' ;"])
+
+        self.assertEqual([{'col1': 'a'}], result)
+        self.assertEqual(2, mock_session.prepare.call_count)
+        (statement,), _ = mock_session.execute.call_args
+        self.assertIs(second, statement.prepared_statement)
+        self.assertEqual(1, cassandra_manager.prepared_statements.stats['reprepares'])
+
+        # Other errors are raised.
+        mock_session.execute = MagicMock(side_effect=OperationTimedOut())
+        with self.assertRaises(OperationTimedOut):
+            cassandra_manager.execute(["SELECT * FROM ks.table WHERE col1='a' ;"])
+
+    def test_execute_concurrent_reprepare(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points, auto_prepare=True)
+
+        column = namedtuple('ColumnMetadata', 'keyspace_name table_name name type')
+        prepared = PreparedStatement(
+            [column('ks', 'table', 'col1', UTF8Type)], b'id', None,
+            "SELECT * FROM ks.table WHERE col1=? ;", 'ks', 4, [], None
+        )
+        mock_session = MagicMock()
+        mock_session.prepare = MagicMock(return_value=prepared)
+        mock_session.execute = MagicMock(return_value=[{'col1': 'b'}])
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        mock_session.execute_async = MagicMock(side_effect=[
+            MockFuture([{'col1': 'a'}]),
+            MockFuture(None, PreparedQueryNotFound(0x2500, 'mock', b'id'))
+        ])
+        result = cassandra_manager.execute_concurrent([
+            "SELECT * FROM ks.table WHERE col1='a' ;",
+            "SELECT * FROM ks.table WHERE col1='b' ;"
+        ])
+
+        self.assertTrue(result.complete)
+        self.assertEqual([{'col1': 'a'}, {'col1': 'b'}], result)
+        self.assertEqual(1, result.results[1].retries)
+
+    def test_prepare_splits(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points, auto_prepare=True)
+
+        mock_session = MagicMock()
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        mock_table = MagicMock()
+        mock_table.warm_up_statements = MagicMock(return_value=[
+            "INSERT INTO ks.table_01_01_2019 JSON ? ;",
+            "INSERT INTO ks.table_02_01_2019 JSON ? ;"
+        ])
+
+        self.assertEqual(2, cassandra_manager.prepare_splits(mock_table, keyspace='ks'))
+        mock_table.warm_up_statements.assert_called_once_with(2, None, 'ks')
+        self.assertIn(
+            "INSERT INTO ks.table_02_01_2019 JSON ? ;", cassandra_manager.prepared_statements
+        )
+
+    def test_warm_up(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points, auto_prepare=True)
+        self.assertIsNone(cassandra_manager.warm_up_report)
+
+        def prepare(query_string):
+            if 'other' in query_string:
+                raise OperationTimedOut()
+            return MagicMock(spec=PreparedStatement)
+
+        mock_session = MagicMock()
+        mock_session.update_created_pools = MagicMock(return_value=set())
+        mock_session.get_pools = MagicMock(return_value=[MagicMock(), MagicMock()])
+        mock_session.prepare = MagicMock(side_effect=prepare)
+
+        first, second = MagicMock(), MagicMock()
+        first.warm_up_statements = MagicMock(return_value=[
+            "INSERT INTO ks.table JSON ? ;", "SELECT * FROM ks.table WHERE col1=?   ;"
+        ])
+        second.warm_up_statements = MagicMock(return_value=[
+            "INSERT INTO ks.table JSON ? ;", "INSERT INTO ks.other JSON ? ;"
+        ])
+
+        with patch.object(Cluster, 'connect', return_value=mock_session) as mock_connect, \
+                self.assertLogs(level='WARNING'):
+            report = cassandra_manager.warm_up([first, second], keyspace='ks', max_workers=2)
+
+        mock_connect.assert_called_once()
+        mock_session.update_created_pools.assert_called_once_with()
+        first.warm_up_statements.assert_called_once_with(1, None, 'ks')
+        self.assertEqual(2, report.hosts)
+        self.assertEqual(3, report.statements)
+        self.assertEqual(2, report.prepared)
+        self.assertEqual(["INSERT INTO ks.other JSON ? ;"], report.failed)
+        self.assertGreaterEqual(report.elapsed, 0)
+        self.assertIs(report, cassandra_manager.warm_up_report)
+        self.assertIn("INSERT INTO ks.table JSON ? ;", cassandra_manager.prepared_statements)
+
+    def test_execute_with_row_factory(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points)
+
+        mock_session = MagicMock()
+        mock_session.execute = MagicMock(return_value=[])
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        row_factory = SlottedRowFactory('mock_table')
+        cassandra_manager.execute(['mock_statement'], row_factory=row_factory)
+        cassandra_manager.execute(['mock_statement'], row_factory=row_factory)
+
+        mock_session.execution_profile_clone_update.assert_called_once_with(
+            EXEC_PROFILE_DEFAULT, row_factory=row_factory
+        )
+        mock_session.execute.assert_called_with(
+            'mock_statement',
+            execution_profile=mock_session.execution_profile_clone_update.return_value
+        )
+
+    def test_create_speculative_execution_profile(self) -> None:
+        profile = CassandraManager.create_speculative_execution_profile(
+            load_balancing_policy=MagicMock(spec=LoadBalancingPolicy),
+            retry_policy=MagicMock(spec=RetryPolicy),
+            delay=0.02,
+            max_attempts=3,
+            request_timeout=5.0
+        )
+
+        policy = profile.speculative_execution_policy
+        self.assertIsInstance(policy, ConstantSpeculativeExecutionPolicy)
+        self.assertEqual(0.02, policy.delay)
+        self.assertEqual(3, policy.max_attempts)
+        self.assertAlmostEqual(5.0, profile.request_timeout)
+
+    def test_speculative_profile(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points)
+
+        mock_session = MagicMock()
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        profile = cassandra_manager.speculative_profile(delay=0.02)
+        self.assertIs(profile, cassandra_manager.speculative_profile(delay=0.02))
+
+        mock_session.execution_profile_clone_update.assert_called_once_with(
+            EXEC_PROFILE_DEFAULT, speculative_execution_policy=ANY
+        )
+        _, kwargs = mock_session.execution_profile_clone_update.call_args
+        self.assertEqual(0.02, kwargs['speculative_execution_policy'].delay)
+        self.assertEqual(2, kwargs['speculative_execution_policy'].max_attempts)
+
+    def test_timeout_profile(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points)
+
+        mock_session = MagicMock()
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        profile = cassandra_manager.timeout_profile('analytics', 60)
+        self.assertIs(profile, cassandra_manager.timeout_profile('analytics', 60))
+        mock_session.execution_profile_clone_update.assert_called_once_with(
+            'analytics', request_timeout=60
+        )
+
+        execution_profile = ExecutionProfile()
+        cassandra_manager.timeout_profile(execution_profile, 1.0)
+        mock_session.execution_profile_clone_update.assert_called_with(
+            execution_profile, request_timeout=1.0
+        )
+
+    def test_tables(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points)
+
+        keyspace_metadata = MagicMock()
+        keyspace_metadata.tables = {'mock_table': None}
+        keyspace_metadata.views = {'mock_table_view': None}
+        cassandra_manager.cluster.metadata.keyspaces['mock_keyspace'] = keyspace_metadata
+
+        self.assertEqual(
+            {'mock_table', 'mock_table_view'}, cassandra_manager.tables('mock_keyspace')
+        )
+        self.assertTrue(cassandra_manager.table_exists('mock_keyspace', 'mock_table'))
+        self.assertFalse(cassandra_manager.table_exists('other_keyspace', 'mock_table'))
+
+    def test_light_metadata(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(
+                self.contact_points, light_metadata=True
+            )
+
+        self.assertTrue(cassandra_manager.light_metadata)
+        self.assertFalse(cassandra_manager.cluster.schema_metadata_enabled)
+        # Token metadata is kept for token aware routing.
+        self.assertTrue(cassandra_manager.cluster.token_metadata_enabled)
+
+        def mock_execute(statement, parameters=None, **kwargs):
+            if 'system_schema.tables' in statement:
+                return [('mock_table',)]
+            elif 'system_schema.views' in statement:
+                return [('mock_table_view',)]
+            elif 'system.local' in statement:
+                return [('10.0.0.1', ['20', '-10'])]
+            elif 'system.peers_v2' in statement:
+                raise InvalidRequest('mock')
+            return [('10.0.0.2', ['5'])]
+
+        mock_session = MagicMock()
+        mock_session.execute = MagicMock(side_effect=mock_execute)
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        self.assertEqual(
+            {'mock_table', 'mock_table_view'}, cassandra_manager.tables('mock_keyspace')
+        )
+        mock_session.execute.assert_any_call(
+            "SELECT table_name FROM system_schema.tables WHERE keyspace_name=%s",
+            ('mock_keyspace',), execution_profile=ANY
+        )
+
+        expected = {'10.0.0.1': [-10, 20], '10.0.0.2': [5]}
+        self.assertEqual(expected, cassandra_manager.host_tokens())
+        mock_session.execute.assert_any_call(
+            "SELECT peer, tokens FROM system.peers", None, execution_profile=ANY
+        )
+        calls = mock_session.execute.call_count
+        self.assertEqual(expected, cassandra_manager.host_tokens())
+        self.assertEqual(calls, mock_session.execute.call_count)
+
+    def test_light_metadata_keyspaces(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(
+                self.contact_points, light_metadata=True, keyspaces=['ks1']
+            )
+
+        mock_session = MagicMock()
+        mock_session.execute = MagicMock(return_value=[])
+        with patch.object(Cluster, 'connect', return_value=mock_session), \
+                patch.object(Cluster, 'refresh_keyspace_metadata') as mock_refresh:
+            cassandra_manager.connect(keyspace='ks2')
+            self.assertEqual([call('ks1'), call('ks2')], mock_refresh.call_args_list)
+
+            cassandra_manager.execute([
+                "SELECT * FROM ks3.table WHERE col1='a' ;",
+                "SELECT * FROM ks3.table WHERE col1='b' ;",
+                "SELECT * FROM ks1.table WHERE col1='a' ;"
+            ])
+            self.assertEqual(
+                [call('ks1'), call('ks2'), call('ks3')], mock_refresh.call_args_list
+            )
+
+            mock_refresh.side_effect = DriverException('mock')
+            with self.assertLogs(level='WARNING'):
+                cassandra_manager.execute(["SELECT * FROM ks4.table ;"])
+
+    def test_execute_schema_change_invalidates_catalog(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points)
+
+        mock_session = MagicMock()
+        mock_session.execute = MagicMock(return_value=[])
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        with patch.object(cassandra_manager.catalog, 'invalidate') as mock_invalidate:
+            cassandra_manager.execute(["SELECT * FROM mock_keyspace.mock_table ;"])
+            mock_invalidate.assert_not_called()
+
+            cassandra_manager.execute(
+                [SimpleStatement("CREATE TABLE mock_keyspace.mock_table (col1 TEXT) ;")]
+            )
+            mock_invalidate.assert_called_once_with()
+
     def test_execute_concurrent(self) -> None:
         with patch.object(CassandraManager, 'create_execution_profile'):
             cassandra_manager = CassandraManager(self.contact_points)
 
-        mock_statements = [f'mock_statement_{i}' for i in range(10)]
-        mock_result = \
-            [(True, [{'mock_col': 'mock_val'}]), (False, "mock_error")]
+        mock_error = InvalidRequest('mock_error')
+
+        def _execute_async(statement, *args, **kwargs):
+            if statement == 'mock_statement_1':
+                return MockFuture(None, mock_error)
+            return MockFuture([{'mock_col': statement}])
 
         mock_session = MagicMock()
+        mock_session.execute_async = MagicMock(side_effect=_execute_async)
         with patch.object(Cluster, 'connect', return_value=mock_session):
             cassandra_manager.connect()
 
-        mock_statements_and_params = [(s, ()) for s in mock_statements]
-        with patch.object(concurrent, 'execute_concurrent',
-                          return_value=mock_result) as mock_execute_concurrent:
-            result = cassandra_manager.execute_concurrent(mock_statements)
+        result = cassandra_manager.execute_concurrent(
+            f'mock_statement_{i}' for i in range(3)
+        )
+
+        self.assertEqual([{'mock_col': 'mock_statement_0'}, {'mock_col': 'mock_statement_2'}], result)
+        self.assertEqual('mock_statement_1', result.failed[0].statement)
+        self.assertIs(mock_error, result.failed[0].error)
+
+    def test_execute_concurrent_lazy(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points)
+
+        consumed = []
+
+        def _statements():
+            for i in range(CassandraManager.CONCURRENCY * 3):
+                consumed.append(i)
+                yield f'mock_statement_{i}'
+
+        def _execute_async(statement, *args, **kwargs):
+            # Statements are consumed as requests are sent, not up front.
+            self.assertEqual(int(statement.rsplit('_', 1)[1]), consumed[-1])
+            return MockFuture([])
 
-            mock_execute_concurrent.assert_called_once_with(
-                mock_session,
-                mock_statements_and_params,
-                raise_on_first_error=False
+        mock_session = MagicMock()
+        mock_session.execute_async = MagicMock(side_effect=_execute_async)
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        result = cassandra_manager.execute_concurrent(_statements())
+
+        self.assertTrue(result.complete)
+        self.assertEqual(CassandraManager.CONCURRENCY * 3, len(result.results))
+
+    def test_execute_concurrent_adaptive(self) -> None:
+        limiter = AIMDLimiter(initial_limit=2)
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(
+                self.contact_points, concurrency_limiter=limiter
+            )
+        self.assertIs(limiter, cassandra_manager.concurrency_limiter)
+
+        mock_session = MagicMock()
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        success = StatementResult('mock_statement_0')
+        success.success = True
+        success.rows = [{'mock_col': 'mock_val'}]
+        failure = StatementResult('mock_statement_1')
+        failure.error = 'mock_error'
+        with patch.object(ConcurrentExecutor, 'execute',
+                          return_value=[success, failure]) as mock_execute:
+            result = cassandra_manager.execute_concurrent(
+                (f'mock_statement_{i}' for i in range(10)), adaptive=True
+            )
+
+            mock_execute.assert_called_once_with(
+                ANY, execution_profile=None, raise_on_first_error=False, deadline=None
             )
 
         self.assertEqual([{'mock_col': 'mock_val'}], result)
+        self.assertEqual([failure], result.failed)
+        self.assertFalse(result.complete)
+
+    def test_execute_concurrent_retry(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points)
+
+        mock_session = MagicMock()
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        with patch.object(ConcurrentExecutor, '__init__', return_value=None) as mock_init, \
+                patch.object(ConcurrentExecutor, 'execute', return_value=[]) as mock_execute:
+            result = cassandra_manager.execute_concurrent(
+                [('mock_statement', 'mock_profile')], max_retries=3, retry_budget=10
+            )
+
+            _, kwargs = mock_init.call_args
+            self.assertEqual(3, kwargs['max_retries'])
+            self.assertEqual(10, kwargs['retry_budget'])
+            mock_execute.assert_called_once_with(
+                ANY, execution_profile=None, raise_on_first_error=False, deadline=None
+            )
+
+        self.assertTrue(result.complete)
+
+    def test_execute_deadline(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points)
+
+        mock_result = MagicMock()
+        mock_result.current_rows = [{'col1': 'a'}]
+        mock_result.has_more_pages = False
+        mock_future = MagicMock()
+        mock_future.add_callbacks = MagicMock(side_effect=lambda callback, errback: callback(None))
+        mock_future.result = MagicMock(return_value=mock_result)
+        mock_session = MagicMock()
+        mock_session.get_execution_profile = MagicMock(return_value=ExecutionProfile(request_timeout=10.0))
+        mock_session.execute_async = MagicMock(return_value=mock_future)
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        result = cassandra_manager.execute(["SELECT * FROM ks.table ;"], deadline=5)
+
+        self.assertEqual([{'col1': 'a'}], result)
+        mock_session.execute.assert_not_called()
+        _, kwargs = mock_session.execute_async.call_args
+        self.assertLessEqual(kwargs['timeout'], 5)
+
+        with self.assertRaises(DeadlineExceeded):
+            cassandra_manager.execute(["SELECT * FROM ks.table ;"], deadline=Deadline(0))
+
+    def test_execute_deadline_pages(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points)
+
+        mock_result = MagicMock()
+        mock_result.current_rows = [{'col1': 'a'}]
+        mock_result.has_more_pages = True
+        mock_result.fetch_next_page = MagicMock(side_effect=lambda: time.sleep(0.02))
+        mock_future = MagicMock()
+        mock_future.add_callbacks = MagicMock(side_effect=lambda callback, errback: callback(None))
+        mock_future.result = MagicMock(return_value=mock_result)
+        mock_session = MagicMock()
+        mock_session.get_execution_profile = MagicMock(return_value=ExecutionProfile(request_timeout=10.0))
+        mock_session.execute_async = MagicMock(return_value=mock_future)
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        # The result has endless pages: paging stops at the deadline.
+        with self.assertRaises(DeadlineExceeded):
+            cassandra_manager.execute(["SELECT * FROM ks.table ;"], deadline=0.1)
+
+        self.assertGreater(mock_result.fetch_next_page.call_count, 0)
+        self.assertLessEqual(mock_result.response_future.timeout, 0.1)
+        mock_result.__iter__.assert_not_called()
+
+    def test_execute_concurrent_async(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points)
+
+        mock_session = MagicMock()
+        mock_session.get_execution_profile = MagicMock(return_value=ExecutionProfile(request_timeout=10.0))
+        mock_session.execute_async = MagicMock(return_value=MagicMock())
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        deadline = Deadline()
+
+        async def _cancel():
+            task = asyncio.ensure_future(
+                cassandra_manager.execute_concurrent_async(['mock_statement'], deadline=deadline)
+            )
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await task
+
+        # The requests in flight never complete until the task is cancelled.
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(_cancel())
+
+        self.assertTrue(deadline.cancelled)
+        mock_session.execute_async.assert_called_once()
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_execute_columnar(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points)
+
+        mock_result = MagicMock()
+        mock_result.column_names = ['mock_col']
+        mock_result.current_rows = [(1,), (2,)]
+        type(mock_result).has_more_pages = PropertyMock(side_effect=[True, False])
+
+        mock_session = MagicMock()
+        mock_session.execute = MagicMock(return_value=mock_result)
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        result = cassandra_manager.execute_columnar(
+            ['mock_statement'], [CassandraColumn('mock_col', 'bigint')]
+        )
+
+        mock_session.execution_profile_clone_update.assert_called_once_with(
+            EXEC_PROFILE_DEFAULT, row_factory=tuple_factory
+        )
+        mock_result.fetch_next_page.assert_called_once_with()
+        self.assertEqual([1, 2, 1, 2], result['mock_col'].tolist())
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_iter_columnar(self) -> None:
+        with patch.object(CassandraManager, 'create_execution_profile'):
+            cassandra_manager = CassandraManager(self.contact_points)
+
+        mock_result = MagicMock()
+        mock_result.column_names = ['mock_col']
+        mock_result.current_rows = [(1,), (2,)]
+        type(mock_result).has_more_pages = \
+            PropertyMock(side_effect=[True, True, False])
+
+        mock_session = MagicMock()
+        mock_session.execute = MagicMock(return_value=mock_result)
+        with patch.object(Cluster, 'connect', return_value=mock_session):
+            cassandra_manager.connect()
+
+        chunks = list(cassandra_manager.iter_columnar(
+            ['mock_statement'], 3, [CassandraColumn('mock_col', 'bigint')]
+        ))
+
+        self.assertEqual([4, 2], [chunk.num_rows for chunk in chunks])
+        self.assertEqual([1, 2], chunks[1]['mock_col'].tolist())
+
+        with self.assertRaises(ValueError):
+            next(cassandra_manager.iter_columnar(['mock_statement'], 0))
 
     def test_close(self) -> None:
         with patch.object(CassandraManager, 'create_execution_profile'):
@@ -3,6 +3,7 @@ from unittest.mock import patch
 from datetime import datetime
 
 from primeight import CassandraKeyspace, CassandraMaterializedView
+from primeight.metrics import MetricLabels
 from primeight.table import QueryNotFound
 
 
@@ -60,6 +61,23 @@ class CassandraMaterializedViewCase(unittest.TestCase):
             materialized_view.statements[0]
         )
 
+    def test_create_with_split_bucket(self) -> None:
+        self.mock_config['split'] = 'day'
+        self.mock_config['split_mode'] = 'bucket'
+        materialized_view = CassandraMaterializedView(
+                self.mock_config, self.name, self.keyspace
+            ) \
+            .create(keyspace='mock_keyspace', gc_grace_seconds=1000)
+        self.assertEqual(1, len(materialized_view.statements))
+        self.assertEqual(
+            "CREATE MATERIALIZED VIEW mock_keyspace.mock_table_second "
+            "AS SELECT * FROM mock_keyspace.mock_table "
+            "WHERE day IS NOT NULL AND col2 IS NOT NULL AND col1 IS NOT NULL "
+            "PRIMARY KEY ( (day, col2), col1 ) "
+            "WITH CLUSTERING ORDER BY ( id DESC ) AND gc_grace_seconds=1000;",
+            materialized_view.statements[0]
+        )
+
     def test_create_with_split(self) -> None:
         self.mock_config['split'] = 'year'
         self.mock_config['generated_columns'] = {
@@ -212,6 +230,21 @@ class CassandraMaterializedViewCase(unittest.TestCase):
             materialized_view.statements[0]
         )
 
+    def test_metric_labels(self) -> None:
+        self.mock_config['split'] = 'day'
+        materialized_view = CassandraMaterializedView(
+                self.mock_config, self.name, self.keyspace
+            ) \
+            .create(keyspace='mock_keyspace')
+
+        self.assertEqual(
+            MetricLabels('mock_keyspace', 'mock_table', 'second', 'create', '01_01_2019'),
+            materialized_view.metric_labels(
+                "CREATE MATERIALIZED VIEW mock_keyspace.mock_table_01_01_2019_second AS "
+                "SELECT * FROM mock_keyspace.mock_table_01_01_2019;"
+            )
+        )
+
     def test_raises_query_not_found(self) -> None:
         with self.assertRaises(QueryNotFound):
             CassandraMaterializedView(self.mock_config, 'third', self.keyspace)
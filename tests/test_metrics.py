@@ -0,0 +1,144 @@
+import unittest
+from urllib.request import urlopen
+
+from cassandra import OperationTimedOut
+
+from primeight.metrics import \
+    LatencyHistogram, MetricLabels, MetricsRegistry, MetricsExporter, PrometheusExporter
+
+
+class LatencyHistogramTestCase(unittest.TestCase):
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            LatencyHistogram(precision_bits=1)
+
+    def test_empty(self) -> None:
+        histogram = LatencyHistogram()
+        self.assertEqual(0, histogram.count)
+        self.assertIsNone(histogram.percentile(50))
+
+    def test_bounds(self) -> None:
+        histogram = LatencyHistogram(precision_bits=4)
+        for value in [0, 1, 15, 16, 17, 31, 32, 1000, 123456789]:
+            lowest, highest = histogram._bounds(histogram._index(value))
+            self.assertLessEqual(lowest, value)
+            self.assertGreaterEqual(highest, value)
+            self.assertLessEqual(highest - lowest, max(1, value // 8))
+
+    def test_percentile(self) -> None:
+        histogram = LatencyHistogram()
+        for i in range(1, 1001):
+            histogram.record(i / 1000)
+
+        self.assertEqual(1000, histogram.count)
+        self.assertAlmostEqual(500.5, histogram.total)
+        self.assertEqual(0.001, histogram.min)
+        self.assertEqual(1.0, histogram.max)
+        self.assertAlmostEqual(0.5, histogram.percentile(50), delta=0.5 * 0.016)
+        self.assertAlmostEqual(0.99, histogram.percentile(99), delta=0.99 * 0.016)
+        self.assertEqual(1.0, histogram.percentile(100))
+
+        snapshot = histogram.snapshot(percentiles=[50])
+        self.assertEqual(1000, snapshot['count'])
+        self.assertEqual([50], list(snapshot['percentiles']))
+
+
+class MetricsRegistryTestCase(unittest.TestCase):
+
+    def test_statement_labels(self) -> None:
+        self.assertEqual(
+            MetricLabels('ks', 'table', 'base', 'query', ''),
+            MetricsRegistry.statement_labels("SELECT * FROM ks.table WHERE a=1 ;")
+        )
+        self.assertEqual(
+            MetricLabels('ks', 'table', 'base', 'insert', ''),
+            MetricsRegistry.statement_labels("INSERT INTO ks.table JSON '{}';")
+        )
+        self.assertEqual(
+            MetricLabels('ks', 'table', 'base', 'create', ''),
+            MetricsRegistry.statement_labels("CREATE TABLE IF NOT EXISTS ks.table ( a INT );")
+        )
+        self.assertEqual(
+            MetricLabels('', '', 'base', 'use', ''),
+            MetricsRegistry.statement_labels("USE ks;")
+        )
+
+    def test_record(self) -> None:
+        registry = MetricsRegistry()
+        labels = MetricLabels('ks', 'table', 'base', 'query', '01_2019')
+
+        registry.record_build(labels, 0.001)
+        registry.record_execution(labels, 0.01, rows=10, size=100)
+        registry.record_execution(labels, 0.02, size=100, error=OperationTimedOut())
+        registry.record_execution(labels, None, rows=5, size=100)
+
+        stats = registry.stats()[labels]
+        self.assertEqual(3, stats['statements'])
+        self.assertEqual(15, stats['rows'])
+        self.assertEqual(300, stats['bytes'])
+        self.assertEqual({'OperationTimedOut': 1}, stats['errors'])
+        self.assertEqual(2, stats['latency']['count'])
+        self.assertEqual(1, stats['build']['count'])
+
+        registry.reset()
+        self.assertEqual({}, registry.stats())
+
+    def test_export(self) -> None:
+        class MockExporter(MetricsExporter):
+
+            def export(self, stats):
+                return len(stats)
+
+        with self.assertRaises(TypeError):
+            MetricsExporter()
+
+        registry = MetricsRegistry([MockExporter()])
+        registry.record_execution(MetricLabels('ks', 'table', 'base', 'query', ''), 0.01)
+        registry.add_exporter(MockExporter())
+
+        self.assertEqual([1, 1], registry.export())
+
+
+class PrometheusExporterTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.registry = MetricsRegistry()
+        self.labels = MetricLabels('ks', 'table', 'base', 'query', '01_2019')
+        self.registry.record_build(self.labels, 0.001)
+        self.registry.record_execution(self.labels, 0.01, rows=10, size=100)
+        self.registry.record_execution(self.labels, 0.01, error=OperationTimedOut())
+
+    def test_render(self) -> None:
+        text = PrometheusExporter(self.registry).render()
+        labels = 'keyspace="ks",table="table",query="base",operation="query",split="01_2019"'
+
+        self.assertIn('# TYPE primeight_statements_total counter', text)
+        self.assertIn(f'primeight_statements_total{{{labels}}} 2', text)
+        self.assertIn(f'primeight_rows_total{{{labels}}} 10', text)
+        self.assertIn(f'primeight_statement_bytes_total{{{labels}}} 100', text)
+        self.assertIn(f'primeight_errors_total{{{labels},error="OperationTimedOut"}} 1', text)
+        self.assertIn('# TYPE primeight_latency_seconds summary', text)
+        self.assertIn(f'primeight_latency_seconds{{{labels},quantile="0.5"}}', text)
+        self.assertIn(f'primeight_latency_seconds{{{labels},quantile="0.999"}}', text)
+        self.assertIn(f'primeight_latency_seconds_count{{{labels}}} 2', text)
+        self.assertIn(f'primeight_build_seconds_count{{{labels}}} 1', text)
+        self.assertTrue(text.endswith('\n'))
+
+    def test_render_requires_registry(self) -> None:
+        with self.assertRaises(ValueError):
+            PrometheusExporter().render()
+
+    def test_serve(self) -> None:
+        server = PrometheusExporter(self.registry, prefix='mock').serve(port=0)
+        try:
+            port = server.server_address[1]
+            with urlopen(f'http://127.0.0.1:{port}/metrics', timeout=5) as response:
+                self.assertIn(b'mock_statements_total', response.read())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
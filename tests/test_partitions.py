@@ -0,0 +1,99 @@
+import unittest
+from datetime import datetime, date, timedelta
+
+import pytz
+
+from primeight.generators import Generators
+from primeight.partitions import \
+    partition_range, partition_suffix, partition_timestamp, days_of, \
+    days_from_civil, civil_from_days
+
+
+class PartitionsTestCase(unittest.TestCase):
+
+    def test_civil_days(self) -> None:
+        epoch = date(1970, 1, 1)
+        for days in range(-1000, 30000, 7):
+            d = epoch + timedelta(days=days)
+            self.assertEqual((d.year, d.month, d.day), civil_from_days(days))
+            self.assertEqual(days, days_from_civil(d.year, d.month, d.day))
+
+    def test_day(self) -> None:
+        partitions = partition_range(
+            'day', datetime(2019, 1, 1, 12), datetime(2019, 1, 2, 6)
+        )
+
+        self.assertEqual(('01_01_2019', '02_01_2019'), partitions.suffixes)
+        self.assertEqual((1546300800000, 1546387200000), partitions.timestamps)
+        self.assertEqual(
+            datetime(2019, 1, 1, tzinfo=pytz.UTC), partitions.datetimes[0]
+        )
+
+    def test_week(self) -> None:
+        partitions = partition_range(
+            'week', datetime(2019, 1, 1, 12), datetime(2019, 1, 20)
+        )
+
+        self.assertEqual(
+            ('31_12_2018', '07_01_2019', '14_01_2019'), partitions.suffixes
+        )
+        self.assertEqual(Generators.week(1546344000000), partitions.timestamps[0])
+        for d in partitions.datetimes:
+            self.assertEqual(0, d.weekday())
+            self.assertEqual(0, d.hour)
+
+    def test_month(self) -> None:
+        partitions = partition_range(
+            'month', datetime(2018, 11, 30), datetime(2019, 2, 1)
+        )
+
+        self.assertEqual(
+            ('11_2018', '12_2018', '01_2019', '02_2019'), partitions.suffixes
+        )
+        self.assertEqual(Generators.month(1546344000000), partitions.timestamps[2])
+
+    def test_year(self) -> None:
+        partitions = partition_range('year', 1546344000000, 1609459200000)
+
+        self.assertEqual(('2019', '2020', '2021'), partitions.suffixes)
+        self.assertEqual(
+            [(1546300800000, '2019'), (1577836800000, '2020'), (1609459200000, '2021')],
+            list(partitions)
+        )
+
+    def test_empty(self) -> None:
+        partitions = partition_range('day', datetime(2019, 1, 2), datetime(2019, 1, 1))
+
+        self.assertEqual(0, len(partitions))
+
+    def test_memoized(self) -> None:
+        self.assertIs(
+            partition_range('month', datetime(2019, 1, 1), datetime(2019, 3, 1)),
+            partition_range('month', datetime(2019, 1, 15), datetime(2019, 3, 31))
+        )
+
+    def test_partition_suffix(self) -> None:
+        days = days_of(datetime(2019, 1, 3))
+
+        self.assertEqual('03_01_2019', partition_suffix('day', days))
+        self.assertEqual('31_12_2018', partition_suffix('week', days))
+        self.assertEqual('01_2019', partition_suffix('month', days))
+        self.assertEqual('2019', partition_suffix('year', days))
+
+    def test_partition_timestamp(self) -> None:
+        days = days_of(datetime(2019, 1, 3, 12))
+
+        for granularity in ['day', 'week', 'month', 'year']:
+            generator = getattr(Generators, granularity)
+            self.assertEqual(
+                generator(int(datetime(2019, 1, 3, 12, tzinfo=pytz.UTC).timestamp() * 1000)),
+                partition_timestamp(granularity, days)
+            )
+
+    def test_unrecognized_granularity(self) -> None:
+        with self.assertRaises(ValueError):
+            partition_range('hour', datetime(2019, 1, 1), datetime(2019, 1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+from datetime import datetime
+
+import h3.api.basic_str as h3
+
+from primeight.keyspace import CassandraKeyspace
+from primeight.table import CassandraTable
+from primeight.planner import QueryPlanner
+from primeight.exceptions import DateNotDefinedError, SpaceQueryNotFound
+
+
+class QueryPlannerTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.mock_config = {
+            'name': 'mock_table',
+            'keyspace': 'mock_keyspace',
+            'columns': {
+                'col1': {'type': 'text'},
+                'col2': {'type': 'timestamp'},
+                'col3': {'type': 'float'},
+                'col4': {'type': 'float'}
+            },
+            'generated_columns': {
+                'day': 'col2',
+                'h5': 'col3,col4',
+                'h9': 'col3,col4'
+            },
+            'query': {
+                'base': {
+                    'required': {'id': 'col1'},
+                    'optional': ['day', 'h5', 'h9']
+                },
+                'coarse': {
+                    'required': {'space': 'h5', 'time': 'day'},
+                    'optional': ['col1']
+                },
+                'fine': {
+                    'required': {'space': 'h9'},
+                    'optional': ['col1']
+                }
+            }
+        }
+        self.area = {
+            'type': 'Polygon',
+            'coordinates': [[
+                [-8.94, 26.91], [-8.92, 26.91], [-8.92, 26.93],
+                [-8.94, 26.93], [-8.94, 26.91]
+            ]]
+        }
+        self.keyspace = CassandraKeyspace(self.mock_config)
+
+    def test_resolution(self) -> None:
+        self.assertEqual(5, QueryPlanner.resolution('h5'))
+        self.assertEqual(12, QueryPlanner.resolution('h12_begin'))
+        self.assertIsNone(QueryPlanner.resolution('col1'))
+
+    def test_cover_polygon(self) -> None:
+        cells = QueryPlanner.cover(self.area, 5)
+        self.assertGreaterEqual(len(cells), 1)
+        self.assertIn(h3.geo_to_h3(26.92, -8.93, 5), cells)
+
+        # Boundary cells are included even though their center is outside.
+        fine_cells = QueryPlanner.cover(self.area, 9)
+        polyfill = h3.polyfill(self.area, 9, geo_json_conformant=True)
+        self.assertTrue(set(polyfill).issubset(fine_cells))
+        self.assertGreater(len(fine_cells), len(polyfill))
+        self.assertEqual(sorted(fine_cells), fine_cells)
+
+    def test_cover_cells(self) -> None:
+        cell = h3.geo_to_h3(26.92, -8.93, 7)
+        self.assertEqual([h3.h3_to_parent(cell, 5)], QueryPlanner.cover([cell], 5))
+        self.assertEqual(49, len(QueryPlanner.cover([cell], 9)))
+
+    def test_plan(self) -> None:
+        plan = QueryPlanner(self.mock_config) \
+            .plan(self.area, datetime(2019, 1, 1), datetime(2019, 1, 2))
+
+        self.assertEqual(2, len(plan.candidates))
+        coarse = [c for c in plan.candidates if c.query_name == 'coarse'][0]
+        self.assertEqual(2, coarse.time_partitions)
+        self.assertEqual(2 * len(coarse.cells), coarse.partitions)
+        self.assertEqual('coarse', plan.query_name)
+
+    def test_plan_prefers_fine_resolution_on_long_ranges(self) -> None:
+        plan = QueryPlanner(self.mock_config) \
+            .plan(self.area, datetime(2019, 1, 1), datetime(2019, 12, 31))
+
+        self.assertEqual('fine', plan.query_name)
+        self.assertIn("* fine", plan.explain())
+
+    def test_plan_raises_date_not_defined(self) -> None:
+        with self.assertRaises(DateNotDefinedError):
+            QueryPlanner(self.mock_config).plan(self.area)
+
+    def test_plan_raises_space_query_not_found(self) -> None:
+        del self.mock_config['query']['coarse']
+        del self.mock_config['query']['fine']
+        with self.assertRaises(SpaceQueryNotFound):
+            QueryPlanner(self.mock_config).plan(self.area)
+
+    def test_table_plan(self) -> None:
+        table = CassandraTable(self.mock_config, self.keyspace) \
+            .plan(self.area, datetime(2019, 1, 1), datetime(2019, 1, 1))
+
+        cells = QueryPlanner.cover(self.area, 5)
+        cells_str = ', '.join([f"'{c}'" for c in cells])
+        self.assertEqual(
+            [
+                "SELECT * FROM mock_keyspace.mock_table_coarse "
+                "WHERE day=1546300800000 AND "
+                f"h5 IN ({cells_str})   ;"
+            ],
+            table.statements
+        )
+        self.assertIn("Chosen query 'coarse'", table.explain())
+
+    def test_explain_raises_without_plan(self) -> None:
+        table = CassandraTable(self.mock_config, self.keyspace)
+        with self.assertRaises(ValueError):
+            table.explain()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+import unittest
+from collections import namedtuple
+from unittest.mock import MagicMock, patch
+from uuid import UUID
+
+from cassandra import ConsistencyLevel, DriverException, InvalidRequest, OperationTimedOut
+from cassandra.cqltypes import LongType, UTF8Type, ListType
+from cassandra.protocol import PreparedQueryNotFound
+from cassandra.query import BoundStatement, PreparedStatement, SimpleStatement
+
+from primeight.prepared import \
+    PreparedStatementCache, is_unprepared, literal_value, parameterize, query_string_of
+
+
+ColumnMetadata = namedtuple('ColumnMetadata', 'keyspace_name table_name name type')
+
+
+def mock_prepare(query_string):
+    """Returns a prepared statement with a text or bigint column per bind marker."""
+    columns = []
+    for i, part in enumerate(query_string.split('?')[:-1]):
+        if part.rstrip().endswith('IN'):
+            cql_type = ListType.apply_parameters([UTF8Type])
+        elif part.rstrip().endswith('day='):
+            cql_type = LongType
+        else:
+            cql_type = UTF8Type
+        columns.append(ColumnMetadata('ks', 'table', f'col{i}', cql_type))
+
+    return PreparedStatement(columns, b'id', None, query_string, 'ks', 4, [], None)
+
+
+class ParameterizeTestCase(unittest.TestCase):
+
+    def test_literal_value(self) -> None:
+        self.assertEqual("it's", literal_value("'it''s'"))
+        self.assertEqual(-12, literal_value('-12'))
+        self.assertEqual(1.5, literal_value('1.5'))
+        self.assertEqual(1e3, literal_value('1e3'))
+        self.assertIs(True, literal_value('true'))
+        self.assertEqual(
+            UUID('123e4567-e89b-12d3-a456-426614174000'),
+            literal_value('123e4567-e89b-12d3-a456-426614174000')
+        )
+
+    def test_exponent(self) -> None:
+        self.assertEqual(1e-05, literal_value('1e-05'))
+        self.assertEqual(-1e-07, literal_value('-1e-07'))
+        self.assertEqual(
+            ("SELECT * FROM ks.table WHERE col3>? AND col3<? AND col4=? ;", [1e-05, 2.5, -1e-07]),
+            parameterize("SELECT * FROM ks.table WHERE col3>1e-05 AND col3<2.5 AND col4=-1e-07 ;")
+        )
+
+        with self.assertRaises(ValueError):
+            literal_value('NaN')
+
+    def test_query(self) -> None:
+        self.assertEqual(
+            (
+                "SELECT * FROM ks.table_01_2019 WHERE day=? AND col1 IN ? "
+                "AND h3=? AND col2>=? AND col2<?   LIMIT ? ;",
+                [1546300800000, ['a', "it's"], 'a=b', -1.5, 10, 100]
+            ),
+            parameterize(
+                "SELECT * FROM ks.table_01_2019 WHERE day=1546300800000 AND col1 IN ('a', 'it''s') "
+                "AND h3='a=b' AND col2>=-1.5 AND col2<10   LIMIT 100 ;"
+            )
+        )
+
+    def test_insert(self) -> None:
+        self.assertEqual(
+            ("INSERT INTO ks.table JSON ? USING TTL 10;", ['{"col1": "a=1"}']),
+            parameterize("INSERT INTO ks.table JSON '{\"col1\": \"a=1\"}' USING TTL 10;")
+        )
+
+    def test_not_parameterized(self) -> None:
+        self.assertIsNone(parameterize("CREATE TABLE ks.table ( col1 TEXT ) WITH gc_grace_seconds=10;"))
+        self.assertIsNone(parameterize("SELECT * FROM ks.table WHERE col1=? ;"))
+        self.assertEqual(
+            ("SELECT * FROM ks.table WHERE col1=? ;", ['?']),
+            parameterize("SELECT * FROM ks.table WHERE col1='?' ;")
+        )
+
+
+class PreparedStatementCacheTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.session = MagicMock()
+        self.session.prepare = MagicMock(side_effect=mock_prepare)
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            PreparedStatementCache(self.session, max_size=0)
+
+    def test_bind(self) -> None:
+        cache = PreparedStatementCache(self.session)
+
+        first = cache.bind("SELECT * FROM ks.table WHERE day=1 AND col1 IN ('a', 'b') ;")
+        second = cache.bind(
+            SimpleStatement("SELECT * FROM ks.table WHERE day=2 AND col1 IN ('c') ;", is_idempotent=True)
+        )
+
+        self.assertIsInstance(first, BoundStatement)
+        self.assertIs(first.prepared_statement, second.prepared_statement)
+        self.assertTrue(second.is_idempotent)
+        self.assertIsNone(second.consistency_level)
+
+        third = cache.bind(SimpleStatement(
+            "SELECT * FROM ks.table WHERE day=3 AND col1 IN ('d') ;",
+            consistency_level=ConsistencyLevel.LOCAL_QUORUM, fetch_size=10
+        ))
+        self.assertEqual(ConsistencyLevel.LOCAL_QUORUM, third.consistency_level)
+        self.assertEqual(10, third.fetch_size)
+        self.assertEqual(
+            "SELECT * FROM ks.table WHERE day=? AND col1 IN ? ;", query_string_of(second)
+        )
+        self.session.prepare.assert_called_once_with(
+            "SELECT * FROM ks.table WHERE day=? AND col1 IN ? ;"
+        )
+
+    def test_bind_fallback(self) -> None:
+        cache = PreparedStatementCache(self.session)
+
+        with patch('primeight.prepared.parameterize', side_effect=ValueError('mock')):
+            statement = "SELECT * FROM ks.table WHERE col1='a' ;"
+            self.assertIs(statement, cache.bind(statement))
+
+        # The value does not match the type of the prepared statement.
+        statement = "SELECT * FROM ks.table WHERE day='a' ;"
+        self.assertIs(statement, cache.bind(statement))
+
+        statement = "CREATE TABLE ks.table ( col1 TEXT );"
+        self.assertIs(statement, cache.bind(statement))
+
+        self.session.prepare = MagicMock(side_effect=InvalidRequest('mock'))
+        statement = "SELECT * FROM ks.other WHERE col1='a' ;"
+        self.assertIs(statement, cache.bind(statement))
+        self.assertIs(statement, cache.bind(statement))
+        self.session.prepare.assert_called_once_with("SELECT * FROM ks.other WHERE col1=? ;")
+
+    def test_bind_prepare_error(self) -> None:
+        cache = PreparedStatementCache(self.session)
+        self.session.prepare = MagicMock(side_effect=[
+            OperationTimedOut(), mock_prepare("SELECT * FROM ks.table WHERE col1=? ;")
+        ])
+
+        statement = SimpleStatement("SELECT * FROM ks.table WHERE col1='a' ;", is_idempotent=True)
+        with self.assertLogs(level='WARNING'):
+            self.assertIs(statement, cache.bind(statement))
+        self.assertNotIn("SELECT * FROM ks.table WHERE col1=? ;", cache)
+
+        # Temporary errors are not remembered.
+        self.assertIsInstance(cache.bind(statement), BoundStatement)
+        self.assertEqual(2, self.session.prepare.call_count)
+
+    def test_lru(self) -> None:
+        cache = PreparedStatementCache(self.session, max_size=2)
+
+        cache.bind("SELECT * FROM ks.a WHERE col1='a' ;")
+        cache.bind("SELECT * FROM ks.b WHERE col1='a' ;")
+        cache.bind("SELECT * FROM ks.a WHERE col1='b' ;")
+        cache.bind("SELECT * FROM ks.c WHERE col1='a' ;")
+
+        self.assertEqual(2, len(cache))
+        self.assertIn("SELECT * FROM ks.a WHERE col1=? ;", cache)
+        self.assertNotIn("SELECT * FROM ks.b WHERE col1=? ;", cache)
+
+        self.assertEqual(
+            {'size': 2, 'max_size': 2, 'hits': 1, 'misses': 3, 'evictions': 1, 'reprepares': 0},
+            cache.stats
+        )
+
+        cache.clear()
+        self.assertEqual(0, len(cache))
+
+    def test_rebind(self) -> None:
+        cache = PreparedStatementCache(self.session)
+        statement = cache.bind(
+            SimpleStatement("SELECT * FROM ks.table WHERE col1='a' ;", is_idempotent=True, fetch_size=10)
+        )
+
+        rebound = cache.rebind(statement)
+
+        self.assertIsNot(statement.prepared_statement, rebound.prepared_statement)
+        self.assertEqual(statement.values, rebound.values)
+        self.assertTrue(rebound.is_idempotent)
+        self.assertEqual(10, rebound.fetch_size)
+        self.assertEqual(2, self.session.prepare.call_count)
+        self.assertEqual(1, cache.stats['reprepares'])
+
+    def test_invalidate(self) -> None:
+        cache = PreparedStatementCache(self.session)
+        cache.bind("SELECT * FROM ks.table WHERE col1='a' ;")
+
+        cache.invalidate("SELECT * FROM ks.table WHERE col1=? ;")
+        cache.invalidate("SELECT * FROM ks.other WHERE col1=? ;")
+        self.assertEqual(0, len(cache))
+
+    def test_is_unprepared(self) -> None:
+        self.assertTrue(is_unprepared(PreparedQueryNotFound(0x2500, 'mock', b'id')))
+        self.assertTrue(is_unprepared(DriverException("Tried to execute unknown prepared statement: id=00")))
+        self.assertFalse(is_unprepared(OperationTimedOut()))
+        self.assertFalse(is_unprepared(InvalidRequest('mock')))
+
+
+if __name__ == '__main__':
+    unittest.main()
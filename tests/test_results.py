@@ -0,0 +1,145 @@
+import unittest
+
+from primeight.column import CassandraColumn
+from primeight.results import ColumnarResultBuilder, iter_dataframes
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class ColumnarResultBuilderTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.columns = [
+            CassandraColumn('col1', 'text'),
+            CassandraColumn('col2', 'timestamp'),
+            CassandraColumn('col3', 'double'),
+            CassandraColumn('col4', 'h3hex'),
+            CassandraColumn('col5', 'list<int>')
+        ]
+        self.column_names = ['col1', 'col2', 'col3', 'col4', 'col5']
+
+    def test_dtype(self) -> None:
+        builder = ColumnarResultBuilder(self.columns)
+        self.assertEqual('object', builder.dtype('col1'))
+        self.assertEqual('int64', builder.dtype('col2'))
+        self.assertEqual('float64', builder.dtype('col3'))
+        self.assertEqual('object', builder.dtype('count'))
+
+    def test_build(self) -> None:
+        builder = ColumnarResultBuilder(self.columns)
+        builder.append_page(self.column_names, [
+            ('a', 1546304400000, 1.5, '835525fffffffff', [1, 2]),
+            ('b', None, None, '835525fffffffff', [3, 4])
+        ])
+        builder.append_page(self.column_names, [
+            {'col1': 'c', 'col2': 3, 'col3': 2.5,
+             'col4': '83552cfffffffff', 'col5': None}
+        ])
+        result = builder.build()
+
+        self.assertEqual(3, result.num_rows)
+        self.assertEqual(self.column_names, list(result))
+        self.assertEqual(np.int64, result['col2'].dtype)
+        self.assertEqual([1546304400000, 0, 3], result['col2'].tolist())
+        self.assertEqual([False, True, False], result.nulls['col2'].tolist())
+        self.assertTrue(np.isnan(result['col3'][1]))
+        self.assertNotIn('col3', result.nulls)
+        self.assertEqual([1, 2], result['col5'][0])
+
+        categories, codes = result.categorical('col4')
+        self.assertEqual(['835525fffffffff', '83552cfffffffff'], categories.tolist())
+        self.assertEqual([0, 0, 1], codes.tolist())
+
+        structured = result.to_structured()
+        self.assertEqual(3, len(structured))
+        self.assertEqual(1546304400000, structured['col2'][0])
+
+    def test_build_empty(self) -> None:
+        builder = ColumnarResultBuilder(self.columns)
+        builder.append_page(['col1', 'col2'], [])
+        result = builder.build()
+
+        self.assertEqual(0, result.num_rows)
+        self.assertEqual(np.int64, result['col2'].dtype)
+
+    def test_append_page_raises_on_different_columns(self) -> None:
+        builder = ColumnarResultBuilder(self.columns)
+        builder.append_page(['col1'], [('a',)])
+        with self.assertRaises(ValueError):
+            builder.append_page(['col2'], [(1,)])
+
+
+@unittest.skipIf(np is None or pd is None, "pandas is not installed")
+class ColumnarResultDataFrameTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.columns = [
+            CassandraColumn('col1', 'text'),
+            CassandraColumn('col2', 'timestamp'),
+            CassandraColumn('col3', 'int'),
+            CassandraColumn('col4', 'h3hex')
+        ]
+        self.column_names = ['col1', 'col2', 'col3', 'col4', 'count']
+
+    def test_to_dataframe(self) -> None:
+        result = ColumnarResultBuilder(self.columns).append_page(self.column_names, [
+            ('a', 1546304400000, 1, '835525fffffffff', 10),
+            ('b', None, None, '835525fffffffff', 11),
+            ('c', 1546304400001, 3, '835525fffffffff', 12),
+            ('d', 1546304400002, 4, '835525fffffffff', 13)
+        ]).build()
+        df = result.to_dataframe()
+
+        self.assertEqual(self.column_names, list(df.columns))
+        self.assertEqual(np.dtype('datetime64[ms]'), df['col2'].dtype)
+        self.assertEqual(pd.Timestamp('2019-01-01 01:00:00'), df['col2'][0])
+        self.assertTrue(pd.isna(df['col2'][1]))
+        self.assertEqual('Int64', str(df['col3'].dtype))
+        self.assertTrue(pd.isna(df['col3'][1]))
+        self.assertEqual('category', str(df['col4'].dtype))
+        self.assertNotEqual('category', str(df['col1'].dtype))
+        self.assertEqual(np.dtype(object), df['count'].dtype)
+
+        df = result.to_dataframe(categorical_threshold=0)
+        self.assertNotEqual('category', str(df['col4'].dtype))
+
+    def test_iter_dataframes(self) -> None:
+        builder = ColumnarResultBuilder(self.columns)
+        first = builder.append_page(self.column_names, [
+            ('a', None, 1, '835525fffffffff', 10),
+            ('b', None, 2, '835525fffffffff', 11)
+        ]).build()
+        second = ColumnarResultBuilder(self.columns).append_page(self.column_names, [
+            ('c', None, 3, '83552cfffffffff', 12),
+            ('d', None, 4, '835527fffffffff', 13)
+        ]).build()
+
+        self.assertEqual(['col4'], first.categorical_columns())
+        self.assertEqual([], second.categorical_columns())
+
+        dfs = list(iter_dataframes([first, second]))
+        self.assertEqual(2, len(dfs))
+        self.assertEqual('category', str(dfs[0]['col4'].dtype))
+        self.assertEqual('category', str(dfs[1]['col4'].dtype))
+        self.assertNotEqual('category', str(dfs[1]['col1'].dtype))
+
+    def test_to_dataframe_empty(self) -> None:
+        result = ColumnarResultBuilder(self.columns) \
+            .append_page(self.column_names, []).build()
+        df = result.to_dataframe()
+
+        self.assertEqual(0, len(df))
+        self.assertEqual(np.dtype('datetime64[ms]'), df['col2'].dtype)
+
+
+if __name__ == '__main__':
+    unittest.main()
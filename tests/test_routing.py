@@ -0,0 +1,68 @@
+import struct
+import unittest
+from uuid import UUID
+
+from cassandra.cqltypes import LongType, UTF8Type, UUIDType
+
+from primeight.routing import RoutingKeyBuilder
+
+
+class RoutingKeyBuilderTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.builder = RoutingKeyBuilder([('col1', 'TEXT'), ('day', 'BIGINT')])
+
+    def test_routing_key(self) -> None:
+        statement = \
+            "SELECT * FROM mock_keyspace.mock_table " \
+            "WHERE day=1546300800000 AND col1='it''s'   ;"
+
+        self.assertEqual(
+            [UTF8Type.serialize("it's", 4), LongType.serialize(1546300800000, 4)],
+            self.builder.routing_key(statement)
+        )
+
+    def test_routing_key_unknown(self) -> None:
+        self.assertIsNone(self.builder.routing_key(
+            "SELECT * FROM mock_keyspace.mock_table WHERE day=1546300800000 ;"
+        ))
+        self.assertIsNone(self.builder.routing_key(
+            "SELECT * FROM mock_keyspace.mock_table WHERE day=? AND col1='a' ;"
+        ))
+        self.assertIsNone(self.builder.routing_key(
+            "SELECT * FROM mock_keyspace.mock_table "
+            "WHERE day=1546300800000 AND col1 IN ('a', 'b') ;"
+        ))
+        self.assertIsNone(RoutingKeyBuilder([('col1', 'DATE')]).routing_key(
+            "SELECT * FROM mock_keyspace.mock_table WHERE col1='2019-01-01' ;"
+        ))
+
+    def test_routing_key_of_insert(self) -> None:
+        builder = RoutingKeyBuilder([('col1', 'UUID')])
+        uuid = UUID('6ba7b810-9dad-11d1-80b4-00c04fd430c8')
+        statement = \
+            "INSERT INTO mock_keyspace.mock_table " \
+            f"JSON '{{\"col1\": \"{uuid}\", \"col2\": 1}}' USING TTL 10;"
+
+        self.assertEqual([UUIDType.serialize(uuid, 4)], builder.routing_key(statement))
+        self.assertIsNone(builder.row_routing_key({'col2': 1}))
+
+    def test_statement(self) -> None:
+        statement = self.builder.statement(
+            "SELECT * FROM mock_keyspace.mock_table "
+            "WHERE day=1546300800000 AND col1='a'   ;"
+        )
+
+        self.assertEqual('mock_keyspace', statement.keyspace)
+        self.assertEqual(
+            struct.pack('>H1sB', 1, b'a', 0) + struct.pack('>H8sB', 8, LongType.serialize(1546300800000, 4), 0),
+            statement.routing_key
+        )
+
+        statement = self.builder.statement("SELECT * FROM mock_table ;")
+        self.assertIsNone(statement.keyspace)
+        self.assertIsNone(statement.routing_key)
+
+
+if __name__ == '__main__':
+    unittest.main()
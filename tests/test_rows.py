@@ -0,0 +1,128 @@
+import unittest
+
+from cassandra.query import dict_factory, tuple_factory
+
+from primeight.rows import \
+    SlottedRow, SlottedRowFactory, row_class, attribute_name, \
+    StringInterner, InterningRowFactory
+
+
+class SlottedRowFactoryTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.column_names = ['col1', 'col2', 'system.count(col3)']
+        self.rows = [('a', 1, 10), ('b', 2, 20)]
+
+    def test_attribute_name(self) -> None:
+        self.assertEqual('col1', attribute_name('col1'))
+        self.assertEqual('system_count_col3_', attribute_name('system.count(col3)'))
+        self.assertEqual('_1col', attribute_name('1col'))
+
+    def test_rows(self) -> None:
+        rows = SlottedRowFactory('mock_table')(self.column_names, self.rows)
+
+        self.assertEqual(2, len(rows))
+        row = rows[0]
+        self.assertIsInstance(row, SlottedRow)
+        self.assertEqual('MockTableRow', type(row).__name__)
+        self.assertEqual('a', row.col1)
+        self.assertEqual(10, row.system_count_col3_)
+        self.assertEqual(('a', 1, 10), row)
+        self.assertEqual(
+            {'col1': 'a', 'col2': 1, 'system.count(col3)': 10}, row.to_dict()
+        )
+        self.assertEqual(
+            "MockTableRow(col1='a', col2=1, system.count(col3)=10)", repr(row)
+        )
+
+    def test_rows_have_no_dict(self) -> None:
+        row = SlottedRowFactory('mock_table')(self.column_names, self.rows)[0]
+
+        self.assertFalse(hasattr(row, '__dict__'))
+        with self.assertRaises(AttributeError):
+            row.col1 = 'b'
+
+    def test_row_class_is_cached(self) -> None:
+        factory = SlottedRowFactory('mock_table')
+        rows1 = factory(['col1', 'col2'], [('a', 1)])
+        rows2 = factory(['col1', 'col2'], [('b', 2)])
+        rows3 = factory(['col1'], [('c',)])
+
+        self.assertIs(type(rows1[0]), type(rows2[0]))
+        self.assertIsNot(type(rows1[0]), type(rows3[0]))
+        self.assertIs(type(rows1[0]), row_class('mock_table', ('col1', 'col2')))
+        self.assertIsNot(type(rows1[0]), row_class('other_table', ('col1', 'col2')))
+
+
+class StringInternerTestCase(unittest.TestCase):
+
+    def test_intern(self) -> None:
+        interner = StringInterner()
+        value = ''.join(['835525', 'fffffffff'])
+        same_value = ''.join(['835525fff', 'ffffff'])
+        self.assertIsNot(value, same_value)
+
+        self.assertIs(value, interner(value))
+        self.assertIs(value, interner(same_value))
+        self.assertIsNone(interner(None))
+        self.assertEqual(1, len(interner))
+
+    def test_intern_is_bounded(self) -> None:
+        interner = StringInterner(max_size=2)
+        for value in ['a', 'b', 'c']:
+            interner(value)
+
+        self.assertEqual(2, len(interner))
+        interner.clear()
+        self.assertEqual(0, len(interner))
+
+        with self.assertRaises(ValueError):
+            StringInterner(max_size=0)
+
+
+class InterningRowFactoryTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.column_names = ['col1', 'col2']
+        self.rows = [
+            (''.join(['dev', 'ice']), 1),
+            (''.join(['devi', 'ce']), 2),
+            (None, 3)
+        ]
+
+    def test_rows(self) -> None:
+        factory = InterningRowFactory(dict_factory, ['col1'])
+        rows = factory(self.column_names, self.rows)
+
+        self.assertEqual({'col1': 'device', 'col2': 1}, rows[0])
+        self.assertIs(rows[0]['col1'], rows[1]['col1'])
+        self.assertIsNone(rows[2]['col1'])
+        self.assertEqual(1, len(factory.interner))
+
+    def test_row_type(self) -> None:
+        factory = InterningRowFactory(tuple_factory, ['col1'])
+        rows = factory(self.column_names, self.rows)
+
+        self.assertEqual(self.rows, rows)
+        self.assertIsInstance(rows[0], tuple)
+        self.assertIs(rows[0][0], rows[1][0])
+
+        rows = factory(self.column_names, [list(row) for row in self.rows])
+        self.assertIsInstance(rows[0], list)
+
+    def test_rows_without_interned_columns(self) -> None:
+        factory = InterningRowFactory(tuple_factory, ['col3'])
+        rows = factory(self.column_names, self.rows)
+
+        self.assertIs(self.rows, rows)
+
+    def test_wraps_slotted_rows(self) -> None:
+        factory = InterningRowFactory(SlottedRowFactory('mock_table'), ['col1'])
+        rows = factory(self.column_names, self.rows)
+
+        self.assertIsInstance(rows[0], SlottedRow)
+        self.assertIs(rows[0].col1, rows[1].col1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import copy
+import unittest
+
+from cassandra import ConsistencyLevel
+from cassandra.query import dict_factory, tuple_factory
+
+from primeight.keyspace import CassandraKeyspace
+from primeight.table import CassandraTable, CassandraMaterializedView
+from primeight.schema import CassandraSchema, TableConfig
+from primeight.parser.parser import Parser
+
+
+class CassandraSchemaTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.mock_config = {
+            'version': '1.0.0',
+            'name': 'mock_table',
+            'keyspace': 'mock_keyspace',
+            'columns': {
+                'col1': {'type': 'text', 'alias': 'ca'},
+                'col2': {'type': 'timestamp', 'alias': 'cb'},
+                'col3': {'type': 'float', 'alias': 'a4'},
+                'col4': {'type': 'float', 'alias': 'ac'},
+                'col5': {'type': 'list<int>'},
+                'col6': {'type': 'text', 'intern': True}
+            },
+            'generated_columns': {
+                'day': 'col2',
+                'h3': 'col3, col4'
+            },
+            'query': {
+                'base': {
+                    'required': {'id': 'col1'},
+                    'optional': ['day'],
+                    'order': {'day': 'desc'}
+                },
+                'second': {
+                    'required': {'time': 'day'},
+                    'optional': ['col1']
+                }
+            }
+        }
+
+    def test_columns(self) -> None:
+        schema = CassandraSchema(self.mock_config)
+
+        self.assertEqual(
+            ['col1', 'col2', 'col3', 'col4', 'col5', 'col6', 'day', 'h3'],
+            [c.name for c in schema.columns]
+        )
+        self.assertEqual('col4', schema.by_alias['ac'].name)
+        self.assertEqual('h3hex', schema.get('H3').type)
+        self.assertIsNone(schema.get('month'))
+        self.assertEqual(('col3', 'col4'), schema.generated_columns['h3'])
+
+    def test_get_columns(self) -> None:
+        schema = CassandraSchema(self.mock_config)
+
+        cols = schema.get_columns(names=['day', 'col1'], alias=['ac', 'ca'])
+        self.assertEqual(['col1', 'col4', 'day'], [c.name for c in cols])
+
+    def test_ddl_types(self) -> None:
+        schema = CassandraSchema(self.mock_config)
+
+        self.assertEqual('BIGINT', schema.ddl_types['col2'])
+        self.assertEqual('FROZEN<LIST<INT>>', schema.ddl_types['col5'])
+        self.assertEqual(
+            "col1 TEXT, col2 BIGINT, col3 FLOAT, col4 FLOAT, "
+            "col5 FROZEN<LIST<INT>>, col6 TEXT, day BIGINT, h3 TEXT",
+            schema.column_definitions
+        )
+
+    def test_queries(self) -> None:
+        schema = CassandraSchema(self.mock_config)
+
+        base = schema.queries['base']
+        self.assertEqual(('col1',), base.partition_keys)
+        self.assertEqual(('day',), base.clustering_keys)
+        self.assertEqual(('col1', 'day'), base.primary_keys)
+        self.assertEqual('desc', base.order['day'])
+        self.assertEqual('day', schema.queries['second'].required['time'])
+
+    def test_queries_execution_options(self) -> None:
+        self.mock_config['query']['second'].update({
+            'consistency': 'local_quorum', 'timeout': 60, 'fetch_size': 5000, 'profile': 'analytics'
+        })
+        schema = CassandraSchema(self.mock_config)
+
+        second = schema.queries['second']
+        self.assertEqual(ConsistencyLevel.LOCAL_QUORUM, second.consistency_level)
+        self.assertEqual(60, second.timeout)
+        self.assertEqual('analytics', second.profile)
+        self.assertEqual(
+            {'consistency_level': ConsistencyLevel.LOCAL_QUORUM, 'fetch_size': 5000},
+            second.statement_options
+        )
+        self.assertEqual({}, schema.queries['base'].statement_options)
+        self.assertIsNone(schema.queries['base'].timeout)
+
+    def test_queries_with_split_bucket(self) -> None:
+        self.mock_config['generated_columns']['month'] = 'col2'
+        self.mock_config['split'] = 'month'
+        self.mock_config['split_mode'] = 'bucket'
+        schema = CassandraSchema(self.mock_config)
+
+        self.assertEqual('bucket', schema.split_mode)
+        self.assertEqual(('month', 'col1'), schema.queries['base'].partition_keys)
+        self.assertEqual('table', CassandraSchema({**self.mock_config, 'split_mode': None}).split_mode)
+
+    def test_interned_columns(self) -> None:
+        schema = CassandraSchema(self.mock_config)
+
+        self.assertEqual({'col1', 'col6', 'h3'}, schema.interned_columns)
+
+        factory = schema.interning_row_factory(dict_factory)
+        self.assertIs(factory, schema.interning_row_factory(dict_factory))
+        self.assertIs(schema.interner, factory.interner)
+        self.assertIs(
+            schema.interner, schema.interning_row_factory(tuple_factory).interner
+        )
+
+    def test_is_immutable(self) -> None:
+        schema = CassandraSchema(self.mock_config)
+
+        with self.assertRaises(TypeError):
+            schema.by_name['col6'] = None
+        with self.assertRaises(AttributeError):
+            schema.columns[0].extra = None
+
+    def test_compile_is_shared(self) -> None:
+        schema = CassandraSchema.compile(self.mock_config)
+        self.assertIs(schema, Parser.compile(self.mock_config))
+
+        keyspace = CassandraKeyspace(self.mock_config)
+        table = CassandraTable(self.mock_config, keyspace)
+        view = CassandraMaterializedView(self.mock_config, 'second', keyspace)
+        self.assertIs(schema, table.schema)
+        self.assertIs(table.schema, view.schema)
+
+        self.mock_config['split'] = 'day'
+        self.assertIsNot(schema, CassandraSchema.compile(self.mock_config))
+
+    def test_compile_table_config(self) -> None:
+        config = TableConfig(copy.deepcopy(self.mock_config))
+        schema = CassandraSchema.compile(config)
+
+        # Equal configurations loaded separately share the same schema.
+        self.assertIs(schema, CassandraSchema.compile(copy.deepcopy(self.mock_config)))
+        self.assertIs(schema, CassandraSchema.compile(TableConfig(copy.deepcopy(self.mock_config))))
+
+        fingerprint = config.fingerprint
+        config['split'] = 'day'
+        self.assertNotEqual(fingerprint, config.fingerprint)
+        self.assertIsNot(schema, CassandraSchema.compile(config))
+        self.assertEqual(config, copy.deepcopy(config))
+
+
+if __name__ == '__main__':
+    unittest.main()
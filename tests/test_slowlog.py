@@ -0,0 +1,106 @@
+import unittest
+
+from cassandra.query import SimpleStatement
+
+from primeight.metrics import MetricLabels
+from primeight.slowlog import SlowQueryLog, fingerprint
+
+
+class FingerprintTestCase(unittest.TestCase):
+
+    def test_literals(self) -> None:
+        self.assertEqual(
+            "SELECT * FROM ks.table WHERE day=? AND col1=? AND h3=? LIMIT ? ;",
+            fingerprint(
+                "SELECT * FROM ks.table WHERE day=1546300800000 AND col1='it''s' "
+                "AND h3='8928308280fffff'   LIMIT 10 ;"
+            )
+        )
+        self.assertEqual(
+            "SELECT * FROM ks.table WHERE id=? AND x>? ;",
+            fingerprint(
+                "SELECT * FROM ks.table WHERE id=123e4567-e89b-12d3-a456-426614174000 AND x>-1.5 ;"
+            )
+        )
+
+    def test_in_lists(self) -> None:
+        self.assertEqual(
+            fingerprint("SELECT * FROM ks.table WHERE col1 IN ('a', 'b') ;"),
+            fingerprint("SELECT * FROM ks.table WHERE col1 IN ('c') ;")
+        )
+
+    def test_split_tables(self) -> None:
+        self.assertEqual(
+            "SELECT * FROM ks.table_{date}_second WHERE day=? ;",
+            fingerprint("SELECT * FROM ks.table_07_01_2019_second WHERE day=1546819200000 ;")
+        )
+        self.assertEqual(
+            fingerprint("INSERT INTO ks.table_01_2019 JSON '{\"a\": 1}';"),
+            fingerprint("INSERT INTO ks.table_02_2019 JSON '{\"a\": 2}';")
+        )
+
+    def test_statement(self) -> None:
+        self.assertEqual(
+            "SELECT * FROM ks.table WHERE a=? ;",
+            fingerprint(SimpleStatement("SELECT * FROM ks.table WHERE a=1 ;"))
+        )
+
+
+class SlowQueryLogTestCase(unittest.TestCase):
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            SlowQueryLog(threshold=-1)
+
+    def test_record(self) -> None:
+        slow_query_log = SlowQueryLog(threshold=0.5, max_entries=2, log_level=None)
+        labels = MetricLabels('ks', 'table', 'base', 'query', '')
+
+        self.assertIsNone(slow_query_log.record("SELECT * FROM ks.table WHERE a=1 ;", 0.1))
+        entry = slow_query_log.record(
+            "SELECT * FROM ks.table WHERE a=1 ;", 1.0, rows=10, fan_out=3, labels=labels
+        )
+        self.assertEqual("SELECT * FROM ks.table WHERE a=? ;", entry.fingerprint)
+        self.assertEqual(labels, entry.labels)
+
+        slow_query_log.record("SELECT * FROM ks.table WHERE a=2 ;", 2.0, rows=5, fan_out=1)
+        slow_query_log.record("SELECT * FROM ks.other ;", 0.5)
+
+        self.assertEqual(2, len(slow_query_log.entries))
+
+        summary = slow_query_log.summary()
+        self.assertEqual(2, len(summary))
+        self.assertEqual("SELECT * FROM ks.table WHERE a=? ;", summary[0]['fingerprint'])
+        self.assertEqual(2, summary[0]['count'])
+        self.assertEqual(3.0, summary[0]['total_latency'])
+        self.assertEqual(1.5, summary[0]['mean_latency'])
+        self.assertEqual(2.0, summary[0]['max_latency'])
+        self.assertEqual(15, summary[0]['rows'])
+        self.assertEqual(3, summary[0]['max_fan_out'])
+        self.assertEqual("SELECT * FROM ks.table WHERE a=1 ;", summary[0]['example'])
+        self.assertEqual(1, len(slow_query_log.summary(limit=1)))
+
+        slow_query_log.reset()
+        self.assertEqual([], slow_query_log.entries)
+        self.assertEqual([], slow_query_log.summary())
+
+    def test_max_fingerprints(self) -> None:
+        slow_query_log = SlowQueryLog(threshold=0, max_fingerprints=1, log_level=None)
+        slow_query_log.record("SELECT * FROM ks.table ;", 1.0)
+        slow_query_log.record("SELECT * FROM ks.other ;", 1.0)
+
+        self.assertEqual(1, len(slow_query_log.summary()))
+        self.assertEqual(1, slow_query_log.dropped)
+        self.assertEqual(2, len(slow_query_log.entries))
+
+    def test_log(self) -> None:
+        slow_query_log = SlowQueryLog(threshold=0)
+        with self.assertLogs(level='WARNING') as logs:
+            slow_query_log.record("SELECT * FROM ks.table WHERE a=1 ;", 1.5, rows=2, fan_out=4)
+
+        self.assertIn("Slow query (1.500s, 2 rows, fan-out 4)", logs.output[0])
+        self.assertIn("SELECT * FROM ks.table WHERE a=? ;", logs.output[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
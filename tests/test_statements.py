@@ -0,0 +1,45 @@
+import unittest
+
+from primeight.statements import StatementStream
+
+
+class StatementStreamTestCase(unittest.TestCase):
+
+    def test_map(self) -> None:
+        stream = StatementStream(['a', 'b']).map(str.upper)
+
+        self.assertEqual(['A', 'B'], stream.to_list())
+
+    def test_flat_map(self) -> None:
+        stream = StatementStream(['a', 'b']) \
+            .flat_map(lambda s: (f'{s}{i}' for i in range(3))) \
+            .map(str.upper)
+
+        self.assertEqual(['A0', 'A1', 'A2', 'B0', 'B1', 'B2'], list(stream))
+
+    def test_is_lazy(self) -> None:
+        calls = []
+
+        def _record(statement):
+            calls.append(statement)
+            return statement
+
+        stream = StatementStream(['a', 'b', 'c']).map(_record)
+        self.assertEqual([], calls)
+
+        statements = iter(stream)
+        self.assertEqual('a', next(statements))
+        self.assertEqual(['a'], calls)
+
+    def test_is_immutable_and_reiterable(self) -> None:
+        stream = StatementStream(['a'])
+        upper = stream.map(str.upper)
+
+        self.assertEqual(['a'], stream.to_list())
+        self.assertEqual(['A'], upper.to_list())
+        self.assertEqual(['A'], upper.to_list())
+        self.assertEqual(('a',), upper.source)
+
+
+if __name__ == '__main__':
+    unittest.main()
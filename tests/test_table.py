@@ -2,9 +2,13 @@ import unittest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 
+from cassandra import ConsistencyLevel
 from pydantic import BaseModel
 
 from primeight.keyspace import CassandraKeyspace
+from primeight.statements import StatementStream
+from primeight.catalog import TableCatalog
+from primeight.metrics import MetricLabels
 from primeight.table import \
     CassandraTable, \
     DateNotDefinedError, QueryNotFound, MissingColumnError
@@ -90,8 +94,7 @@ class CassandraTableCase(unittest.TestCase):
         table = \
             CassandraTable(self.mock_config, self.keyspace) \
             .query(keyspace='mock_keyspace')
-        is_valid = table._is_query_valid()
-        self.assertTrue(is_valid)
+        self.assertEqual(1, len(list(table.iter_routed_statements())))
 
     def test_is_query_valid_raises_date_not_defined_error(self) -> None:
         self.mock_config['split'] = 'day'
@@ -101,7 +104,7 @@ class CassandraTableCase(unittest.TestCase):
             .id('mock_col1')
 
         with self.assertRaises(DateNotDefinedError):
-            table._is_query_valid()
+            list(table.iter_routed_statements())
 
     def test_replace(self) -> None:
         statement = "SELECT * FROM {keyspace_name}.{table_name} {where};"
@@ -539,6 +542,289 @@ class CassandraTableCase(unittest.TestCase):
             table.statements[1]
         )
 
+    def test_has_split_bucket(self) -> None:
+        self.mock_config['split'] = 'day'
+        self.mock_config['split_mode'] = 'bucket'
+        table = CassandraTable(self.mock_config, self.keyspace)
+        self.assertEqual('bucket', table.split_mode)
+        self.assertTrue(table.has_split_bucket())
+        self.assertFalse(table.has_split())
+
+    def test_create_with_split_bucket(self) -> None:
+        self.mock_config['split'] = 'day'
+        self.mock_config['split_mode'] = 'bucket'
+        table = \
+            CassandraTable(self.mock_config, self.keyspace) \
+            .create(keyspace='mock_keyspace', gc_grace_seconds=1000)
+        self.assertEqual(1, len(table.statements))
+        self.assertEqual(
+            "CREATE TABLE mock_keyspace.mock_table ( "
+            "col1 TEXT, col2 BIGINT, col3 FLOAT, col4 FLOAT, col5 SMALLINT, "
+            "day BIGINT, h3 TEXT, "
+            "PRIMARY KEY ( (day, col1), col2 ) "
+            ") WITH CLUSTERING ORDER BY ( id DESC ) AND gc_grace_seconds=1000;",
+            table.statements[0]
+        )
+
+    def test_insert_with_split_bucket(self) -> None:
+        self.mock_config['split'] = 'day'
+        self.mock_config['split_mode'] = 'bucket'
+        table = \
+            CassandraTable(self.mock_config, self.keyspace) \
+            .insert(
+                {'col1': 'a', 'col2': 1546387200000, 'col3': 0.0, 'col4': 0.0, 'col5': 1},
+                keyspace='mock_keyspace'
+            )
+        self.assertTrue(
+            table.statements[0].startswith("INSERT INTO mock_keyspace.mock_table JSON")
+        )
+        self.assertIn('"day": 1546387200000', table.statements[0])
+
+    def test_time_with_split_bucket(self) -> None:
+        self.mock_config['split'] = 'day'
+        self.mock_config['split_mode'] = 'bucket'
+        table = \
+            CassandraTable(self.mock_config, self.keyspace) \
+            .query('base', keyspace='mock_keyspace') \
+            .time(datetime(2019, 1, 1), datetime(2019, 1, 2)) \
+            .id('a')
+
+        self.assertEqual(
+            [
+                "SELECT * FROM mock_keyspace.mock_table "
+                "WHERE day=1546300800000 AND col1='a'   ;",
+                "SELECT * FROM mock_keyspace.mock_table "
+                "WHERE day=1546387200000 AND col1='a'   ;"
+            ],
+            table.statements
+        )
+
+    def test_time_with_required_and_split_bucket(self) -> None:
+        self.mock_config['query'] = {
+            'base': {'required': {'time': 'day'}, 'optional': ['col1']},
+        }
+        self.mock_config['generated_columns']['month'] = 'col2'
+        self.mock_config['split'] = 'month'
+        self.mock_config['split_mode'] = 'bucket'
+        table = \
+            CassandraTable(self.mock_config, self.keyspace) \
+            .query('base', keyspace='mock_keyspace') \
+            .time(datetime(2019, 1, 31), datetime(2019, 2, 1))
+
+        self.assertEqual(
+            [
+                "SELECT * FROM mock_keyspace.mock_table "
+                "WHERE month=1546300800000 AND day=1548892800000   ;",
+                "SELECT * FROM mock_keyspace.mock_table "
+                "WHERE month=1548979200000 AND day=1548979200000   ;"
+            ],
+            table.statements
+        )
+
+    def test_iter_routed_statements(self) -> None:
+        table = \
+            CassandraTable(self.mock_config, self.keyspace) \
+            .query('base', keyspace='mock_keyspace') \
+            .id(['a', 'b'])
+        statement = next(table.iter_routed_statements())
+        self.assertIsNone(statement.routing_key)
+
+        table.query('base', keyspace='mock_keyspace').id('a')
+        statements = list(table.iter_routed_statements())
+        self.assertEqual(table.statements, [s.query_string for s in statements])
+        self.assertEqual('mock_keyspace', statements[0].keyspace)
+        self.assertEqual(b'a', statements[0].routing_key)
+        self.assertTrue(statements[0].is_idempotent)
+
+        table.insert(
+            {'col1': 'b', 'col2': 1546387200000, 'col3': 0.0, 'col4': 0.0, 'col5': 1},
+            keyspace='mock_keyspace'
+        )
+        statement = next(table.iter_routed_statements())
+        self.assertEqual(b'b', statement.routing_key)
+        self.assertFalse(statement.is_idempotent)
+
+        table.create(keyspace='mock_keyspace')
+        self.assertIsInstance(next(table.iter_routed_statements()), str)
+
+    def test_query_execution_options(self) -> None:
+        self.mock_config['query']['base'].update({
+            'consistency': 'local_quorum', 'fetch_size': 5000, 'profile': 'analytics'
+        })
+        mock_manager = MagicMock()
+        table = \
+            CassandraTable(self.mock_config, self.keyspace, mock_manager) \
+            .query('base', keyspace='mock_keyspace') \
+            .id('a')
+
+        statement = next(table.iter_routed_statements())
+        self.assertEqual(ConsistencyLevel.LOCAL_QUORUM, statement.consistency_level)
+        self.assertEqual(5000, statement.fetch_size)
+
+        table.execute()
+        args, _ = mock_manager.execute.call_args
+        self.assertEqual('analytics', args[1])
+
+        table.execute_concurrent(execution_profile='other')
+        args, _ = mock_manager.execute_concurrent.call_args
+        self.assertEqual('other', args[3])
+
+        self.mock_config['query']['base']['timeout'] = 60
+        table = \
+            CassandraTable(self.mock_config, self.keyspace, mock_manager) \
+            .query('base', keyspace='mock_keyspace') \
+            .id('a')
+        table.execute()
+        mock_manager.timeout_profile.assert_called_once_with('analytics', 60)
+        args, _ = mock_manager.execute.call_args
+        self.assertIs(mock_manager.timeout_profile.return_value, args[1])
+
+        # Inserts use the execution profile as is.
+        table.insert(
+            {'col1': 'b', 'col2': 1546387200000, 'col3': 0.0, 'col4': 0.0, 'col5': 1},
+            keyspace='mock_keyspace'
+        )
+        table.execute()
+        args, _ = mock_manager.execute.call_args
+        self.assertIsNone(args[1])
+
+    def test_metric_labels(self) -> None:
+        self.mock_config['split'] = 'day'
+        table = \
+            CassandraTable(self.mock_config, self.keyspace) \
+            .query('base', keyspace='mock_keyspace') \
+            .time(datetime(2019, 1, 1), datetime(2019, 1, 1))
+
+        self.assertEqual(
+            MetricLabels('mock_keyspace', 'mock_table', 'base', 'query', '01_01_2019'),
+            table.metric_labels(table.statements[0])
+        )
+
+        table.insert(
+            {'col1': 'b', 'col2': 1546387200000, 'col3': 0.0, 'col4': 0.0, 'col5': 1},
+            keyspace='mock_keyspace'
+        )
+        self.assertEqual(
+            MetricLabels('mock_keyspace', 'mock_table', 'base', 'insert', '02_01_2019'),
+            table.metric_labels(next(table.iter_routed_statements()))
+        )
+
+    def test_metric_labels_split_bucket(self) -> None:
+        self.mock_config['split'] = 'day'
+        self.mock_config['split_mode'] = 'bucket'
+        table = \
+            CassandraTable(self.mock_config, self.keyspace) \
+            .query('base', keyspace='mock_keyspace') \
+            .time(datetime(2019, 1, 2), datetime(2019, 1, 2)) \
+            .id('a')
+
+        self.assertEqual(
+            MetricLabels('mock_keyspace', 'mock_table', 'base', 'query', '02_01_2019'),
+            table.metric_labels(table.statements[0])
+        )
+
+    def test_warm_up_statements(self) -> None:
+        self.mock_config['split'] = 'day'
+        self.mock_config['query']['by_space'] = {'required': {'space': 'h3'}}
+        table = CassandraTable(self.mock_config, self.keyspace)
+
+        self.assertEqual(
+            [
+                "INSERT INTO mock_keyspace.mock_table_01_01_2019 JSON ? ;",
+                "SELECT * FROM mock_keyspace.mock_table_01_01_2019 WHERE col1=?   ;",
+                "SELECT * FROM mock_keyspace.mock_table_01_01_2019_by_space WHERE h3=?   ;",
+                "INSERT INTO mock_keyspace.mock_table_02_01_2019 JSON ? ;",
+                "SELECT * FROM mock_keyspace.mock_table_02_01_2019 WHERE col1=?   ;",
+                "SELECT * FROM mock_keyspace.mock_table_02_01_2019_by_space WHERE h3=?   ;"
+            ],
+            table.warm_up_statements(2, datetime(2019, 1, 1, 12), keyspace='mock_keyspace')
+        )
+
+    def test_warm_up_statements_without_split(self) -> None:
+        table = CassandraTable(self.mock_config, self.keyspace)
+
+        self.assertEqual(
+            [
+                "INSERT INTO mock_keyspace.mock_table JSON ? ;",
+                "SELECT * FROM mock_keyspace.mock_table WHERE col1=?   ;"
+            ],
+            table.warm_up_statements(2, keyspace='mock_keyspace')
+        )
+
+    def test_time_with_required_and_split_week(self) -> None:
+        self.mock_config['query'] = {
+            'base': {'required': {'time': 'day'}, 'optional': ['col1']},
+        }
+        self.mock_config['split'] = 'week'
+        table = \
+            CassandraTable(self.mock_config, self.keyspace) \
+            .query('base', keyspace='mock_keyspace') \
+            .time(datetime(2019, 1, 6), datetime(2019, 1, 7))
+
+        self.assertEqual(
+            [
+                "SELECT * FROM mock_keyspace.mock_table_31_12_2018 "
+                "WHERE day=1546732800000   ;",
+                "SELECT * FROM mock_keyspace.mock_table_07_01_2019 "
+                "WHERE day=1546819200000   ;"
+            ],
+            table.statements
+        )
+
+    def test_time_is_lazy(self) -> None:
+        self.mock_config['query'] = {
+            'base': {'required': {'time': 'day'}, 'optional': ['col1']},
+        }
+        self.mock_config['split'] = 'month'
+        table = \
+            CassandraTable(self.mock_config, self.keyspace) \
+            .query('base', keyspace='mock_keyspace') \
+            .time(datetime(2018, 1, 1), datetime(2019, 12, 31)) \
+            .equals('col1', 'a') \
+            .limit(10)
+
+        self.assertIsInstance(table._current_statements, StatementStream)
+        self.assertEqual(
+            "SELECT * FROM mock_keyspace.mock_table_01_2018 "
+            "WHERE day=1514764800000 AND col1='a'  LIMIT 10 ;",
+            next(table.iter_statements())
+        )
+        self.assertEqual(730, len(table.statements))
+        self.assertIn("mock_table_12_2019 WHERE day=1577750400000 ", table.statements[-1])
+
+    def test_time_skip_missing(self) -> None:
+        self.mock_config['query'] = {
+            'base': {'required': {'time': 'day'}, 'optional': ['col1']},
+        }
+        self.mock_config['split'] = 'month'
+        mock_manager = MagicMock()
+        mock_manager.catalog = TableCatalog(
+            lambda keyspace: ['mock_table_12_2018', 'mock_table_02_2019']
+        )
+        table = \
+            CassandraTable(self.mock_config, self.keyspace, mock_manager) \
+            .query('base', keyspace='mock_keyspace') \
+            .time(datetime(2018, 12, 31), datetime(2019, 2, 1), skip_missing=True)
+
+        self.assertEqual(['mock_keyspace.mock_table_01_2019'], table.missing_splits)
+        self.assertEqual(
+            [
+                "SELECT * FROM mock_keyspace.mock_table_12_2018 "
+                "WHERE day=1546214400000   ;",
+                "SELECT * FROM mock_keyspace.mock_table_02_2019 "
+                "WHERE day=1548979200000   ;"
+            ],
+            table.statements
+        )
+
+    def test_time_skip_missing_requires_manager(self) -> None:
+        self.mock_config['split'] = 'day'
+        table = CassandraTable(self.mock_config, self.keyspace) \
+            .query('base', keyspace='mock_keyspace')
+
+        with self.assertRaises(ValueError):
+            table.time(datetime(2019, 1, 1), datetime(2019, 1, 2), skip_missing=True)
+
     def test_time_prepare(self) -> None:
         self.mock_config['query'] = {
             'base': {'required': {'time': 'day'}, 'optional': ['col1']},
@@ -0,0 +1,143 @@
+import unittest
+
+from primeight.keyspace import CassandraKeyspace
+from primeight.table import CassandraTable
+from primeight.validation import ValidationReport, RowValidator, BatchValidator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class RowValidatorTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.mock_config = {
+            'name': 'mock_table',
+            'columns': {
+                'col1': {'type': 'text'},
+                'col2': {'type': 'timestamp'},
+                'col3': {'type': 'float', 'min': -90, 'max': 90},
+                'col4': {'type': 'list<int>'},
+                'col5': {'type': 'smallint', 'min': 0}
+            },
+            'query': {
+                'base': {'required': {'id': 'col1'}, 'optional': ['col2']}
+            }
+        }
+        self.keyspace = CassandraKeyspace(self.mock_config)
+        self.rows = [
+            {'col1': 'a', 'col2': 1546304400000, 'col3': 26.9, 'col4': [1]},
+            {'col1': 'b', 'col2': '1546304400000', 'col3': 10},
+            {'col1': 'c', 'col2': 1546304400000, 'col3': 95.0},
+            {'col1': 'd', 'col2': 'yesterday', 'col5': -1},
+            {'col1': 'e', 'col6': 1}
+        ]
+
+    def test_model_is_cached(self) -> None:
+        table = CassandraTable(self.mock_config, self.keyspace)
+        other = CassandraTable(self.mock_config, self.keyspace)
+
+        self.assertIs(table.model, other.model)
+
+    def test_python_type(self) -> None:
+        self.assertEqual(str, RowValidator.python_type('h3hex'))
+        self.assertEqual((float, int), RowValidator.python_type('double'))
+        self.assertEqual((list, tuple), RowValidator.python_type('list<int>'))
+
+    def test_validate_many(self) -> None:
+        table = CassandraTable(self.mock_config, self.keyspace)
+        report = table.validate_many(self.rows)
+
+        self.assertEqual(2, len(report.accepted))
+        self.assertEqual(1546304400000, report.accepted[1]['col2'])
+        self.assertEqual(10.0, report.accepted[1]['col3'])
+        self.assertNotIn('col5', report.accepted[1])
+        self.assertEqual([2, 3, 4], report.rejected_rows)
+        self.assertIn((2, 'col3', ValidationReport.ABOVE_MAX), report.rejected)
+        self.assertIn((3, 'col2', ValidationReport.INVALID_TYPE), report.rejected)
+        self.assertIn((4, 'col6', ValidationReport.UNKNOWN_COLUMN), report.rejected)
+
+    def test_validate_many_without_coercion(self) -> None:
+        table = CassandraTable(self.mock_config, self.keyspace)
+        report = table.validate_many(self.rows, coerce=False)
+
+        self.assertEqual([self.rows[0]], report.accepted)
+        self.assertIs(self.rows[0], report.accepted[0])
+        self.assertEqual([1, 2, 3, 4], report.rejected_rows)
+        self.assertEqual(
+            2, report.counts[('col2', ValidationReport.INVALID_TYPE)]
+        )
+
+        report = table.validate_many([{'col1': 'a', 'col5': True}], coerce=False)
+        self.assertEqual(
+            [(0, 'col5', ValidationReport.INVALID_TYPE)], report.rejected
+        )
+
+    def test_validate_many_below_min(self) -> None:
+        table = CassandraTable(self.mock_config, self.keyspace)
+        report = table.validate_many([{'col1': 'a', 'col5': -1}], coerce=False)
+
+        self.assertEqual([(0, 'col5', ValidationReport.BELOW_MIN)], report.rejected)
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class BatchValidatorTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.mock_config = {
+            'name': 'mock_table',
+            'columns': {
+                'col1': {'type': 'text'},
+                'col2': {'type': 'timestamp'},
+                'col3': {'type': 'float', 'min': -90, 'max': 90},
+                'col4': {'type': 'float', 'min': -180, 'max': 180}
+            },
+            'generated_columns': {'day': 'col2'},
+            'query': {
+                'base': {'required': {'id': 'col1'}, 'optional': ['day']}
+            }
+        }
+        self.keyspace = CassandraKeyspace(self.mock_config)
+
+    def test_key_columns(self) -> None:
+        table = CassandraTable(self.mock_config, self.keyspace)
+        self.assertEqual(('col1', 'col2'), table.schema.key_columns)
+
+    def test_validate_batch(self) -> None:
+        table = CassandraTable(self.mock_config, self.keyspace)
+        mask, reasons = table.validate_batch([
+            {'col1': 'a', 'col2': 1, 'col3': 10.0, 'col4': None},
+            {'col1': None, 'col2': 1, 'col3': 100.0},
+            {'col1': 'c', 'col2': 1, 'col3': -100.0},
+            {'col1': 'd', 'col2': 1, 'col4': 200},
+            {'col1': 'e', 'col2': 1, 'col4': 'abc'},
+            {'col1': 'f', 'col3': 0}
+        ])
+
+        self.assertEqual([True, False, False, False, False, False], mask.tolist())
+        self.assertEqual(
+            [
+                BatchValidator.VALID, BatchValidator.NULL_KEY,
+                BatchValidator.BELOW_MIN, BatchValidator.ABOVE_MAX,
+                BatchValidator.NOT_A_NUMBER, BatchValidator.NULL_KEY
+            ],
+            reasons.tolist()
+        )
+
+    def test_validate_batch_columns(self) -> None:
+        table = CassandraTable(self.mock_config, self.keyspace)
+        mask, reasons = table.validate_batch({
+            'col1': ['a', 'b', None],
+            'col2': np.array([1, 2, 3]),
+            'col3': np.array([0.0, 91.0, np.nan])
+        })
+
+        self.assertEqual([True, False, False], mask.tolist())
+        self.assertEqual('above max', BatchValidator.REASONS[reasons[1]])
+        self.assertEqual('null key', BatchValidator.REASONS[reasons[2]])
+
+
+if __name__ == '__main__':
+    unittest.main()